@@ -1,26 +1,30 @@
 from typing import Dict
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
 from graph.state import HRState
+from graph.prefetch import prefetched
+from tools.llm_tiers import get_llm
+from tools.llm_resilience import LLMUnavailable
 from tools.db_tool import (
-    get_employee_by_id,
-    get_employee_by_email,
-    get_employees_by_name,
     get_attendance_for_employee_on_date,
     start_attendance,
     end_attendance,
     get_attendance_summary_for_date,
 )
+from tools.employee_resolver import (
+    get_resolver,
+    format_candidates,
+    AMBIGUOUS,
+    NOT_FOUND,
+)
 from tools.time_tool import (
     current_date,
     normalize_natural_date,
     is_future_date,
 )
-from config.settings import LLM_MODEL, LLM_TEMPERATURE
 
 
-llm = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE)
+llm = get_llm("attendance.polish")
 
 # -----------------------------
 # LLM PROMPT (POLISH ONLY)
@@ -55,12 +59,16 @@ prompt = ChatPromptTemplate.from_messages(
 
 
 def _reply(state: HRState, text: str) -> Dict:
-    """Utility: polish text with LLM"""
-    chain = prompt | llm
-    response = chain.invoke({"input": text})
+    """Utility: polish text with LLM (structured commands get it verbatim)"""
+    if state.get("channel") != "command":
+        chain = prompt | llm
+        try:
+            text = chain.invoke({"input": text}).content
+        except LLMUnavailable:
+            pass   # the unpolished text is already complete
     return {
         "messages": state.get("messages", []) + [
-            {"role": "assistant", "content": response.content}
+            {"role": "assistant", "content": text}
         ]
     }
 
@@ -91,7 +99,7 @@ def attendance_agent(state: HRState) -> Dict:
     # SUMMARY
     # -----------------------------
     if intent == "attendance_summary":
-        summary = get_attendance_summary_for_date(attendance_date)
+        summary = prefetched(state, ("summary", attendance_date), get_attendance_summary_for_date, attendance_date)
         return _reply(
             state,
             f"On {attendance_date}, {summary['present']} employees worked "
@@ -101,26 +109,18 @@ def attendance_agent(state: HRState) -> Dict:
     # -----------------------------
     # RESOLVE EMPLOYEE
     # -----------------------------
-    employee = None
-
-    emp_id = entities.get("employee_id") or entities.get("id")
-    if emp_id:
-        employee = get_employee_by_id(int(emp_id))
-
-    elif "email" in entities:
-        employee = get_employee_by_email(entities["email"])
+    resolution = get_resolver(state).resolve(entities)
+    employee = resolution["employee"]
 
-    elif "name" in entities:
-        matches = get_employees_by_name(entities["name"])
-        if len(matches) == 1:
-            employee = matches[0]
-        elif len(matches) > 1:
+    if resolution["by"] == "name":
+        if resolution["status"] == AMBIGUOUS:
             return _reply(
                 state,
-                "Multiple employees found with this name. "
+                "Multiple employees found with this name: "
+                f"{format_candidates(resolution['candidates'])}. "
                 "Please provide the employee ID."
             )
-        else:
+        if resolution["status"] == NOT_FOUND:
             return _reply(state, "No employee found with this name.")
 
     if not employee:
@@ -1,23 +1,21 @@
-from typing import Dict
-from langchain_openai import ChatOpenAI
+from typing import Dict, List
 from langchain_core.prompts import ChatPromptTemplate
 
 from graph.state import HRState
+from tools.llm_tiers import get_llm
+from tools.llm_resilience import LLMUnavailable
 from tools.db_tool import (
     create_employee,
     get_employee_by_email,
-    get_employee_by_id,
-    get_employees_by_name,
-    get_employees_by_role,
-    get_all_employees,
+    search_employees,
+)
+from config.settings import (
+    EMPLOYEE_PAGE_SIZE,
+    EMPLOYEE_LLM_ROW_LIMIT,
 )
-from config.settings import LLM_MODEL, LLM_TEMPERATURE
 
 
-llm = ChatOpenAI(
-    model=LLM_MODEL,
-    temperature=LLM_TEMPERATURE
-)
+llm = get_llm("employee.reply")
 
 # -----------------------------
 # PROMPT
@@ -43,6 +41,168 @@ prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
+LOOKUP_INTENTS = [
+    "find_employee",
+    "employee_find_all",
+    "employee_find_last",
+    "employee_find_by_role",
+    "employee_find_by_name",
+]
+
+# Lookup filter priority (first one present wins)
+LOOKUP_FILTERS = ["email", "id", "name", "role"]
+
+
+# -----------------------------
+# DETERMINISTIC RENDERING
+# -----------------------------
+def render_employee_table(employees: List[Dict]) -> str:
+    """
+    Fixed-width table: ID | Name | Role | Email
+    """
+    headers = ["ID", "Name", "Role", "Email"]
+    rows = [
+        [str(e["id"]), e["name"], e["role"], e["email"]]
+        for e in employees
+    ]
+
+    widths = [
+        max(len(headers[i]), *(len(r[i]) for r in rows))
+        for i in range(len(headers))
+    ]
+
+    def line(cells):
+        return " | ".join(c.ljust(w) for c, w in zip(cells, widths)).rstrip()
+
+    lines = [line(headers), "-+-".join("-" * w for w in widths)]
+    lines.extend(line(r) for r in rows)
+    return "\n".join(lines)
+
+
+def _resolve_page(entities: Dict) -> int:
+    """
+    entities["page"] may be a number or "next"/"previous"
+    (relative to entities["current_page"], kept across turns).
+    """
+    requested = entities.get("page")
+    current = int(entities.get("current_page") or 1)
+
+    if requested in ["next", "more"]:
+        return current + 1
+    if requested in ["previous", "prev", "back"]:
+        return max(current - 1, 1)
+
+    try:
+        return max(int(requested), 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _lookup_filters(intent: str, entities: Dict) -> Dict:
+    if intent in ["employee_find_all", "employee_find_last"]:
+        return {}
+
+    for key in LOOKUP_FILTERS:
+        if entities.get(key):
+            return {key: entities[key]}
+
+    return {}
+
+
+def lookup_employees(intent: str, entities: Dict) -> Dict:
+    """
+    Run an employee lookup and return one page:
+    {"employees", "total", "page", "pages"}
+    """
+    filters = _lookup_filters(intent, entities)
+
+    if intent == "employee_find_last":
+        employees, total = search_employees(filters, limit=1, newest_first=True)
+        return {"employees": employees, "total": total, "page": 1, "pages": 1}
+
+    page = _resolve_page(entities)
+    employees, total = search_employees(
+        filters,
+        limit=EMPLOYEE_PAGE_SIZE,
+        offset=(page - 1) * EMPLOYEE_PAGE_SIZE,
+    )
+    pages = max((total + EMPLOYEE_PAGE_SIZE - 1) // EMPLOYEE_PAGE_SIZE, 1)
+
+    return {"employees": employees, "total": total, "page": page, "pages": pages}
+
+
+def render_lookup(result: Dict) -> str:
+    total = result["total"]
+
+    if total == 0:
+        return "No employees found."
+
+    if not result["employees"]:
+        return f"Page {result['page']} is empty ({result['pages']} page(s) in total)."
+
+    lines = []
+    if total == 1:
+        lines.append("Found 1 employee:")
+    elif result["pages"] == 1:
+        lines.append(f"Found {total} employees:")
+    else:
+        first = (result["page"] - 1) * EMPLOYEE_PAGE_SIZE + 1
+        last = first + len(result["employees"]) - 1
+        lines.append(
+            f"Found {total} employees (showing {first}-{last}, "
+            f"page {result['page']} of {result['pages']}):"
+        )
+
+    lines.append(render_employee_table(result["employees"]))
+
+    if result["page"] < result["pages"]:
+        lines.append("\nSay \"next page\" to see more.")
+
+    return "\n".join(lines)
+
+
+def summarize_for_llm(result: Dict) -> Dict:
+    """
+    Capped view of a lookup for the LLM: counts + top rows only.
+    """
+    return {
+        "total_count": result["total"],
+        "rows_shown": min(len(result["employees"]), EMPLOYEE_LLM_ROW_LIMIT),
+        "top_rows": result["employees"][:EMPLOYEE_LLM_ROW_LIMIT],
+    }
+
+
+def render_context(context: Dict) -> str:
+    """
+    Template reply for a response context, used when the LLM is unavailable.
+    """
+    entities = context.get("entities", {})
+
+    if context.get("result") == "created":
+        return f"Employee {entities.get('name')} created with ID {context['employee_id']}."
+
+    if context.get("result") == "duplicate_email":
+        return f"An employee with email {entities.get('email')} already exists."
+
+    if context.get("intent") == "create_employee" and context.get("missing_fields"):
+        return "To register the employee, please provide: " + ", ".join(context["missing_fields"]) + "."
+
+    if context.get("employees"):
+        return (
+            f"Found {context['employees']['total_count']} matching employee(s):\n"
+            + render_employee_table(context["employees"]["top_rows"])
+        )
+
+    return "Sorry, I couldn't process that employee request right now. Please try again shortly."
+
+
+def _respond(context: Dict) -> str:
+    try:
+        return (prompt | llm).invoke({"input": context}).content
+    except LLMUnavailable:
+        return render_context(context)
+
+
 # -----------------------------
 # EMPLOYEE AGENT
 # -----------------------------
@@ -77,13 +237,10 @@ def employee_agent(state: HRState) -> Dict:
         if safe_missing_fields:
             response_context["missing_fields"] = safe_missing_fields
 
-            chain = prompt | llm
-            final_response = chain.invoke({"input": response_context})
-
             return {
                 "data": data,
                 "messages": state.get("messages", []) + [
-                    {"role": "assistant", "content": final_response.content}
+                    {"role": "assistant", "content": _respond(response_context)}
                 ]
             }
 
@@ -100,81 +257,56 @@ def employee_agent(state: HRState) -> Dict:
             response_context["result"] = "created"
             response_context["employee_id"] = emp_id
 
-        chain = prompt | llm
-        final_response = chain.invoke({"input": response_context})
+        # Structured commands: deterministic confirmation, no LLM
+        if state.get("channel") == "command":
+            if existing:
+                content = f"An employee with email {email} already exists (ID {existing['id']})."
+            else:
+                content = f"Employee {name} created with ID {emp_id}."
+            return {
+                "data": data,
+                "messages": state.get("messages", []) + [
+                    {"role": "assistant", "content": content}
+                ]
+            }
 
         return {
             "data": data,
             "messages": state.get("messages", []) + [
-                {"role": "assistant", "content": final_response.content}
+                {"role": "assistant", "content": _respond(response_context)}
             ]
         }
     
     # -----------------------------
-    # FIND EMPLOYEE
+    # FIND EMPLOYEE (deterministic, paginated, no LLM)
     # -----------------------------
-    elif intent == "find_employee":
-        if "email" in entities:
-            employee = get_employee_by_email(entities["email"])
-            employees = [employee] if employee else []
-
-        elif "id" in entities:
-            employee = get_employee_by_id(int(entities["id"]))
-            employees = [employee] if employee else []
-
-        elif "name" in entities:
-            employees = get_employees_by_name(entities["name"])
-
-        elif "role" in entities:
-            employees = get_employees_by_role(entities["role"])
-
-        else:
-            employees = get_all_employees()
-
-        response_context["employees"] = employees
-
-        chain = prompt | llm
-        final_response = chain.invoke({"input": response_context})
-
-        return {
-            "data": data,
-            "messages": state.get("messages", []) + [
-                {"role": "assistant", "content": final_response.content}
-            ]
-        }
-    
-
-    if intent == "employee_find_all":
-        employees = get_all_employees()
-
-        if not employees:
-            return {
-                "messages": state.get("messages", []) + [
-                    {"role": "assistant", "content": "No employees found."}
-                ]
-            }
+    elif intent in LOOKUP_INTENTS:
+        result = lookup_employees(intent, entities)
 
-        lines = ["Here are all employees:"]
-        for e in employees:
-            lines.append(
-                f"- ID {e['id']}: {e['name']} ({e['role']}, {e['email']})"
-            )
+        # "page" is consumed; "current_page" makes "next page" work next turn
+        remaining = {k: v for k, v in entities.items() if k != "page"}
 
         return {
+            "data": {
+                **data,
+                "entities": {**remaining, "current_page": result["page"]},
+            },
             "messages": state.get("messages", []) + [
-                {"role": "assistant", "content": "\n".join(lines)}
+                {"role": "assistant", "content": render_lookup(result)}
             ]
         }
 
     # -----------------------------
     # FALLBACK
     # -----------------------------
-    chain = prompt | llm
-    final_response = chain.invoke({"input": response_context})
+    if any(entities.get(k) for k in LOOKUP_FILTERS):
+        response_context["employees"] = summarize_for_llm(
+            lookup_employees("find_employee", entities)
+        )
 
     return {
         "data": data,
         "messages": state.get("messages", []) + [
-            {"role": "assistant", "content": final_response.content}
+            {"role": "assistant", "content": _respond(response_context)}
         ]
     }
\ No newline at end of file
@@ -1,16 +1,19 @@
-from typing import Dict
-from langchain_openai import ChatOpenAI
+import re
+from typing import Dict, List
 from langchain_core.prompts import ChatPromptTemplate
 
 from graph.state import HRState
-from tools.vector_tool import similarity_search
-from config.settings import LLM_MODEL, LLM_TEMPERATURE
+from graph.prefetch import prefetched, job_context, discard
+from tools.llm_tiers import get_llm
+from tools.llm_resilience import LLMUnavailable
+from tools.vector_tool import similarity_search_batch, get_knowledge_version, match_faq, QueryVectors
+from tools.lexical_index import tokenize
+from tools.answer_cache import AnswerCache
+from tools.context_builder import assemble_context
+from config.settings import KNOWLEDGE_CANDIDATES
 
 
-llm = ChatOpenAI(
-    model=LLM_MODEL,
-    temperature=LLM_TEMPERATURE
-)
+llm = get_llm("knowledge.answer")
 
 
 # -----------------------------
@@ -80,13 +83,99 @@ prompt = ChatPromptTemplate.from_messages(
 )
 
 
+# Clause boundaries of compound questions ("leave policy and WFH rules")
+_QUESTION_SPLIT = re.compile(
+    r"(\?\s*|;\s*|,?\s+(?:and also|as well as|and|plus)\s+|\s*&\s*|,\s*)",
+    re.IGNORECASE,
+)
+
+
+def split_question(question: str) -> List[str]:
+    """
+    Split a compound question into its parts. A part needs two content
+    words to stand alone; shorter ones are glued back to their neighbour,
+    so phrases like "start and end time" stay whole.
+    Returns [question] when there is nothing to split.
+    """
+    pieces = _QUESTION_SPLIT.split(question)
+    parts: List[str] = []
+
+    for index in range(0, len(pieces), 2):
+        part = pieces[index]
+        if parts and (len(tokenize(part)) < 2 or len(tokenize(parts[-1])) < 2):
+            parts[-1] += pieces[index - 1] + part
+        else:
+            parts.append(part)
+
+    parts = [p.strip(" ,.?;&") for p in parts]
+    parts = [p for p in parts if p]
+    return parts if len(parts) > 1 else [question]
+
+
+def retrieval_queries(question: str) -> List[str]:
+    """
+    What is searched for a question: compound questions are searched as a
+    whole and per part (in one batch), so each part gets its own chunks.
+    """
+    parts = split_question(question)
+    return [question] + parts if len(parts) > 1 else [question]
+
+
+def _interleave(results: List[List[str]]) -> List[str]:
+    """Round-robin over per-query rankings, keeping the first occurrence."""
+    merged: List[str] = []
+    for rank in range(max((len(r) for r in results), default=0)):
+        for ranking in results:
+            if rank < len(ranking) and ranking[rank] not in merged:
+                merged.append(ranking[rank])
+    return merged
+
+
+# Same question (or a near-identical one) -> same answer, until the
+# knowledge files or the index change
+answer_cache = AnswerCache()
+
+
 # -----------------------------
 # KNOWLEDGE AGENT
 # -----------------------------
 def knowledge_agent(state: HRState) -> Dict:
     user_input = state["user_input"]
 
-    docs = similarity_search(user_input)
+    version = get_knowledge_version()
+    queries = retrieval_queries(user_input)
+    retrieval = ("retrieval", tuple(queries))
+
+    # Embedded on first use only: the exact-key cache lookup and the
+    # lexical fast path need no vector, the neighbour lookup only when
+    # there are cached questions to compare with. A prefetched retrieval
+    # shares its vectors.
+    vectors = job_context(state, retrieval) or QueryVectors()
+    cached = answer_cache.get(user_input, version, embed=vectors.get)
+    if cached:
+        discard(state, retrieval)
+        return {
+            "messages": state.get("messages", []) + [
+                {"role": "assistant", "content": cached}
+            ]
+        }
+
+    # Precomputed FAQ: a confident match to a canonical question is answered
+    # without generation (compound questions always go to the LLM)
+    if len(queries) == 1:
+        faq = match_faq(user_input, query_vectors=vectors)
+        if faq:
+            discard(state, retrieval)
+            return {
+                "messages": state.get("messages", []) + [
+                    {"role": "assistant", "content": faq["answer"]}
+                ]
+            }
+
+    docs = _interleave(prefetched(
+        state, retrieval,
+        similarity_search_batch, queries, k=KNOWLEDGE_CANDIDATES, query_vectors=vectors,
+    ))
 
     # Rule 5: If no chunk passes the threshold, treat as "not found"
     if not docs:
@@ -99,17 +188,36 @@ def knowledge_agent(state: HRState) -> Dict:
             ]
         }
 
-    context = "\n\n".join(docs)
+    # Deduplicated, relevance-ordered and within the prompt token budget
+    context = "\n\n".join(assemble_context(docs))
 
     chain = prompt | llm
-    response = chain.invoke(
-        {
-            "input": (
-                f"Policy Context:\n{context}\n\n"
-                f"User Question:\n{user_input}"
-            )
+    try:
+        response = chain.invoke(
+            {
+                "input": (
+                    f"Policy Context:\n{context}\n\n"
+                    f"User Question:\n{user_input}"
+                )
+            }
+        )
+    except LLMUnavailable:
+        # Not cached: the next turn should get a generated answer again
+        return {
+            "messages": state.get("messages", []) + [
+                {
+                    "role": "assistant",
+                    "content": (
+                        "I can't generate a full answer right now. "
+                        f"The most relevant policy section says:\n\n{docs[0].strip()}"
+                    )
+                }
+            ]
         }
-    )
+
+    # Only a vector computed for this turn: fast-path answers are cached
+    # for exact repeats instead of paying for an embedding here
+    answer_cache.put(user_input, version, response.content, vector=vectors.peek(user_input))
 
     return {
         "messages": state.get("messages", []) + [
@@ -3,14 +3,13 @@ from datetime import datetime
 import calendar
 
 from graph.state import HRState
+from graph.prefetch import prefetched
 from tools.db_tool import (
-    get_employee_by_id,
-    get_employee_by_email,
-    get_employees_by_name,
     get_attendance_for_employee_on_date,
     get_attendance_for_employee,
     get_attendance_summary_for_date,
 )
+from tools.employee_resolver import get_resolver, format_candidates, AMBIGUOUS
 from tools.time_tool import (
     calculate_duration_hours,
     current_date,
@@ -138,7 +137,7 @@ def report_agent(state: HRState) -> Dict:
         if not date_str:
             date_str = current_date() # Fallback if normalization fails
 
-        summary = get_attendance_summary_for_date(date_str)
+        summary = prefetched(state, ("summary", date_str), get_attendance_summary_for_date, date_str)
         response_text = format_attendance_summary(date_str, summary)
         
         return {
@@ -150,29 +149,24 @@ def report_agent(state: HRState) -> Dict:
     # =========================================================
     # EMPLOYEE RESOLUTION
     # =========================================================
-    employee = None
-    
-    # Try different ID fields
-    emp_id = entities.get("employee_id") or entities.get("id")
-    
-    if emp_id:
-         employee = get_employee_by_id(int(emp_id))
-    elif "email" in entities:
-        employee = get_employee_by_email(entities["email"])
-    elif "name" in entities:
-        matches = get_employees_by_name(entities["name"])
-        if len(matches) == 1:
-            employee = matches[0]
-        elif len(matches) > 1:
-            # FAIL-SAFE: Ambiguous
-            return {
-                "messages": state.get("messages", []) + [
-                    {"role": "assistant", "content": "Employee information is ambiguous. Please provide ID."}
-                ]
-            }
-        else:
-             # FAIL-SAFE: Not found (handled below if employee stays None)
-             pass
+    # id -> email -> name (shared resolver, memoized for this turn)
+    resolution = get_resolver(state).resolve(entities)
+    employee = resolution["employee"]
+
+    if resolution["status"] == AMBIGUOUS:
+        # FAIL-SAFE: Ambiguous
+        return {
+            "messages": state.get("messages", []) + [
+                {
+                    "role": "assistant",
+                    "content": (
+                        "Employee information is ambiguous "
+                        f"({format_candidates(resolution['candidates'])}). "
+                        "Please provide ID."
+                    ),
+                }
+            ]
+        }
 
     # For employee reports, we MUST have an employee
     if not employee:
@@ -1,11 +1,15 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
+import uuid
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 
 from graph.state import HRState
-from config.settings import LLM_MODEL, LLM_TEMPERATURE
+from graph import prefetch
+from tools.llm_tiers import get_llm, with_parse_fallback
+from tools.llm_resilience import LLMUnavailable
+from tools.intent_rules import classify_by_rules
+from agents.supervisor_prompt import build_system_prompt
 
 from tools.time_tool import normalize_time_24h
 
@@ -13,20 +17,24 @@ from tools.time_tool import normalize_time_24h
 # -----------------------------
 # Structured Output Schema
 # -----------------------------
+class SupervisorTask(BaseModel):
+    intent: str
+    entities: Dict[str, Any]
+
+
 class SupervisorOutput(BaseModel):
     intent: str
     action: str                  # start | continue | query | confirm | cancel
     entities: Dict[str, Any]
     confidence: float
+    tasks: List[SupervisorTask] = []   # only for multi-task messages
 
 
 # -----------------------------
 # LLM Setup
 # -----------------------------
-llm = ChatOpenAI(
-    model=LLM_MODEL,
-    temperature=LLM_TEMPERATURE
-)
+llm = get_llm("supervisor.classify")
+greeting_llm = get_llm("supervisor.greeting")
 
 parser = PydanticOutputParser(pydantic_object=SupervisorOutput)
 
@@ -34,178 +42,77 @@ parser = PydanticOutputParser(pydantic_object=SupervisorOutput)
 # -----------------------------
 # Prompt
 # -----------------------------
-# -----------------------------
-# Prompt
-# -----------------------------
+# System text is assembled per message (agents/supervisor_prompt.py): a
+# compact core plus the rule blocks relevant to the message and the
+# previous intent, within SUPERVISOR_PROMPT_TOKENS
 prompt = ChatPromptTemplate.from_messages(
     [
-        (
-            "system",
-            """
-            You are a Supervisor AI for an HR Management System.
-
-            Your responsibilities:
-            1. Understand ANY user message (greetings, questions, commands).
-            2. Detect the user's intent accurately.
-            3. Extract structured entities.
-
-            If the user greets (hi, hello, hiiiii, hey) OR asks questions like
-            "who are you", "what can you do":
-
-            - Treat it as intent = "greeting"
-            - Respond as an HR Management Assistant
-            - Clearly explain your capabilities:
-              • Employee registration
-              • Attendance (start/end work)
-              • Daily & monthly working reports
-              • HR policies and company rules
-
-            IMPORTANT:
-            - Do NOT answer HR policy content for greetings
-            - Do NOT route greetings to other agents
-            - Your greeting response should be friendly and informative
-
-            Attendance rules:
-            - If user mentions a time (e.g. 10:00, 9am, 6:30 pm), extract it.
-            - If time is NOT mentioned, still detect intent but do NOT guess time.
-
-            Supported intents:
-            - greeting
-            - create_employee
-            - find_employee
-            - employee_find_all
-            - attendance_start
-            - attendance_end
-            - attendance_range
-            - attendance_summary
-            - daily_report
-            - monthly_report
-            - working_hours
-            - hr_policy
-            - unknown
-          
-
-            CRITICAL ENTITY EXTRACTION & FOLLOW-UP RULES:
-
-            (All examples below use dummy names for illustration only.)
-
-            Employee registration handling:
-            - Users may provide name, email, and role in ANY format.
-            - Entity identification rules:
-                - Any word containing "@" MUST be treated as email.
-                - Prefer human-name–like words as name.
-                - Prefer job-related words as role.
-            - Confirmation requirement:
-                - Before creating an employee, always prepare a confirmation summary.
-                - Ask the user to confirm with a clear yes/no response.
-
-            Conversation memory rules:
-            - If the intent is "create_employee" and some fields are missing:
-                - Reuse entities already provided in previous messages.
-                - DO NOT discard earlier information.
-
-            Attendance NLU RULES (STRICT):
-
-            Supported attendance intents:
-            - attendance_start
-            - attendance_end
-            - attendance_range
-            - attendance_summary
-
-            Attendance intent mapping:
-            - "start work", "started at", "check in", "began work" -> attendance_start
-            - "end work", "finished", "check out", "ended work" -> attendance_end
-            - "work from 9 to 6", "start at 10 and end at 7", "worked 9–6" -> attendance_range
-            - "check in at 9 check out at 6" -> attendance_range
-            - "how many employees worked today", "who has not started work", "attendance summary" -> attendance_summary
-
-            Attendance Routing Rules (CRITICAL):
-            - IF user mentions "start work", "end work", "worked", "check in/out", "attendance"
-            - THEN intent MUST be attendance_*.
-            - NEVER route these to hr_policy.
-
-            Employee identification:
-            - If a number is mentioned and refers to an employee -> employee_id
-            - If text contains "@" -> email
-            - Otherwise treat human-like words as name
-            - **CRITICAL NAME PLACEMENT RULE**:
-              - If the sentence starts with a word followed by a command (e.g., "[name] start work"), that first word IS the name.
-              - Examples:
-                "het start work" -> name = "het"
-                "smith check in" -> name = "smith"
-                "yash ended work" -> name = "yash"
-                "ankit start work" -> name = "ankit"
-            - Treat lowercase names (het, yash, smith, ankit) as VALID names.
-            - TRUST the first word as the name if it precedes a command.
-            - **OVERRIDE RULE**: If a new name is found at the start of a command, USE IT. Do NOT use the previously stored name.
-
-            Time extraction:
-            - Extract times from phrases like:
-              "10", "10:00", "10 am", "7 pm", "evening 7:30", "from 9 to 6"
-            - Convert all times to 24-hour format (HH:MM).
-            - AM/PM Handling:
-              - "7" -> 19:00 (if context implies evening/end work)
-              - "7 pm" -> 19:00
-              - "6" -> 18:00 (end work context)
-              - "9" -> 09:00 (morning/start context)
-            - Use start_time and end_time keys.
-            - If intent is attendance_range, extract both times.
-
-            Date extraction:
-            - Extract dates from natural language:
-              "today", "yesterday", "tomorrow", "10 jan", "january 12"
-            - Do NOT invent dates
-            - Do NOT validate future or past dates
-
-            Intent continuity (CRITICAL):
-            - If the previous intent was attendance_start, attendance_end, attendance_range, or attendance_summary
-            - And the next message contains:
-              - only time ("11:00", "7 pm")
-              - only confirmation ("yes", "ok", "update it")
-              - only employee name/id/email
-            - Then KEEP the same attendance intent
-            - Do NOT switch intent to hr_policy, find_employee, or unknown
-            - Do NOT reset entities
-
-           
-            Confirmation handling:
-            - If the user says "yes", "confirm", "update it", "ok" -> action = confirm
-            - If the user says "no", "cancel" -> action = cancel
-            - Do NOT reset entities on confirmation
-
-            EMPLOYEE LISTING RULE (CRITICAL):
-
-            If user asks:
-            - "show employee details"
-            - "show all employee details"
-            - "list employees"
-            - "all employees"
-            - "employee list"
-
-            Then:
-            - intent = employee_find_all
-            - action = query
-            - entities = empty
-            - Do NOT ask follow-up questions
-
-            Policy vs Report clarification:
-            - "office working hours", "company working time" -> intent = hr_policy
-            - "working hours of an employee", "hours worked today" -> intent = working_hours_report
-
-            Return ONLY structured output.
-            {format_instructions}
-            """
-        ),
+        ("system", "{system}"),
         ("human", "{input}")
     ]
-).partial(format_instructions=parser.get_format_instructions())
+)
+
+
+def _normalize_times(intent: str, entities: Dict[str, Any]) -> str:
+    """
+    Normalize extracted times to HH:MM (in place) and return the intent,
+    forced to attendance_range when both start and end times are present.
+    """
+    if "time" in entities:
+        try:
+            entities["time"] = normalize_time_24h(entities["time"])
+        except Exception:
+            pass
+
+        if intent == "attendance_start" and "start_time" not in entities:
+            entities["start_time"] = entities["time"]
+
+        if intent == "attendance_end" and "end_time" not in entities:
+            entities["end_time"] = entities["time"]
+
+    for key in ["start_time", "end_time"]:
+        if key in entities and entities[key]:
+            try:
+                entities[key] = normalize_time_24h(entities[key])
+            except Exception:
+                pass
+
+    # If user said both start and end in one sentence
+    if "start_time" in entities and "end_time" in entities:
+        entities["has_both_times"] = True
+        if intent != "attendance_range":
+            intent = "attendance_range" # Force classification if NLU missed it but entities exist
+
+    return intent
+
 
 # -----------------------------
 # Supervisor Agent
 # -----------------------------
+GREETING_FALLBACK = (
+    "Hello! I'm the HR assistant. I can help with:\n"
+    "- Employee registration\n"
+    "- Finding employee details\n"
+    "- Attendance (start work, end work)\n"
+    "- Daily and monthly working hour reports\n"
+    "- HR policies and company rules"
+)
+
+
 def supervisor_agent(state: HRState):
-    chain = prompt | llm | parser
-    result = chain.invoke({"input": state["user_input"]})
+    # Likely DB / retrieval work runs while the model classifies
+    turn_id = uuid.uuid4().hex
+    prefetch.start(turn_id, state["user_input"], state.get("intent"))
+
+    chain = with_parse_fallback(lambda model: prompt | model | parser, llm, "supervisor.classify")
+    try:
+        result = chain.invoke({
+            "system": build_system_prompt(state["user_input"], state.get("intent")),
+            "input": state["user_input"],
+        })
+    except LLMUnavailable:
+        # Model down: keyword rules keep the structured flows working
+        result = SupervisorOutput(**classify_by_rules(state["user_input"], state.get("intent")))
 
     # -----------------------------
     # Merge entities across turns
@@ -218,32 +125,7 @@ def supervisor_agent(state: HRState):
 
     new_entities = result.entities or {}
 
-    
-    if "time" in new_entities:
-        try:
-            new_entities["time"] = normalize_time_24h(new_entities["time"])
-        except Exception:
-            pass
-
-        if result.intent == "attendance_start" and "start_time" not in new_entities:
-            new_entities["start_time"] = new_entities["time"]
-
-        if result.intent == "attendance_end" and "end_time" not in new_entities:
-            new_entities["end_time"] = new_entities["time"]
-
-    for key in ["start_time", "end_time"]:
-        if key in new_entities and new_entities[key]:
-            try:
-                new_entities[key] = normalize_time_24h(new_entities[key])
-            except Exception:
-                pass
-
-
-    # If user said both start and end in one sentence
-    if "start_time" in new_entities and "end_time" in new_entities:
-        new_entities["has_both_times"] = True
-        if result.intent != "attendance_range": 
-             result.intent = "attendance_range" # Force classification if NLU missed it but entities exist
+    result.intent = _normalize_times(result.intent, new_entities)
 
     # -----------------------------
     # Smart Merge (Protect ID integrity)
@@ -298,15 +180,21 @@ def supervisor_agent(state: HRState):
                 ),
                 ("human", "{input}")
             ]
-        ) | llm
+        ) | greeting_llm
 
-        response = response_chain.invoke({"input": state["user_input"]})
+        try:
+            greeting = response_chain.invoke({"input": state["user_input"]}).content
+        except LLMUnavailable:
+            greeting = GREETING_FALLBACK
 
+        prefetch.settle(turn_id, [])
         return {
             "intent": "greeting",
+            "channel": "chat",
             "stop": True,   # 🔑 IMPORTANT
+            "tasks": [],
             "messages": state.get("messages", []) + [
-                {"role": "assistant", "content": response.content}
+                {"role": "assistant", "content": greeting}
             ]
         }
     
@@ -323,6 +211,24 @@ def supervisor_agent(state: HRState):
 
     normalized_intent = INTENT_MAP.get(result.intent, result.intent)
 
+    # -----------------------------
+    # Multi-task messages (fan-out)
+    # -----------------------------
+    tasks = []
+    for task in result.tasks:
+        if task.intent in ["greeting", "unknown"]:
+            continue
+        entities = {k: v for k, v in (task.entities or {}).items() if v}
+        intent = _normalize_times(task.intent, entities)
+        tasks.append({
+            "intent": INTENT_MAP.get(intent, intent),
+            "action": result.action,
+            "entities": entities,
+        })
+
+    if len(tasks) < 2:
+        tasks = []
+
     # -----------------------------
     # Enforce intent continuity
     # -----------------------------
@@ -354,6 +260,8 @@ def supervisor_agent(state: HRState):
             **merged_entities
         }
 
+    prefetch.settle(turn_id, tasks or [{"intent": normalized_intent, "entities": merged_entities}])
+
     return {
         "intent": normalized_intent,
         "action": result.action, # EXPORT ACTION!
@@ -363,5 +271,9 @@ def supervisor_agent(state: HRState):
             "confidence": result.confidence
         },
         "stop": False,
+        "channel": "chat",
+        "turn_id": turn_id,
+        "tasks": tasks,
+        "task_results": None,
         "messages": state.get("messages", [])
     }
\ No newline at end of file
@@ -0,0 +1,213 @@
+import logging
+import re
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+from config.settings import SUPERVISOR_PROMPT_TOKENS
+from tools.llm_tiers import task_model
+from utils.helpers import count_tokens
+
+
+logger = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Core (sent with every message)
+# -----------------------------
+CORE = """
+You are the Supervisor AI of an HR Management System. Classify the user's
+message into ONE intent, pick the action and extract entities.
+
+Intents:
+greeting (hi, hello, "who are you", "what can you do"), create_employee,
+find_employee, employee_find_all, attendance_start, attendance_end,
+attendance_range, attendance_summary, daily_report, monthly_report,
+working_hours_report, hr_policy (company policies and rules), unknown
+
+Actions: start | continue | query | confirm | cancel
+- "yes", "ok", "confirm", "update it" -> confirm; "no", "cancel" -> cancel
+
+Entities:
+- a word containing "@" is the email
+- a number referring to an employee is employee_id
+- human-like words are the name; lowercase names (het, yash) are valid
+- times go to start_time / end_time as HH:MM (24h); never guess a time
+- do not invent values the user did not give
+""".strip()
+
+FORMAT = """
+Return ONLY a JSON object:
+{"intent": str, "action": str, "entities": {...}, "confidence": 0.0-1.0,
+ "tasks": [{"intent": str, "entities": {...}}]}
+"tasks" stays [] unless the message asks for several operations.
+""".strip()
+
+
+# -----------------------------
+# Rule blocks (only when relevant)
+# -----------------------------
+class RuleBlock(NamedTuple):
+    name: str
+    text: str
+    triggers: Optional[Pattern]     # matched against the lowercased message
+    after_intents: Tuple[str, ...]  # previous intents that pull the block in
+
+
+ATTENDANCE_INTENTS = ("attendance_start", "attendance_end", "attendance_range", "attendance_summary")
+LISTING_INTENTS = ("find_employee", "employee_find_all")
+
+# In priority order: when the budget is tight, later blocks are dropped first
+RULE_BLOCKS: List[RuleBlock] = [
+    RuleBlock(
+        "continuity",
+        """
+Intent continuity (CRITICAL): the previous intent was {previous_intent}.
+If this message only gives a time ("11:00", "7 pm"), a confirmation
+("yes", "ok", "update it") or an employee name/id/email, KEEP that intent
+and do not reset entities. Never switch to hr_policy, find_employee or
+unknown in that case.
+""",
+        None,
+        ATTENDANCE_INTENTS,
+    ),
+    RuleBlock(
+        "attendance",
+        """
+Attendance (STRICT):
+- "start work", "started at", "check in", "began work" -> attendance_start
+- "end work", "finished", "check out", "ended work" -> attendance_end
+- "work from 9 to 6", "start at 10 and end at 7", "check in at 9 check out at 6" -> attendance_range (extract both times)
+- "how many employees worked today", "who has not started work", "attendance summary" -> attendance_summary
+- Messages about start/end work, worked, check in/out or attendance are NEVER hr_policy.
+- Name placement: a word before the command IS the name ("het start work" -> name = "het", "yash ended work" -> name = "yash"); a new name overrides the previously stored one.
+- Times: "10", "10:00", "10 am", "evening 7:30", "from 9 to 6". "7 pm" -> 19:00; a bare "6" or "7" when ending work -> 18:00 / 19:00; "9" when starting -> 09:00.
+""",
+        re.compile(
+            r"\b(start|started|end|ended|finish|finished|work|worked|working|check ?in|check ?out|checked|"
+            r"attendance|arrived|came in|left|logged)\b|\b\d{1,2}(:\d{2})?\s*(am|pm)\b"
+        ),
+        ATTENDANCE_INTENTS,
+    ),
+    RuleBlock(
+        "multi_task",
+        """
+Several operations or employees in ONE message ("het, yash and ankit
+started at 9", "start work for het and show his monthly report"): fill
+"tasks" with one entry per (employee, operation), each with COMPLETE
+entities (repeat shared times/dates, resolve "his"/"her" to the name).
+Policy questions inside become an hr_policy task with entities.question.
+Set the top-level intent and entities to the FIRST task.
+""",
+        re.compile(r",|;|\band\b|\balso\b|\bthen\b|\bplus\b"),
+        (),
+    ),
+    RuleBlock(
+        "registration",
+        """
+Employee registration:
+- Name, email and role may come in ANY order or format; prefer human-name
+  words as name and job words as role.
+- Fields given in earlier messages are kept: only extract what is new,
+  never discard earlier information.
+""",
+        re.compile(r"\b(register|registration|add|create|onboard|new employee|hire|role)\b|@"),
+        ("create_employee",),
+    ),
+    RuleBlock(
+        "listing",
+        """
+Employee listing:
+- "show employee details", "list employees", "all employees", "employee list"
+  -> employee_find_all, action query, empty entities, no follow-up questions
+- Pagination keeps the previous listing intent: "next page", "show more",
+  "more" -> entities.page = "next"; "previous page" -> "previous";
+  "page 3" -> 3
+""",
+        re.compile(r"\b(list|employees|employee details|page|more|previous)\b"),
+        LISTING_INTENTS,
+    ),
+    RuleBlock(
+        "dates",
+        """
+Dates: extract "today", "yesterday", "tomorrow", "10 jan", "january 12" as
+entities.date exactly as said; do not invent or validate dates.
+""",
+        re.compile(
+            r"\b(today|yesterday|tomorrow|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b|\d{4}-\d{2}-\d{2}"
+        ),
+        (),
+    ),
+    RuleBlock(
+        "reports",
+        """
+Policy vs report: "office working hours", "company working time" ->
+hr_policy; "working hours of an employee", "hours worked today" ->
+working_hours_report. "monthly report of X" -> monthly_report, "report of
+X" / "daily report" -> daily_report.
+""",
+        re.compile(r"\b(hours?|report|monthly|daily|summary|policy|policies|timing|time)\b"),
+        (),
+    ),
+]
+
+
+def select_blocks(user_input: str, previous_intent: Optional[str] = None) -> List[RuleBlock]:
+    """Rule blocks relevant to the message or the previous intent."""
+    text = user_input.lower()
+    return [
+        block for block in RULE_BLOCKS
+        if (previous_intent and previous_intent in block.after_intents)
+        or (block.triggers is not None and block.triggers.search(text))
+    ]
+
+
+def _render(block: RuleBlock, previous_intent: Optional[str]) -> str:
+    return block.text.strip().replace("{previous_intent}", previous_intent or "none")
+
+
+def build_system_prompt(
+    user_input: str,
+    previous_intent: Optional[str] = None,
+    budget: Optional[int] = SUPERVISOR_PROMPT_TOKENS,
+    full: bool = False,
+) -> str:
+    """
+    Core + format + the relevant rule blocks, added in priority order
+    while the prompt stays within `budget` tokens (None = no limit).
+    `full=True` includes every block (the pre-selection prompt, used as
+    the regression baseline).
+    """
+    return assemble(user_input, previous_intent, budget, full)[0]
+
+
+def assemble(
+    user_input: str,
+    previous_intent: Optional[str] = None,
+    budget: Optional[int] = SUPERVISOR_PROMPT_TOKENS,
+    full: bool = False,
+) -> Tuple[str, Dict]:
+    """build_system_prompt() plus what went in: (prompt, {blocks, dropped, tokens})."""
+    model = task_model("supervisor.classify")
+    candidates = RULE_BLOCKS if full else select_blocks(user_input, previous_intent)
+    if full:
+        budget = None
+
+    def render(parts: List[str]) -> str:
+        return "\n\n".join([CORE, *parts, FORMAT])
+
+    parts, blocks, dropped = [], [], []
+
+    for block in candidates:
+        text = _render(block, previous_intent)
+        # Counted on the whole prompt: separators and merges make block
+        # counts not add up exactly
+        if budget is not None and count_tokens(render(parts + [text]), model) > budget:
+            dropped.append(block.name)
+            continue
+        parts.append(text)
+        blocks.append(block.name)
+
+    if dropped:
+        logger.info("Supervisor prompt over %s tokens; dropped rule blocks %s", budget, dropped)
+
+    prompt = render(parts)
+    return prompt, {"blocks": blocks, "dropped": dropped, "tokens": count_tokens(prompt, model)}
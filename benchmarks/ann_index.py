@@ -0,0 +1,135 @@
+"""
+Approximate vector index types against the exact flat baseline.
+
+    python -m benchmarks.ann_index                          # 50k x 256, all types
+    python -m benchmarks.ann_index --n 1000000 --types flat hnsw ivfpq
+    python -m benchmarks.ann_index --json report.json
+
+The corpus is synthetic (see synthetic_corpus); queries are drawn from
+the same distribution.
+For every index type (tools/ann_index.py, built exactly as vector_tool
+builds it) reports build/training time, recall@k against exact search,
+single-query latency (p50/p95), batched throughput and index memory.
+"""
+import argparse
+import json
+import time
+from statistics import median
+from typing import Dict, List
+
+import numpy as np
+
+from tools.ann_index import (
+    INDEX_TYPES,
+    build_ann_index,
+    exact_neighbors,
+    index_memory_bytes,
+    recall_at_k,
+)
+
+
+def synthetic_corpus(
+    n: int,
+    dim: int,
+    topics: int = 512,
+    intrinsic_dim: int = 32,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Unit vectors around topic centres on a low-dimensional subspace plus a
+    little isotropic noise: text embeddings have far fewer degrees of
+    freedom than dimensions, which is what ANN indexes exploit.
+    """
+    rng = np.random.default_rng(0)
+    projection = rng.normal(size=(intrinsic_dim, dim)).astype(np.float32)
+    centres = rng.normal(size=(topics, intrinsic_dim)).astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    latent = centres[rng.integers(0, topics, n)]
+    latent += 0.5 * rng.normal(size=(n, intrinsic_dim)).astype(np.float32)
+
+    vectors = latent @ projection
+    vectors += 0.05 * np.linalg.norm(vectors, axis=1, keepdims=True) / np.sqrt(dim) * \
+        rng.normal(size=(n, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def evaluate_index(
+    index_type: str,
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    k: int,
+) -> Dict:
+    started = time.perf_counter()
+    index, spec = build_ann_index(vectors, index_type)
+    build_seconds = time.perf_counter() - started
+
+    latencies_us = []
+    found = []
+    for query in queries:
+        started = time.perf_counter()
+        _, ids = index.search(query[None, :], k)
+        latencies_us.append((time.perf_counter() - started) * 1e6)
+        found.append(ids[0])
+
+    started = time.perf_counter()
+    index.search(queries, k)
+    batch_seconds = time.perf_counter() - started
+
+    memory = index_memory_bytes(index)
+
+    return {
+        "index_type": index_type,
+        "spec": spec,
+        "vectors": len(vectors),
+        "dim": vectors.shape[1],
+        "k": k,
+        f"recall_at_{k}": round(recall_at_k(np.array(found), truth), 4),
+        "query_us_p50": round(median(latencies_us), 1),
+        "query_us_p95": round(_percentile(latencies_us, 0.95), 1),
+        "batch_queries_per_second": round(len(queries) / batch_seconds),
+        "memory_mb": round(memory / 2**20, 2),
+        "bytes_per_vector": round(memory / len(vectors), 1),
+        "build_seconds": round(build_seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=50_000, help="Corpus vectors")
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    vectors = synthetic_corpus(args.n, args.dim)
+    queries = synthetic_corpus(args.queries, args.dim, seed=1)
+    truth = exact_neighbors(vectors, queries, args.k)
+
+    report = [
+        evaluate_index(index_type, vectors, queries, truth, args.k)
+        for index_type in args.types
+    ]
+
+    for row in report:
+        print(f"\n[{row['index_type']}] {row['spec']}")
+        for key, value in row.items():
+            if key not in ["index_type", "spec"]:
+                print(f"  {key:28} {value}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Retrieval-quality comparison of embedding backends on the knowledge/ corpus.
+
+    python -m benchmarks.compare_embeddings                  # local only
+    python -m benchmarks.compare_embeddings --backends local openai
+    python -m benchmarks.compare_embeddings --json report.json
+
+For every labeled question the chunk ranking is checked against the
+expected policy text. Reports hit@1, recall@k, MRR, how often a relevant
+chunk passes the backend's relevance threshold, how often unanswerable
+questions are correctly rejected, and query embedding latency.
+"""
+import argparse
+import json
+import time
+from statistics import mean, median
+from typing import Dict, List, Optional
+
+from langchain_community.vectorstores import FAISS
+
+from tools.embeddings import create_embeddings, default_threshold
+from tools.chunker import chunk_document
+from tools.file_loader import iter_knowledge_documents
+from tools.vector_tool import _relevance
+
+
+# (question, expected substrings; None = not covered by the policies)
+LABELED_QUESTIONS = [
+    ("how many paid leaves do employees get", ["12 paid leaves"]),
+    ("do unused leaves carry forward", ["carry forward"]),
+    ("what are office working hours", ["10:00 AM to 7:00 PM"]),
+    ("office timings", ["10:00 AM to 7:00 PM"]),
+    ("is work from home allowed", ["Work from home is"]),
+    ("WFH", ["Work from home is"]),
+    ("sick leave", ["sick leave"]),
+    ("casual leave rules", ["casual leave"]),
+    ("company holiday calendar", ["holiday calendar"]),
+    ("what happens if I break company rules", ["disciplinary action", "termination"]),
+    ("can I share company data", ["must not be shared"]),
+    ("harassment policy", ["Harassment"]),
+    ("how do I mark attendance", ["mark attendance", "marking attendance"]),
+    ("can the company change HR policies", ["update HR policies"]),
+    ("what is the dress code", None),
+    ("how much is the travel allowance", None),
+]
+
+
+def _is_relevant(text: str, expected: List[str]) -> bool:
+    return any(e.lower() in text.lower() for e in expected)
+
+
+def evaluate_backend(backend: str, k: int = 4) -> Dict:
+    embeddings = create_embeddings(backend)
+    threshold = default_threshold(backend)
+
+    chunks = []
+    for doc in iter_knowledge_documents():
+        chunks.extend(chunk_document(doc))
+
+    started = time.perf_counter()
+    store = FAISS.from_documents(chunks, embeddings)
+    build_seconds = time.perf_counter() - started
+
+    hits_at_1 = []
+    recall_at_k = []
+    reciprocal_ranks = []
+    passes_threshold = []
+    rejections = []
+    embed_us = []
+
+    for question, expected in LABELED_QUESTIONS:
+        started = time.perf_counter()
+        vector = embeddings.embed_query(question)
+        embed_us.append((time.perf_counter() - started) * 1e6)
+
+        results = [
+            (doc, _relevance(distance))
+            for doc, distance in store.similarity_search_with_score_by_vector(vector, k=k)
+        ]
+
+        above = [(doc, score) for doc, score in results if score >= threshold]
+
+        if expected is None:
+            rejections.append(not above)
+            continue
+
+        ranks = [
+            i for i, (doc, _) in enumerate(results, start=1)
+            if _is_relevant(doc.page_content, expected)
+        ]
+        first: Optional[int] = ranks[0] if ranks else None
+
+        hits_at_1.append(first == 1)
+        recall_at_k.append(first is not None)
+        reciprocal_ranks.append(1.0 / first if first else 0.0)
+        passes_threshold.append(
+            any(_is_relevant(doc.page_content, expected) for doc, _ in above)
+        )
+
+    return {
+        "backend": backend,
+        "model": getattr(embeddings, "model", backend),
+        "chunks": len(chunks),
+        "k": k,
+        "threshold": threshold,
+        "hit_at_1": round(mean(hits_at_1), 3),
+        f"recall_at_{k}": round(mean(recall_at_k), 3),
+        "mrr": round(mean(reciprocal_ranks), 3),
+        "relevant_above_threshold": round(mean(passes_threshold), 3),
+        "unanswerable_rejected": round(mean(rejections), 3) if rejections else None,
+        "query_embed_us_median": round(median(embed_us), 1),
+        "query_embed_us_mean": round(mean(embed_us), 1),
+        "index_build_seconds": round(build_seconds, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", nargs="+", default=["local"])
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    report = [evaluate_backend(backend, k=args.k) for backend in args.backends]
+
+    for row in report:
+        print(f"\n[{row['backend']}] {row['model']}")
+        for key, value in row.items():
+            if key not in ["backend", "model"]:
+                print(f"  {key:28} {value}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
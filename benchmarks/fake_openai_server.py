@@ -0,0 +1,179 @@
+"""
+Local OpenAI-compatible chat completions server with injectable faults,
+for exercising the LLM resilience layer (tools/llm_resilience.py) against
+a real HTTP client: slow responses, 5xx / 429 errors and dropped
+connections.
+
+    python -m benchmarks.fake_openai_server --port 8011 --delay 2 --fail-rate 0.3
+
+then point the agents at it with OPENAI_BASE_URL=http://127.0.0.1:8011/v1.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class Fault:
+    """What to do with one request: wait `delay` seconds, then answer with
+    `status` (200 = normal completion) or drop the connection."""
+
+    delay: float = 0.0
+    status: int = 200
+    drop: bool = False
+
+
+def echo(messages: List[Dict]) -> str:
+    return messages[-1]["content"] if messages else ""
+
+
+class FakeOpenAIServer:
+    """
+    Serves POST /v1/chat/completions on a background thread.
+
+    Requests first consume the scripted `faults` in order; after that each
+    one is delayed by `delay` and fails with probability `fail_rate`
+    (status `fail_status`). Answers come from `responder(messages)`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        responder: Callable[[List[Dict]], str] = echo,
+        delay: float = 0.0,
+        fail_rate: float = 0.0,
+        fail_status: int = 500,
+        seed: int = 0,
+    ):
+        self.responder = responder
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.requests = 0
+
+        self._faults: List[Fault] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def script(self, *faults: Fault):
+        """Queue faults for the next requests, in order."""
+        with self._lock:
+            self._faults.extend(faults)
+
+    def _next_fault(self) -> Fault:
+        with self._lock:
+            self.requests += 1
+            if self._faults:
+                return self._faults.pop(0)
+            failed = self.fail_rate and self._random.random() < self.fail_rate
+            return Fault(delay=self.delay, status=self.fail_status if failed else 200)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, payload: Dict):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+
+                fault = server._next_fault()
+                if fault.delay:
+                    time.sleep(fault.delay)
+
+                if fault.drop:
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+
+                if fault.status != 200:
+                    self._send(fault.status, {"error": {"message": "injected fault", "type": "server_error"}})
+                    return
+
+                messages = request.get("messages", [])
+                content = server.responder(messages)
+                prompt_tokens = sum(len(str(m.get("content", ""))) // 4 + 1 for m in messages)
+                completion_tokens = len(content) // 4 + 1
+
+                self._send(200, {
+                    "id": f"chatcmpl-fake-{server.requests}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model", "fake"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                })
+
+        return Handler
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible server with injected faults")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds before every answer")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--fail-status", type=int, default=500)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.host, args.port, delay=args.delay, fail_rate=args.fail_rate, fail_status=args.fail_status)
+    print(f"Serving {server.url}/chat/completions (Ctrl+C to stop)")
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
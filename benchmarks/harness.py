@@ -0,0 +1,185 @@
+"""
+Offline stand-ins shared by the benchmarks: a deterministic fake chat
+model that answers the way the HR agents expect, helpers to swap it (and
+a database / vector store location) into the running modules, and
+latency statistics.
+"""
+import json
+import random
+import threading
+import time
+from statistics import mean, median
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from utils.helpers import count_tokens
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model answering from `responder(messages) -> str`, optionally after
+    an injected latency (base + uniform jitter, in seconds). Reports token
+    usage like a provider would (tiktoken counts).
+    """
+
+    responder: Callable[[List[BaseMessage]], str]
+    latency_seconds: float = 0.0
+    latency_jitter: float = 0.0
+    seed: int = 0
+
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        self.calls += 1
+
+        if self.latency_seconds or self.latency_jitter:
+            delay = self.latency_seconds + random.Random(self.seed + self.calls).uniform(0, self.latency_jitter)
+            time.sleep(delay)
+
+        content = self.responder(messages)
+        input_tokens = sum(count_tokens(str(m.content)) for m in messages)
+        output_tokens = count_tokens(content)
+
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class HRResponder:
+    """
+    Answers each agent prompt deterministically:
+
+    - supervisor   the classification registered for the exact user input
+                   (see classify()); unknown inputs are "unknown"
+    - FAQ builder  no pairs
+    - anything else (polish, employee and knowledge answers): the human
+      message echoed back, truncated
+    """
+
+    def __init__(self, max_echo_chars: int = 400):
+        self.max_echo_chars = max_echo_chars
+        self._classifications: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, user_input: str, intent: str, entities: Dict[str, Any], action: str = "start"):
+        with self._lock:
+            self._classifications[user_input] = {
+                "intent": intent,
+                "action": action,
+                "entities": entities,
+                "confidence": 0.99,
+                "tasks": [],
+            }
+
+    def forget(self, user_input: str):
+        with self._lock:
+            self._classifications.pop(user_input, None)
+
+    def __call__(self, messages: List[BaseMessage]) -> str:
+        system = str(messages[0].content) if messages else ""
+        human = str(messages[-1].content) if messages else ""
+
+        if "Supervisor AI" in system:
+            with self._lock:
+                output = self._classifications.get(human)
+            return json.dumps(output or {
+                "intent": "unknown", "action": "query", "entities": {}, "confidence": 0.1, "tasks": [],
+            })
+
+        if "FAQ of a company's HR policies" in system:
+            return '{"pairs": []}'
+
+        return human[: self.max_echo_chars]
+
+
+# Module-level chat models the agents call (module, attribute)
+LLM_MODULES = [
+    ("agents.supervisor_agent", "llm"),
+    ("agents.supervisor_agent", "greeting_llm"),
+    ("agents.attendance_agent", "llm"),
+    ("agents.employee_agent", "llm"),
+    ("agents.knowledge_agent", "llm"),
+    ("tools.faq_index", "llm"),
+]
+
+
+def patch_attr(module, name: str, value) -> Callable[[], None]:
+    """Set module.name = value; returns the function restoring it."""
+    previous = getattr(module, name)
+    setattr(module, name, value)
+    return lambda: setattr(module, name, previous)
+
+
+def install_fake_llm(model: BaseChatModel) -> Callable[[], None]:
+    """Swap `model` in for every agent LLM; returns the restore function."""
+    import importlib
+
+    restores = [patch_attr(importlib.import_module(m), attr, model) for m, attr in LLM_MODULES]
+    return lambda: [restore() for restore in reversed(restores)]
+
+
+def use_database(path: str) -> Callable[[], None]:
+    """Point db_tool at `path`; returns the restore function."""
+    import tools.db_tool as db_tool
+
+    return patch_attr(db_tool, "DATABASE_PATH", path)
+
+
+# -----------------------------
+# Statistics
+# -----------------------------
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def latency_stats(seconds: List[float]) -> Dict[str, float]:
+    """count / mean / p50 / p95 / p99 / max, in milliseconds."""
+    if not seconds:
+        return {"count": 0}
+
+    ms = [s * 1000 for s in seconds]
+    return {
+        "count": len(ms),
+        "mean_ms": round(mean(ms), 3),
+        "p50_ms": round(median(ms), 3),
+        "p95_ms": round(percentile(ms, 0.95), 3),
+        "p99_ms": round(percentile(ms, 0.99), 3),
+        "max_ms": round(max(ms), 3),
+    }
+
+
+def time_calls(fn: Callable[[], Any], iterations: int, max_seconds: Optional[float] = None, min_calls: int = 3) -> List[float]:
+    """
+    Call `fn` up to `iterations` times (stopping early, after at least
+    `min_calls`, once `max_seconds` have been spent); returns the durations.
+    """
+    durations: List[float] = []
+    budget_start = time.perf_counter()
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+
+        if (
+            max_seconds is not None
+            and len(durations) >= min_calls
+            and time.perf_counter() - budget_start > max_seconds
+        ):
+            break
+
+    return durations
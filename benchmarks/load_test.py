@@ -0,0 +1,301 @@
+"""
+Concurrent conversation replay against the full graph.
+
+    python -m benchmarks.load_test                                   # 8 sessions, scripted
+    python -m benchmarks.load_test --sessions 32 --conversations 200 --llm-latency 0.4
+    python -m benchmarks.load_test --script recorded.jsonl --json report.json
+
+Every conversation runs turn by turn in its own session (SQLite
+checkpointer, like main.py), `--sessions` of them at a time, against a
+real SQLite HR database file. The agents' LLM is the fake chat model of
+benchmarks/harness.py with injected latency (base + jitter), so the
+LLM's wall time is realistic while the rest of the stack is real.
+
+The default script is: create employee, start work, change the start
+time, confirm, end work, monthly report, policy question. Recorded
+conversations are JSONL, one conversation per line:
+
+    {"turns": [{"user_input": "...", "intent": "...", "action": "...", "entities": {...}}]}
+
+(the fields after user_input are what the supervisor classified).
+"{session}" in any string is replaced by the session number.
+
+Reported: throughput, latency per intent (p50/p95/p99), db_tool latency
+under load, turn errors, and SQLite lock contention: a probe thread
+tries to take the database write lock every few milliseconds and
+records how often it is held by someone else.
+"""
+import os
+
+os.environ.setdefault("EMBEDDING_BACKEND", "local")
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+import argparse
+import json
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from benchmarks.harness import FakeChatModel, HRResponder, install_fake_llm, latency_stats, use_database
+from benchmarks.offline_suite import offline_index
+from benchmarks.synthetic_db import build_synthetic_db
+from utils import tracing
+
+
+DEFAULT_SCRIPT: List[Dict[str, Any]] = [
+    {
+        "user_input": "add load user {session}, load{session}@example.com, developer",
+        "intent": "create_employee",
+        "entities": {"name": "load user {session}", "email": "load{session}@example.com", "role": "developer"},
+    },
+    {
+        "user_input": "load user {session} started work at 9",
+        "intent": "attendance_start",
+        "entities": {"name": "load user {session}", "start_time": "09:00"},
+    },
+    {
+        "user_input": "load user {session} actually started at 9:30",
+        "intent": "attendance_start",
+        "entities": {"name": "load user {session}", "start_time": "09:30"},
+    },
+    {
+        "user_input": "yes update it ({session})",
+        "intent": "unknown",
+        "action": "confirm",
+        "entities": {},
+    },
+    {
+        "user_input": "load user {session} finished at 6 pm",
+        "intent": "attendance_end",
+        "entities": {"name": "load user {session}", "end_time": "18:00"},
+    },
+    {
+        "user_input": "monthly report of load user {session}",
+        "intent": "monthly_report",
+        "action": "query",
+        "entities": {"name": "load user {session}"},
+    },
+    {
+        "user_input": "how many paid leaves do employees get ({session})",
+        "intent": "hr_policy",
+        "action": "query",
+        "entities": {},
+    },
+]
+
+
+def _fill(value, session: int):
+    if isinstance(value, str):
+        return value.replace("{session}", str(session))
+    if isinstance(value, dict):
+        return {k: _fill(v, session) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, session) for v in value]
+    return value
+
+
+def load_script(path: str) -> List[List[Dict]]:
+    with open(path) as f:
+        return [json.loads(line)["turns"] for line in f if line.strip()]
+
+
+class LockProbe:
+    """
+    Samples the database write lock: every `interval` seconds try
+    BEGIN IMMEDIATE without waiting; a "database is locked" answer means a
+    writer held it at that moment.
+    """
+
+    def __init__(self, path: str, interval: float = 0.005):
+        self.path = path
+        self.interval = interval
+        self.samples = 0
+        self.busy = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        conn = sqlite3.connect(self.path, timeout=0, isolation_level=None, check_same_thread=False)
+        try:
+            while not self._stop.wait(self.interval):
+                self.samples += 1
+                try:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute("ROLLBACK")
+                except sqlite3.OperationalError:
+                    self.busy += 1
+        finally:
+            conn.close()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def stats(self) -> Dict:
+        return {
+            "probes": self.samples,
+            "write_lock_busy": self.busy,
+            "write_lock_busy_share": round(self.busy / self.samples, 4) if self.samples else 0.0,
+        }
+
+
+def run_load_test(
+    conversations: List[List[Dict]],
+    sessions: int,
+    db_path: str,
+    checkpoint_path: str,
+    llm_latency: float,
+    llm_jitter: float,
+) -> Dict:
+    from graph.workflow import build_workflow
+    from graph.checkpoint import build_checkpointer, session_config
+
+    responder = HRResponder()
+    model = FakeChatModel(responder=responder, latency_seconds=llm_latency, latency_jitter=llm_jitter)
+    app = build_workflow(checkpointer=build_checkpointer(checkpoint_path))
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Counter = Counter()
+    lock = threading.Lock()
+
+    def converse(number: int):
+        config = session_config(f"load-{number}")
+        state: Dict[str, Any] = {"intent": None, "data": {}, "messages": []}
+
+        for turn in _fill(conversations[number % len(conversations)], number):
+            responder.classify(
+                turn["user_input"], turn["intent"], turn.get("entities", {}), turn.get("action", "start")
+            )
+            started = time.perf_counter()
+            try:
+                result = app.invoke({**state, "user_input": turn["user_input"]}, config=config)
+                intent = result.get("intent") or turn["intent"]
+                ok = True
+            except Exception as e:
+                intent = turn["intent"]
+                ok = False
+                with lock:
+                    errors[f"{type(e).__name__}: {e}"[:120]] += 1
+            elapsed = time.perf_counter() - started
+            responder.forget(turn["user_input"])
+
+            with lock:
+                latencies[intent if ok else f"{intent} (failed)"].append(elapsed)
+            state = {}   # later turns resume from the checkpoint
+
+    restores = [use_database(db_path), install_fake_llm(model)]
+    tracer = tracing.enable_tracing()
+    try:
+        with LockProbe(db_path) as probe, ThreadPoolExecutor(max_workers=sessions) as pool:
+            started = time.perf_counter()
+            list(pool.map(converse, range(len(conversations))))
+            wall = time.perf_counter() - started
+    finally:
+        tracing.disable_tracing()
+        for restore in reversed(restores):
+            restore()
+
+    db_latencies: Dict[str, List[float]] = defaultdict(list)
+    for record in tracer.records():
+        if record["category"] == "db":
+            db_latencies[record["name"]].append(record["duration_ms"] / 1000)
+
+    turns = sum(len(v) for v in latencies.values())
+    return {
+        "throughput": {
+            "wall_seconds": round(wall, 3),
+            "conversations": len(conversations),
+            "turns": turns,
+            "turns_per_second": round(turns / wall, 2),
+            "conversations_per_second": round(len(conversations) / wall, 3),
+            "llm_calls": model.calls,
+        },
+        "intents": {intent: latency_stats(v) for intent, v in sorted(latencies.items())},
+        "db_tool": {name: latency_stats(v) for name, v in sorted(db_latencies.items())},
+        "sqlite": probe.stats(),
+        "errors": dict(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--conversations", type=int, default=0, help="Conversations to run (default 4 per session)")
+    parser.add_argument("--script", help="Recorded conversations (JSONL); default: built-in script")
+    parser.add_argument("--llm-latency", type=float, default=0.25, help="Fake LLM base latency (s)")
+    parser.add_argument("--llm-jitter", type=float, default=0.25, help="Fake LLM extra uniform latency (s)")
+    parser.add_argument("--employees", type=int, default=1_000, help="Employees in the HR database")
+    parser.add_argument("--attendance-rows", type=int, default=20_000)
+    parser.add_argument("--journal-mode", default="delete", choices=["delete", "wal"])
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    scripts = load_script(args.script) if args.script else [DEFAULT_SCRIPT]
+    count = args.conversations or 4 * args.sessions
+    conversations = [scripts[i % len(scripts)] for i in range(count)]
+
+    work_dir = tempfile.mkdtemp(prefix="hr-load-")
+    db_path = os.path.join(work_dir, "hr.db")
+    dataset = build_synthetic_db(db_path, args.employees, args.attendance_rows)
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"PRAGMA journal_mode = {args.journal_mode}")
+    conn.close()
+
+    cleanup_index = offline_index()
+    try:
+        import tools.vector_tool as vector_tool
+
+        # FAQ generation during the build must not reach the network either
+        restore_llm = install_fake_llm(FakeChatModel(responder=HRResponder()))
+        try:
+            vector_tool.refresh_index(force=True)
+        finally:
+            restore_llm()
+
+        report = run_load_test(
+            conversations,
+            args.sessions,
+            db_path,
+            os.path.join(work_dir, "checkpoints.db"),
+            args.llm_latency,
+            args.llm_jitter,
+        )
+    finally:
+        cleanup_index()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report["config"] = {
+        "sessions": args.sessions,
+        "llm_latency": args.llm_latency,
+        "llm_jitter": args.llm_jitter,
+        "journal_mode": args.journal_mode,
+        "employees": dataset["employees"],
+        "attendance_rows": dataset["attendance_rows"],
+    }
+
+    t = report["throughput"]
+    print(f"{t['conversations']} conversations / {t['turns']} turns in {t['wall_seconds']} s "
+          f"({t['turns_per_second']} turns/s, {args.sessions} sessions)")
+    for intent, stats in report["intents"].items():
+        print(f"  {intent:28} n={stats['count']:<5} p50 {stats['p50_ms']:9.1f}  p95 {stats['p95_ms']:9.1f}  p99 {stats['p99_ms']:9.1f} ms")
+    print(f"SQLite write lock busy in {report['sqlite']['write_lock_busy_share']:.1%} of {report['sqlite']['probes']} probes")
+    for error, n in report["errors"].items():
+        print(f"  error x{n}: {error}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
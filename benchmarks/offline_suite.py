@@ -0,0 +1,450 @@
+"""
+Offline benchmark suite: the HR graph, db_tool and retrieval at scale,
+with no API key and no network.
+
+    python -m benchmarks.offline_suite                         # 1k employees
+    python -m benchmarks.offline_suite --scales 1k 100k 10m --json report.json
+    python -m benchmarks.offline_suite --json new.json --baseline old.json
+
+Each scale gets a synthetic database (benchmarks/synthetic_db.py, cached
+in --data-dir and copied before every run, so writes never accumulate).
+The agents' chat models are replaced by a deterministic fake
+(benchmarks/harness.py) and embeddings use the local hashing backend.
+
+The report (JSON) has, per scale:
+- intents   end-to-end latency per intent, through chat (supervisor with
+            the fake LLM) and through structured commands, with the
+            time spent in llm / db / vector spans (utils.tracing)
+- db_tool   latency of every db_tool function
+and once, vector index build and search latency on knowledge/.
+--baseline compares the p50s against an earlier report.
+"""
+import os
+
+# Before any project import: offline embeddings, and ChatOpenAI objects
+# that can be constructed (never called)
+os.environ.setdefault("EMBEDDING_BACKEND", "local")
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.harness import (
+    FakeChatModel,
+    HRResponder,
+    install_fake_llm,
+    latency_stats,
+    patch_attr,
+    time_calls,
+    use_database,
+)
+from benchmarks.synthetic_db import build_synthetic_db
+from benchmarks.compare_embeddings import LABELED_QUESTIONS
+from config import settings
+from config.settings import BASE_DIR
+from utils import tracing
+
+
+# name -> (employees, attendance rows)
+SCALES = {
+    "1k": (1_000, 100_000),
+    "100k": (100_000, 1_000_000),
+    "10m": (100_000, 10_000_000),
+}
+
+# Bump when synthetic_db output changes (invalidates cached databases)
+DATASET_VERSION = 1
+
+# Functions returning whole tables are skipped above this many rows
+UNBOUNDED_ROW_LIMIT = 200_000
+
+
+def _sample_employees(path: str, count: int, seed: int) -> List[Dict]:
+    conn = sqlite3.connect(path)
+    try:
+        total = conn.execute("SELECT MAX(id) FROM employees").fetchone()[0]
+        ids = random.Random(seed).sample(range(1, total + 1), min(count, total))
+        marks = ",".join("?" * len(ids))
+        rows = conn.execute(
+            f"SELECT id, name, email, role FROM employees WHERE id IN ({marks})", ids
+        ).fetchall()
+    finally:
+        conn.close()
+
+    by_id = {r[0]: {"id": r[0], "name": r[1], "email": r[2], "role": r[3]} for r in rows}
+    return [by_id[i] for i in ids]
+
+
+def _dataset(data_dir: str, scale: str, seed: int) -> Tuple[str, Dict]:
+    employees, rows = SCALES[scale]
+    path = os.path.join(data_dir, f"hr-v{DATASET_VERSION}-{employees}-{rows}-{seed}.db")
+    meta_path = path + ".json"
+
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            return path, json.load(f)
+
+    print(f"[{scale}] generating {employees:,} employees / {rows:,} attendance rows ...")
+    meta = build_synthetic_db(path, employees, rows, seed=seed)
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    return path, meta
+
+
+# -----------------------------
+# Scenarios: (intent, entities) for the i-th turn
+# -----------------------------
+def _scenarios(employees: List[Dict], meta: Dict) -> Dict[str, Callable[[int], Tuple[str, Dict, str]]]:
+    """intent -> turn(i) -> (user input, entities, action)."""
+    past_day = meta["last_day"]
+    year, month = int(past_day[:4]), int(past_day[5:7])
+    questions = [q for q, _ in LABELED_QUESTIONS]
+
+    def emp(i):
+        return employees[i % len(employees)]
+
+    return {
+        "attendance_start": lambda i: (
+            f"employee {emp(i)['id']} started at 9", {"employee_id": emp(i)["id"], "start_time": "09:00"}, "confirm"),
+        "attendance_end": lambda i: (
+            f"employee {emp(i)['id']} ended at 18", {"employee_id": emp(i)["id"], "end_time": "18:00"}, "confirm"),
+        "attendance_range": lambda i: (
+            f"employee {emp(i)['id']} worked 9 to 6 on {past_day}",
+            {"employee_id": emp(i)["id"], "start_time": "09:00", "end_time": "18:00", "date": past_day}, "confirm"),
+        "daily_report": lambda i: (
+            f"daily report of {emp(i)['email']} on {past_day}", {"email": emp(i)["email"], "date": past_day}, "query"),
+        "working_hours_report": lambda i: (
+            f"hours of employee {emp(i)['id']} on {past_day}", {"employee_id": emp(i)["id"], "date": past_day}, "query"),
+        "monthly_report": lambda i: (
+            f"monthly report of employee {emp(i)['id']}", {"employee_id": emp(i)["id"], "month": month, "year": year}, "query"),
+        "attendance_summary": lambda i: (
+            f"attendance summary for {past_day} #{i}", {"date": past_day}, "query"),
+        "find_employee": lambda i: (
+            f"find {emp(i)['email']}", {"email": emp(i)["email"]}, "query"),
+        "employee_find_by_name": lambda i: (
+            f"find employees named {emp(i)['name']} #{i}", {"name": emp(i)["name"]}, "query"),
+        "employee_find_by_role": lambda i: (
+            f"list {emp(i)['role']} employees #{i}", {"role": emp(i)["role"]}, "query"),
+        "employee_find_all": lambda i: (
+            f"list all employees #{i}", {}, "query"),
+        "create_employee": lambda i: (
+            f"add bench user {i}", {"name": f"bench user {i}", "email": f"bench.{i}.{time.time_ns()}@example.com", "role": "qa"}, "start"),
+        "hr_policy": lambda i: (
+            questions[i % len(questions)], {}, "query"),
+    }
+
+
+def _run_intents(app, responder: HRResponder, scenarios: Dict, turns: int, max_seconds: float) -> Dict:
+    from graph.commands import COMMAND_INTENTS, run_command
+    import agents.knowledge_agent as knowledge_agent
+
+    results = {}
+    for intent, scenario in scenarios.items():
+        for channel in ["chat", "command"]:
+            if channel == "command" and intent not in COMMAND_INTENTS:
+                continue
+
+            tracer = tracing.enable_tracing()
+            counter = iter(range(turns))
+
+            def turn():
+                i = next(counter)
+                user_input, entities, action = scenario(i)
+                # Measure the full knowledge path, not repeated cache hits
+                knowledge_agent.answer_cache.clear()
+
+                if channel == "command":
+                    run_command(app, {"intent": intent, "action": "confirm" if action == "confirm" else "start", "entities": entities})
+                    return
+
+                responder.classify(user_input, intent, entities, action)
+                app.invoke({"user_input": user_input, "intent": None, "data": {}, "messages": []})
+                responder.forget(user_input)
+
+            durations = time_calls(turn, turns, max_seconds)
+            tracing.disable_tracing()
+
+            # Outermost span per category (vector_tool calls nest)
+            records = tracer.records()
+            categories = {r["span_id"]: r["category"] for r in records}
+            spent = {"llm": 0.0, "db": 0.0, "vector": 0.0}
+            for record in records:
+                if record["category"] in spent and categories.get(record["parent_id"]) != record["category"]:
+                    spent[record["category"]] += record["duration_ms"]
+
+            results[f"{intent}/{channel}"] = {
+                **latency_stats(durations),
+                "per_turn_ms": {k: round(v / len(durations), 3) for k, v in spent.items()},
+            }
+            print(f"  {intent + '/' + channel:36} p50 {results[f'{intent}/{channel}']['p50_ms']:9.3f} ms")
+
+    return results
+
+
+# -----------------------------
+# db_tool functions
+# -----------------------------
+def _db_cases(employees: List[Dict], meta: Dict) -> Dict[str, Callable[[int], object]]:
+    import tools.db_tool as db
+
+    past_day = meta["last_day"]
+    today = date.today().isoformat()
+
+    def emp(i):
+        return employees[i % len(employees)]
+
+    cases = {
+        "get_employee_by_id": lambda i: db.get_employee_by_id(emp(i)["id"]),
+        "get_employee_by_email": lambda i: db.get_employee_by_email(emp(i)["email"]),
+        "get_employees_by_name": lambda i: db.get_employees_by_name(emp(i)["name"]),
+        "get_employees_by_role": lambda i: db.get_employees_by_role(emp(i)["role"]),
+        "search_employees(role, page)": lambda i: db.search_employees({"role": emp(i)["role"]}, limit=20),
+        "search_employees(newest)": lambda i: db.search_employees({}, limit=1, newest_first=True),
+        "get_employees_by_identifiers(5)": lambda i: db.get_employees_by_identifiers(
+            [emp(i + j)["id"] for j in range(3)], [emp(i + 3)["email"]], [emp(i + 4)["name"]]),
+        "get_attendance_for_employee_on_date": lambda i: db.get_attendance_for_employee_on_date(emp(i)["id"], past_day),
+        "get_attendance_for_employee": lambda i: db.get_attendance_for_employee(emp(i)["id"]),
+        "get_attendance_for_all_on_date": lambda i: db.get_attendance_for_all_on_date(past_day),
+        "get_attendance_summary_for_date": lambda i: db.get_attendance_summary_for_date(past_day),
+        "get_employee_daily_report": lambda i: db.get_employee_daily_report(emp(i)["id"], past_day),
+        "start_attendance": lambda i: db.start_attendance(emp(i)["id"], today, "09:00"),
+        "end_attendance": lambda i: db.end_attendance(emp(i)["id"], today, "18:00"),
+        "create_employee": lambda i: db.create_employee(f"bench {i}", f"db.bench.{i}.{time.time_ns()}@example.com", "qa"),
+    }
+
+    if meta["employees"] <= UNBOUNDED_ROW_LIMIT:
+        cases["get_all_employees"] = lambda i: db.get_all_employees()
+    if meta["attendance_rows"] <= UNBOUNDED_ROW_LIMIT:
+        cases["get_all_attendance"] = lambda i: db.get_all_attendance()
+
+    return cases
+
+
+def _run_db(cases: Dict, iterations: int, max_seconds: float) -> Dict:
+    results = {}
+    for name, case in cases.items():
+        counter = iter(range(iterations))
+        results[name] = latency_stats(time_calls(lambda: case(next(counter)), iterations, max_seconds))
+        print(f"  {name:36} p50 {results[name]['p50_ms']:9.3f} ms")
+    return results
+
+
+# -----------------------------
+# Vector index
+# -----------------------------
+def offline_index() -> Callable[[], None]:
+    """
+    Build the knowledge index into a temporary directory (never the real
+    vector store) and serve it; returns the cleanup function.
+    """
+    import tools.vector_tool as vector_tool
+
+    store_dir = tempfile.mkdtemp(prefix="hr-bench-index-")
+    restores = [
+        patch_attr(vector_tool, "VECTOR_STORE_PATH", vector_tool.Path(store_dir)),
+        patch_attr(vector_tool, "_active", None),
+        patch_attr(vector_tool, "_embeddings", None),
+    ]
+
+    def cleanup():
+        for restore in reversed(restores):
+            restore()
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+    return cleanup
+
+
+def run_vector_benchmark(repetitions: int = 20) -> Dict:
+    import tools.vector_tool as vector_tool
+
+    started = time.perf_counter()
+    vector_tool.refresh_index(force=True)
+    build_seconds = time.perf_counter() - started
+
+    questions = [q for q, _ in LABELED_QUESTIONS]
+    single, batch, faq = [], [], []
+    for _ in range(repetitions):
+        for q in questions:
+            started = time.perf_counter()
+            vector_tool.similarity_search(q, k=settings.KNOWLEDGE_CANDIDATES)
+            single.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            vector_tool.match_faq(q)
+            faq.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        vector_tool.similarity_search_batch(questions[:3], k=settings.KNOWLEDGE_CANDIDATES)
+        batch.append(time.perf_counter() - started)
+
+    snapshot = vector_tool.current_index()
+    return {
+        "embedding_backend": settings.EMBEDDING_BACKEND,
+        "index_type": settings.VECTOR_INDEX_TYPE,
+        "chunks": snapshot.store.index.ntotal,
+        "build_seconds": round(build_seconds, 3),
+        "similarity_search": latency_stats(single),
+        "similarity_search_batch(3)": latency_stats(batch),
+        "match_faq": latency_stats(faq),
+    }
+
+
+# -----------------------------
+# Suite
+# -----------------------------
+def run_scale(scale: str, data_dir: str, responder: HRResponder, turns: int,
+              db_iterations: int, max_seconds: float, seed: int) -> Dict:
+    from graph.workflow import build_workflow
+
+    base_path, meta = _dataset(data_dir, scale, seed)
+    work_path = base_path + ".work"
+    shutil.copyfile(base_path, work_path)
+
+    employees = _sample_employees(work_path, 500, seed)
+
+    restore = use_database(work_path)
+    try:
+        print(f"[{scale}] db_tool")
+        db_results = _run_db(_db_cases(employees, meta), db_iterations, max_seconds)
+
+        print(f"[{scale}] intents")
+        app = build_workflow()
+        intent_results = _run_intents(app, responder, _scenarios(employees, meta), turns, max_seconds)
+    finally:
+        restore()
+        os.remove(work_path)
+
+    return {
+        "scale": scale,
+        "dataset": {k: v for k, v in meta.items() if k != "path"},
+        "db_tool": db_results,
+        "intents": intent_results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_suite(scales: List[str], data_dir: str, turns: int = 30, db_iterations: int = 50,
+              max_seconds: float = 5.0, seed: int = 0, vector: bool = True) -> Dict:
+    responder = HRResponder()
+    restore_llm = install_fake_llm(FakeChatModel(responder=responder))
+    cleanup_index = offline_index()
+    try:
+        print("[vector]")
+        vector_results = run_vector_benchmark() if vector else None
+        scale_results = [
+            run_scale(s, data_dir, responder, turns, db_iterations, max_seconds, seed)
+            for s in scales
+        ]
+    finally:
+        cleanup_index()
+        restore_llm()
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "settings": {
+                "EMBEDDING_BACKEND": settings.EMBEDDING_BACKEND,
+                "VECTOR_INDEX_TYPE": settings.VECTOR_INDEX_TYPE,
+                "KNOWLEDGE_CANDIDATES": settings.KNOWLEDGE_CANDIDATES,
+                "EMPLOYEE_PAGE_SIZE": settings.EMPLOYEE_PAGE_SIZE,
+            },
+            "turns": turns,
+            "db_iterations": db_iterations,
+            "seed": seed,
+        },
+        "scales": scale_results,
+    }
+    if vector_results:
+        report["vector"] = vector_results
+    return report
+
+
+def flatten(report: Dict) -> Dict[str, float]:
+    """p50 (ms) per measured case, keyed "scale/section/case"."""
+    flat = {}
+    for scale in report.get("scales", []):
+        for section in ["db_tool", "intents"]:
+            for case, stats in scale[section].items():
+                if "p50_ms" in stats:
+                    flat[f"{scale['scale']}/{section}/{case}"] = stats["p50_ms"]
+    for case, stats in report.get("vector", {}).items():
+        if isinstance(stats, dict) and "p50_ms" in stats:
+            flat[f"vector/{case}"] = stats["p50_ms"]
+    return flat
+
+
+def compare_reports(baseline: Dict, current: Dict, tolerance: float = 0.2) -> List[Dict]:
+    """Cases whose p50 moved by more than `tolerance` (share) either way."""
+    old, new = flatten(baseline), flatten(current)
+    changes = []
+    for key in sorted(old.keys() & new.keys()):
+        if old[key] <= 0:
+            continue
+        ratio = new[key] / old[key]
+        if abs(ratio - 1) > tolerance:
+            changes.append({
+                "case": key,
+                "baseline_p50_ms": old[key],
+                "p50_ms": new[key],
+                "ratio": round(ratio, 2),
+                "change": "regression" if ratio > 1 else "improvement",
+            })
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=["1k"], choices=list(SCALES))
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "hr-bench"),
+                        help="Where synthetic databases are cached")
+    parser.add_argument("--turns", type=int, default=30, help="Turns per intent and channel")
+    parser.add_argument("--db-iterations", type=int, default=50, help="Calls per db_tool function")
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="Time budget per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-vector", action="store_true", help="Skip the vector index benchmark")
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument("--baseline", help="Earlier report to compare p50 latencies with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    report = run_suite(
+        args.scales, args.data_dir, args.turns, args.db_iterations,
+        args.max_seconds, args.seed, vector=not args.no_vector,
+    )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare_reports(json.load(f), report, args.tolerance)
+        print("\nChanges against baseline:")
+        for change in report["comparison"] or [{"case": "none beyond tolerance"}]:
+            print("  " + "  ".join(f"{k}={v}" for k, v in change.items()))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Classification regression for the supervisor prompt: labelled messages
+are classified with the legacy prompt (every rule, Pydantic format
+instructions; benchmarks/data/supervisor_legacy_prompt.txt) and with the
+token-budgeted prompt (agents/supervisor_prompt.py), comparing intent /
+entity accuracy and prompt tokens.
+
+    python -m benchmarks.supervisor_regression                # live model
+    LLM_CASSETTE_MODE=replay python -m benchmarks.supervisor_regression
+
+Exits non-zero when the budgeted prompt is less accurate than the legacy
+one (beyond --tolerance).
+"""
+import argparse
+import json
+import os
+import sys
+from statistics import mean
+from typing import Any, Dict, List, Optional, Sequence
+
+from utils.helpers import count_tokens
+
+
+LEGACY_PROMPT_PATH = os.path.join(os.path.dirname(__file__), "data", "supervisor_legacy_prompt.txt")
+
+MODES = ("legacy", "full", "budgeted")
+
+# input, previous intent, expected intent / entity subset / task count and
+# the rule blocks the budgeted prompt must include for it
+CASES: List[Dict[str, Any]] = [
+    {"input": "hi", "intent": "greeting", "blocks": []},
+    {"input": "what can you do", "intent": "greeting", "blocks": []},
+    {"input": "register smith smith@gmail.com node developer", "intent": "create_employee",
+     "entities": {"name": "smith", "email": "smith@gmail.com"}, "blocks": ["registration"]},
+    {"input": "ankit@x.com", "previous_intent": "create_employee", "intent": "create_employee",
+     "entities": {"email": "ankit@x.com"}, "blocks": ["registration"]},
+    {"input": "find employee smith", "intent": "find_employee", "entities": {"name": "smith"}, "blocks": []},
+    {"input": "show all employee details", "intent": "employee_find_all", "blocks": ["listing"]},
+    {"input": "next page", "previous_intent": "employee_find_all", "intent": "employee_find_all",
+     "entities": {"page": "next"}, "blocks": ["listing"]},
+    {"input": "smith start work at 10:00", "intent": "attendance_start",
+     "entities": {"name": "smith", "start_time": "10:00"}, "blocks": ["attendance"]},
+    {"input": "harsh end work at 7 pm", "intent": "attendance_end",
+     "entities": {"name": "harsh", "end_time": "19:00"}, "blocks": ["attendance"]},
+    {"input": "yash work from 9 to 6", "intent": "attendance_range",
+     "entities": {"name": "yash", "start_time": "09:00", "end_time": "18:00"}, "blocks": ["attendance"]},
+    {"input": "smith start work yesterday at 10:00", "intent": "attendance_start",
+     "entities": {"name": "smith", "date": "yesterday"}, "blocks": ["attendance", "dates"]},
+    {"input": "11:00", "previous_intent": "attendance_start", "intent": "attendance_start",
+     "entities": {"start_time": "11:00"}, "blocks": ["continuity", "attendance"]},
+    {"input": "yes update it", "previous_intent": "attendance_start", "intent": "attendance_start",
+     "action": "confirm", "blocks": ["continuity"]},
+    {"input": "attendance summary", "intent": "attendance_summary", "blocks": ["attendance"]},
+    {"input": "how many employees worked today", "intent": "attendance_summary", "blocks": ["attendance", "dates"]},
+    {"input": "daily report of smith", "intent": "daily_report", "entities": {"name": "smith"}, "blocks": ["reports"]},
+    {"input": "monthly report of harsh", "intent": "monthly_report", "entities": {"name": "harsh"}, "blocks": ["reports"]},
+    {"input": "hours worked by smith today", "intent": "working_hours_report",
+     "entities": {"name": "smith"}, "blocks": ["reports", "dates"]},
+    {"input": "what are the office working hours?", "intent": "hr_policy", "blocks": ["reports"]},
+    {"input": "what is the leave policy", "intent": "hr_policy", "blocks": []},
+    {"input": "het, yash and ankit started at 9", "intent": "attendance_start", "tasks": 3,
+     "blocks": ["attendance", "multi_task"]},
+    {"input": "start work for het and show his monthly report", "intent": "attendance_start", "tasks": 2,
+     "blocks": ["attendance", "multi_task", "reports"]},
+]
+
+
+def legacy_prompt() -> str:
+    with open(LEGACY_PROMPT_PATH) as f:
+        return f.read()
+
+
+def system_prompt(mode: str, case: Dict) -> str:
+    from agents.supervisor_prompt import build_system_prompt
+
+    if mode == "legacy":
+        return legacy_prompt()
+    return build_system_prompt(case["input"], case.get("previous_intent"), full=(mode == "full"))
+
+
+def classify(system: str, user_input: str) -> Dict:
+    """One supervisor classification with the given system prompt."""
+    import agents.supervisor_agent as supervisor
+
+    chain = supervisor.prompt | supervisor.llm | supervisor.parser
+    result = chain.invoke({"system": system, "input": user_input})
+    entities = dict(result.entities or {})
+    intent = supervisor._normalize_times(result.intent, entities)
+    return {"intent": intent, "action": result.action, "entities": entities, "tasks": len(result.tasks)}
+
+
+def _matches(expected: Dict, got: Dict) -> bool:
+    for key, value in expected.items():
+        if str(got.get(key, "")).strip().lower() != str(value).lower():
+            return False
+    return True
+
+
+def check_blocks(cases: Sequence[Dict] = CASES) -> List[Dict]:
+    """Cases whose budgeted prompt is missing a rule block they need."""
+    from agents.supervisor_prompt import assemble
+
+    missing = []
+    for case in cases:
+        selected = assemble(case["input"], case.get("previous_intent"))[1]["blocks"]
+        lacking = [b for b in case.get("blocks", []) if b not in selected]
+        if lacking:
+            missing.append({"input": case["input"], "missing": lacking, "selected": selected})
+    return missing
+
+
+def run_mode(mode: str, cases: Sequence[Dict] = CASES) -> Dict:
+    results, failures, tokens = [], [], []
+
+    for case in cases:
+        system = system_prompt(mode, case)
+        tokens.append(count_tokens(system))
+        try:
+            got = classify(system, case["input"])
+        except Exception as e:
+            got = {"error": f"{type(e).__name__}: {e}"}
+
+        intent_ok = got.get("intent") == case["intent"]
+        entities_ok = _matches(case.get("entities", {}), got.get("entities", {}))
+        extras_ok = (
+            ("action" not in case or got.get("action") == case["action"])
+            and ("tasks" not in case or got.get("tasks") == case["tasks"])
+        )
+        results.append((intent_ok, intent_ok and entities_ok and extras_ok))
+        if not (intent_ok and entities_ok and extras_ok):
+            failures.append({"input": case["input"], "expected": case["intent"], "got": got})
+
+    return {
+        "intent_accuracy": round(mean(r[0] for r in results), 4),
+        "exact_accuracy": round(mean(r[1] for r in results), 4),
+        "mean_prompt_tokens": round(mean(tokens), 1),
+        "failures": failures,
+    }
+
+
+def run_regression(modes: Sequence[str] = ("legacy", "budgeted"), cases: Sequence[Dict] = CASES) -> Dict:
+    return {mode: run_mode(mode, cases) for mode in modes}
+
+
+def regressed(report: Dict, tolerance: float = 0.0) -> Optional[str]:
+    """Why the budgeted prompt regressed against legacy, or None."""
+    if "legacy" not in report or "budgeted" not in report:
+        return None
+    for metric in ["intent_accuracy", "exact_accuracy"]:
+        if report["budgeted"][metric] + tolerance < report["legacy"][metric]:
+            return f"{metric}: budgeted {report['budgeted'][metric]} < legacy {report['legacy'][metric]}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Supervisor prompt classification regression")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=["legacy", "budgeted"])
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Accuracy drop allowed")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    missing = check_blocks()
+    for item in missing:
+        print(f"missing blocks for {item['input']!r}: {item['missing']} (selected {item['selected']})")
+
+    report = run_regression(args.modes)
+    for mode, result in report.items():
+        print(
+            f"{mode:9s} intent {result['intent_accuracy']:.1%}  exact {result['exact_accuracy']:.1%}  "
+            f"prompt {result['mean_prompt_tokens']:.0f} tokens"
+        )
+        for failure in result["failures"]:
+            print(f"    {failure['input']!r}: expected {failure['expected']}, got {failure['got']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    problem = regressed(report, args.tolerance)
+    if problem or missing:
+        print(f"REGRESSION: {problem or 'rule blocks missing'}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
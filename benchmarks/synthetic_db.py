@@ -0,0 +1,183 @@
+"""
+Synthetic HR databases (database/schema.sql) at benchmark scale.
+
+    python -m benchmarks.synthetic_db /tmp/hr-100k.db --employees 100000 --attendance-rows 10000000
+
+Employees get realistic, frequently shared names (name lookups hit
+duplicates like in a real company) and unique emails. Attendance is
+written day by day, like the production table grows: every employee
+has at most one row per working day, with a start and (mostly) an end
+time.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterator, Tuple
+
+from config.settings import BASE_DIR
+
+
+SCHEMA_PATH = os.path.join(BASE_DIR, "database", "schema.sql")
+
+FIRST_NAMES = [
+    "aarav", "ananya", "ankit", "arjun", "diya", "het", "isha", "kabir", "kavya", "meera",
+    "neha", "nikhil", "priya", "rahul", "riya", "rohan", "sara", "tushar", "vihaan", "yash",
+    "alex", "chris", "emma", "james", "lena", "liam", "maria", "noah", "olivia", "sam",
+]
+LAST_NAMES = [
+    "shah", "patel", "mehta", "desai", "joshi", "kumar", "singh", "gupta", "iyer", "nair",
+    "smith", "jones", "brown", "garcia", "miller", "wilson", "moore", "taylor", "lee", "clark",
+]
+ROLES = [
+    "developer", "qa", "designer", "hr", "manager", "analyst",
+    "devops", "support", "sales", "accountant",
+]
+
+_BATCH = 50_000
+
+
+def _employees(count: int, rng: random.Random, start: date) -> Iterator[Tuple]:
+    for i in range(1, count + 1):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        joined = start - timedelta(days=rng.randint(0, 3 * 365))
+        yield (
+            i,
+            f"{first} {last}",
+            f"{first}.{last}.{i}@example.com",
+            rng.choice(ROLES),
+            f"{joined.isoformat()} 09:00:00",
+        )
+
+
+def working_days(last_day: date, count: int) -> list:
+    """The `count` working days (Mon-Fri) up to and including `last_day`."""
+    days = []
+    day = last_day
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    return sorted(days)
+
+
+def _attendance(employees: int, days: list, rows: int, rng: random.Random) -> Iterator[Tuple]:
+    per_day = max(1, -(-rows // len(days)))
+    written = 0
+
+    for day in days:
+        iso = day.isoformat()
+        present = min(per_day, employees, rows - written)
+        if present <= 0:
+            break
+
+        # Different employees present every day
+        offset = rng.randrange(employees)
+        for n in range(present):
+            emp_id = (offset + n) % employees + 1
+            start_minutes = 8 * 60 + 30 + rng.randrange(90)
+            start_time = f"{start_minutes // 60:02d}:{start_minutes % 60:02d}"
+
+            end_time = None
+            if rng.random() < 0.97:
+                end_minutes = start_minutes + 7 * 60 + rng.randrange(180)
+                end_time = f"{end_minutes // 60:02d}:{end_minutes % 60:02d}"
+
+            yield (emp_id, iso, start_time, end_time)
+
+        written += present
+
+
+def _batches(rows: Iterator[Tuple], size: int = _BATCH) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_synthetic_db(
+    path: str,
+    employees: int,
+    attendance_rows: int,
+    days: int = 0,
+    seed: int = 0,
+    last_day: date = None,
+) -> Dict:
+    """
+    Create `path` (replacing it) with `employees` employees and about
+    `attendance_rows` attendance rows spread over `days` working days up
+    to yesterday (default: as many days as needed with everyone present).
+    Returns the build stats.
+    """
+    rng = random.Random(seed)
+    last_day = last_day or date.today() - timedelta(days=1)
+    days = days or max(1, -(-attendance_rows // max(employees, 1)))
+    day_list = working_days(last_day, days)
+
+    if os.path.exists(path):
+        os.remove(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    started = time.perf_counter()
+    conn = sqlite3.connect(path)
+    try:
+        # Bulk load: no journal, no fsync (the file is rebuilt on failure)
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        with open(SCHEMA_PATH) as f:
+            conn.executescript(f.read())
+
+        for batch in _batches(_employees(employees, rng, day_list[0])):
+            conn.executemany(
+                "INSERT INTO employees (id, name, email, role, created_at) VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+
+        written = 0
+        for batch in _batches(_attendance(employees, day_list, attendance_rows, rng)):
+            conn.executemany(
+                "INSERT INTO attendance (employee_id, date, start_time, end_time) VALUES (?, ?, ?, ?)",
+                batch,
+            )
+            written += len(batch)
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "path": path,
+        "employees": employees,
+        "attendance_rows": written,
+        "days": len(day_list),
+        "first_day": day_list[0].isoformat(),
+        "last_day": day_list[-1].isoformat(),
+        "seed": seed,
+        "build_seconds": round(time.perf_counter() - started, 2),
+        "size_mb": round(os.path.getsize(path) / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--employees", type=int, default=1_000)
+    parser.add_argument("--attendance-rows", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=0, help="Working days to spread attendance over")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stats = build_synthetic_db(args.path, args.employees, args.attendance_rows, args.days, args.seed)
+    for key, value in stats.items():
+        print(f"  {key:16} {value}")
+
+
+if __name__ == "__main__":
+    main()
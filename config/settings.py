@@ -14,4 +14,151 @@ DATABASE_PATH = os.path.join(BASE_DIR, "database", "hr.db")
 
 VECTOR_STORE_PATH = os.path.join(BASE_DIR, "vector_store", "faiss_index")
 
-KNOWLEDGE_PATH = os.path.join(BASE_DIR, "knowledge")
\ No newline at end of file
+KNOWLEDGE_PATH = os.path.join(BASE_DIR, "knowledge")
+# Threads parsing knowledge files while the index is built
+KNOWLEDGE_LOADER_WORKERS = min(8, os.cpu_count() or 1)
+
+CHECKPOINT_DB_PATH = os.path.join(BASE_DIR, "database", "checkpoints.db")
+
+# Checkpoints kept per session; older ones are compacted away
+CHECKPOINT_KEEP_LAST = 5
+CHECKPOINT_COMPACT_EVERY = 10
+
+# Conversation history kept in state (and in each checkpoint)
+MAX_HISTORY_MESSAGES = 20
+
+# Employee lookups: rows per rendered page / rows the LLM may see
+EMPLOYEE_PAGE_SIZE = 20
+EMPLOYEE_LLM_ROW_LIMIT = 5
+
+# Knowledge retrieval
+EMBEDDING_MODEL = "text-embedding-ada-002"
+CHUNK_SIZE = 300        # tokens (tiktoken), per section-aware chunk
+CHUNK_OVERLAP = 30      # tokens
+
+# Content-addressed embedding cache (model, text hash) -> vector
+EMBEDDING_CACHE_PATH = os.path.join(BASE_DIR, "vector_store", "embedding_cache.db")
+EMBEDDING_BATCH_SIZE = 256
+
+# Embeddings backend: "openai" (network) or "local" (hashed n-grams, offline)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+LOCAL_EMBEDDING_DIM = 1024
+
+# Minimum relevance score per backend (scores are not comparable across backends)
+RELEVANCE_THRESHOLDS = {
+    "openai": 0.75,
+    "local": -0.05,   # hashed n-grams score lower; see benchmarks/compare_embeddings.py
+}
+
+# Hybrid retrieval (BM25 inverted index + vectors)
+HYBRID_RETRIEVAL = True
+BM25_K1 = 1.5
+BM25_B = 0.75
+# BM25 score a chunk needs (with >= half the query terms) to be included
+LEXICAL_MIN_SCORE = 3.0
+# Answer from BM25 alone (no embedding call) when the top chunk contains
+# every query term and scores at least this much
+LEXICAL_FAST_PATH_SCORE = 4.0
+
+# Knowledge answer cache
+ANSWER_CACHE_SIZE = 256
+ANSWER_CACHE_TTL_SECONDS = 24 * 60 * 60
+# Cosine similarity for reusing the answer of a differently worded question,
+# per embeddings backend. ada-002 scores minimal pairs ("paid" / "unpaid
+# leaves") close to 1.0, so its bar is set high
+ANSWER_CACHE_SIMILARITY = {
+    "openai": 0.985,
+    "local": 0.95,
+}
+
+# Knowledge index hot-reload (background rebuild + atomic swap)
+INDEX_HOT_RELOAD = True
+INDEX_RELOAD_INTERVAL_SECONDS = 10
+
+# Knowledge answer context: candidates retrieved, prompt token budget and
+# MMR selection (relevance vs. novelty, overlap share treated as duplicate)
+KNOWLEDGE_CANDIDATES = 8
+KNOWLEDGE_CONTEXT_TOKENS = 1200
+CONTEXT_MMR_LAMBDA = 0.7
+CONTEXT_DUPLICATE_OVERLAP = 0.8
+
+# Vector index type: flat | fp16 | hnsw | ivf | ivfpq (see tools/ann_index.py)
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "flat")
+IVF_NLIST = None            # None = about 4 * sqrt(n) cells
+IVF_NPROBE = 16
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 128
+PQ_SUBQUANTIZERS = 64       # bytes per vector with 8-bit codes
+INDEX_TRAIN_SAMPLE = 100_000
+
+# Precomputed policy FAQ: Q&A pairs generated per section at index-build
+# time and answered without the LLM on a confident question match.
+# Off by default: building it makes one chat-model call per new or edited
+# section (FAQ_QUESTIONS_PER_SECTION pairs each) on top of the embeddings
+FAQ_PRECOMPUTE = False
+FAQ_QUESTIONS_PER_SECTION = 3
+FAQ_MAX_CONCURRENCY = 4
+# Cosine similarity to a canonical question, per embeddings backend
+FAQ_MATCH_THRESHOLDS = {
+    "openai": 0.93,
+    "local": 0.75,
+}
+
+# Tracing (utils/tracing.py): spans for graph nodes, LLM chains, db_tool
+# and vector_tool, written to TRACE_DIR as JSONL + Chrome trace on exit
+TRACE_ENABLED = os.getenv("HR_TRACE", "0") == "1"
+TRACE_DIR = os.path.join(BASE_DIR, "traces")
+
+# LLM response cassette (tools/llm_cassette.py), keyed by model, messages
+# and params: "passthrough" (live calls), "record" (live + store) or
+# "replay" (serve stored responses). On a replay miss: "error" (offline
+# tests and benchmarks) or "live" (call and record: a response cache).
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "passthrough")
+LLM_CASSETTE_ON_MISS = os.getenv("LLM_CASSETTE_ON_MISS", "error")
+LLM_CASSETTE_PATH = os.getenv(
+    "LLM_CASSETTE_PATH", os.path.join(BASE_DIR, "database", "llm_cassette.db")
+)
+
+# LLM resilience (tools/llm_resilience.py): per-call deadline, jittered
+# retries, a per-model circuit breaker (agents then answer with rule-based
+# intents and template replies) and optional hedged requests, sent once an
+# attempt is slower than this percentile of recent latencies (None = off)
+LLM_RESILIENCE = True
+LLM_TIMEOUT_SECONDS = 20
+LLM_MAX_RETRIES = 2
+LLM_RETRY_BASE_DELAY = 0.5
+LLM_RETRY_MAX_DELAY = 4.0
+LLM_CIRCUIT_FAILURES = 3
+LLM_CIRCUIT_RESET_SECONDS = 30
+LLM_HEDGE_PERCENTILE = None
+LLM_HEDGE_MIN_SAMPLES = 20
+
+# Model tiers (tools/llm_tiers.py): every agent task names the tier it runs
+# on, so polish and formatting use the small model and classification and
+# policy answers the large one. Structured outputs that fail to parse on a
+# smaller tier are retried once on LLM_PARSE_FALLBACK_TIER.
+LLM_TIERS = {
+    "large": {"model": LLM_MODEL, "temperature": LLM_TEMPERATURE},
+    "small": {"model": os.getenv("LLM_SMALL_MODEL", "gpt-4o-mini"), "temperature": LLM_TEMPERATURE},
+}
+LLM_TASK_TIERS = {
+    "supervisor.classify": "large",
+    "supervisor.greeting": "small",
+    "attendance.polish": "small",
+    "employee.reply": "small",
+    "knowledge.answer": "large",
+    "faq.generate": "large",
+}
+LLM_DEFAULT_TIER = "large"
+LLM_PARSE_FALLBACK_TIER = "large"
+
+# Speculative prefetch (graph/prefetch.py): while the supervisor LLM call
+# runs, likely DB lookups and retrieval start on these threads; results
+# are used when the classified intent matches and dropped otherwise
+PREFETCH_ENABLED = True
+PREFETCH_WORKERS = 4
+
+# Supervisor prompt (agents/supervisor_prompt.py): compact core plus the
+# rule blocks relevant to the message, within this many tokens (tiktoken)
+SUPERVISOR_PROMPT_TOKENS = 700
@@ -0,0 +1,109 @@
+import os
+import sqlite3
+from collections import defaultdict
+from typing import Optional
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from config.settings import (
+    CHECKPOINT_DB_PATH,
+    CHECKPOINT_KEEP_LAST,
+    CHECKPOINT_COMPACT_EVERY,
+)
+
+
+class CompactingSqliteSaver(SqliteSaver):
+    """
+    SQLite checkpointer that keeps storage bounded.
+
+    Every CHECKPOINT_COMPACT_EVERY writes to a session, all but the newest
+    CHECKPOINT_KEEP_LAST checkpoints of that session are deleted together
+    with their pending writes. Resuming only ever needs the latest one.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        keep_last: int = CHECKPOINT_KEEP_LAST,
+        compact_every: int = CHECKPOINT_COMPACT_EVERY,
+    ):
+        super().__init__(conn)
+        self.keep_last = keep_last
+        self.compact_every = compact_every
+        self._puts_since_compaction = defaultdict(int)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        saved = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = str(config["configurable"]["thread_id"])
+        self._puts_since_compaction[thread_id] += 1
+        if self._puts_since_compaction[thread_id] >= self.compact_every:
+            self._puts_since_compaction[thread_id] = 0
+            self.compact(thread_id)
+
+        return saved
+
+    def compact(self, thread_id: Optional[str] = None) -> int:
+        """
+        Delete old checkpoints (one session, or all when thread_id is None).
+        Returns the number of checkpoints removed.
+        """
+        where = "WHERE thread_id = ?" if thread_id is not None else ""
+        params = (thread_id,) if thread_id is not None else ()
+
+        with self.cursor() as cur:
+            cur.execute(
+                f"""
+                DELETE FROM checkpoints WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY thread_id, checkpoint_ns
+                            ORDER BY checkpoint_id DESC
+                        ) AS rn
+                        FROM checkpoints
+                        {where}
+                    )
+                    WHERE rn > ?
+                )
+                """,
+                (*params, self.keep_last),
+            )
+            removed = cur.rowcount
+
+            cur.execute(
+                f"""
+                DELETE FROM writes
+                {where + " AND" if where else "WHERE"} NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = writes.thread_id
+                      AND c.checkpoint_ns = writes.checkpoint_ns
+                      AND c.checkpoint_id = writes.checkpoint_id
+                )
+                """,
+                params,
+            )
+
+        return removed
+
+    def has_session(self, thread_id: str) -> bool:
+        # Uses the (thread_id, ...) primary key index
+        with self.cursor(transaction=False) as cur:
+            cur.execute(
+                "SELECT 1 FROM checkpoints WHERE thread_id = ? LIMIT 1",
+                (str(thread_id),),
+            )
+            return cur.fetchone() is not None
+
+
+def build_checkpointer(path: str = CHECKPOINT_DB_PATH) -> CompactingSqliteSaver:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # The graph may run nodes in worker threads
+    conn = sqlite3.connect(path, check_same_thread=False)
+    saver = CompactingSqliteSaver(conn)
+    saver.setup()
+    return saver
+
+
+def session_config(session_id: str) -> dict:
+    return {"configurable": {"thread_id": str(session_id)}}
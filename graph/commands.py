@@ -0,0 +1,198 @@
+import uuid
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
+
+from graph.state import HRState
+from graph.routing import route_by_intent
+from tools.time_tool import normalize_natural_date, normalize_time_24h
+
+
+# Channel of a turn dispatched from a structured command (no LLM at all)
+COMMAND_CHANNEL = "command"
+
+# Intents machine clients may send. hr_policy is not one of them:
+# answering a policy question needs the LLM.
+COMMAND_INTENTS = (
+    "create_employee",
+    "find_employee",
+    "employee_find_all",
+    "employee_find_last",
+    "employee_find_by_role",
+    "employee_find_by_name",
+    "attendance_start",
+    "attendance_end",
+    "attendance_range",
+    "attendance_summary",
+    "daily_report",
+    "working_hours_report",
+    "monthly_report",
+)
+
+# Entities every intent needs ("employee" = employee_id, id, email or name)
+REQUIRED_ENTITIES = {
+    "create_employee": ["name", "email", "role"],
+    "employee_find_by_role": ["role"],
+    "employee_find_by_name": ["name"],
+    "attendance_start": ["employee", "start_time"],
+    "attendance_end": ["employee", "end_time"],
+    "attendance_range": ["employee", "start_time", "end_time"],
+    "daily_report": ["employee"],
+    "working_hours_report": ["employee"],
+    "monthly_report": ["employee"],
+}
+
+EMPLOYEE_IDENTIFIERS = ["employee_id", "id", "email", "name"]
+
+ENTITY_FIELDS = {
+    *EMPLOYEE_IDENTIFIERS,
+    "role",
+    "date",
+    "start_time",
+    "end_time",
+    "month",
+    "year",
+    "page",
+}
+
+
+class CommandError(ValueError):
+    """A structured command that cannot be dispatched."""
+
+
+class Command(BaseModel):
+    """
+    A typed request from a machine client (HRIS integration, kiosk):
+    the operation is already known, so nothing is classified or extracted.
+
+        Command(intent="attendance_start",
+                entities={"employee_id": 42, "start_time": "09:00"})
+    """
+
+    intent: Literal[COMMAND_INTENTS]
+    action: Literal["start", "confirm"] = "start"   # confirm = overwrite existing data
+    entities: Dict[str, Any] = {}
+
+    @field_validator("entities")
+    @classmethod
+    def _known_entities(cls, entities: Dict[str, Any]) -> Dict[str, Any]:
+        unknown = sorted(set(entities) - ENTITY_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown entities: {', '.join(unknown)}")
+        return {k: v for k, v in entities.items() if v not in (None, "")}
+
+    @model_validator(mode="after")
+    def _normalize(self) -> "Command":
+        entities = self.entities
+
+        for field in REQUIRED_ENTITIES.get(self.intent, []):
+            if field == "employee":
+                if not any(entities.get(k) for k in EMPLOYEE_IDENTIFIERS):
+                    raise ValueError(
+                        f"{self.intent} needs one of: {', '.join(EMPLOYEE_IDENTIFIERS)}"
+                    )
+            elif not entities.get(field):
+                raise ValueError(f"{self.intent} needs '{field}'")
+
+        for key in ["employee_id", "id", "month", "year", "page"]:
+            if key in entities:
+                try:
+                    entities[key] = int(entities[key])
+                except (TypeError, ValueError):
+                    raise ValueError(f"'{key}' must be an integer")
+
+        if "month" in entities and not 1 <= entities["month"] <= 12:
+            raise ValueError("'month' must be between 1 and 12")
+
+        for key in ["start_time", "end_time"]:
+            if key in entities:
+                try:
+                    entities[key] = normalize_time_24h(str(entities[key]))
+                except ValueError:
+                    raise ValueError(f"'{key}' is not a valid time")
+
+        if "date" in entities:
+            iso_date = normalize_natural_date(str(entities["date"]))
+            if not iso_date:
+                raise ValueError("'date' is not a valid date")
+            entities["date"] = iso_date
+
+        return self
+
+
+def validate_command(command: Any) -> Command:
+    """Parse a Command (or a dict); raises CommandError with the reasons."""
+    if isinstance(command, Command):
+        return command
+
+    try:
+        return Command.model_validate(command)
+    except ValidationError as e:
+        reasons = "; ".join(
+            f"{'.'.join(str(p) for p in err['loc']) or 'command'}: {err['msg']}"
+            for err in e.errors()
+        )
+        raise CommandError(reasons) from None
+
+
+# -----------------------------
+# Graph entry
+# -----------------------------
+def route_entry(state: HRState) -> str:
+    """START edge: structured commands skip the supervisor (and its LLM)."""
+    return "command_agent" if state.get("command") else "supervisor_agent"
+
+
+def command_agent(state: HRState) -> Dict:
+    """
+    Turn a validated command into the state the supervisor would produce;
+    route_tasks then sends it to the agent via route_by_intent.
+    """
+    try:
+        command = validate_command(state["command"])
+    except CommandError as e:
+        return {
+            "command": None,
+            "stop": True,
+            "tasks": [],
+            "messages": state.get("messages", []) + [
+                {"role": "assistant", "content": f"Invalid command: {e}"}
+            ],
+        }
+
+    return {
+        "command": None,   # consumed; the next (chat) turn goes to the supervisor
+        "channel": COMMAND_CHANNEL,
+        "intent": command.intent,
+        "action": command.action,
+        "data": {"entities": dict(command.entities), "missing_fields": []},
+        "stop": False,
+        "turn_id": uuid.uuid4().hex,
+        "tasks": [],
+        "task_results": None,
+    }
+
+
+def run_command(app, command: Any, config: Optional[Dict] = None) -> Dict:
+    """
+    Validate `command` and run it through the compiled graph.
+
+    Returns {"intent", "agent", "reply"}. Raises CommandError before
+    touching the graph when the command is invalid.
+    """
+    command = validate_command(command)
+
+    result = app.invoke(
+        {
+            "user_input": f"{command.intent} {command.entities}",
+            "command": command.model_dump(),
+        },
+        config=config,
+    )
+
+    replies = result.get("messages") or []
+    return {
+        "intent": command.intent,
+        "agent": route_by_intent({"intent": command.intent}),
+        "reply": replies[-1]["content"] if replies else "",
+    }
@@ -0,0 +1,104 @@
+from typing import Any, Callable, Dict, List
+
+from langgraph.graph import END
+from langgraph.types import Send
+
+from graph.state import HRState
+from graph.routing import route_by_intent
+from tools.employee_resolver import get_resolver
+
+
+def route_tasks(state: HRState):
+    """
+    Route after the supervisor.
+
+    - greeting (stop)       -> END
+    - single task           -> one agent (same as route_by_intent)
+    - several tasks         -> one Send per task, executed concurrently
+    """
+    if state.get("stop"):
+        return END
+
+    tasks = state.get("tasks") or []
+    if len(tasks) < 2:
+        return route_by_intent(state)
+
+    # Resolve every employee named in the message with one query;
+    # branches then hit the turn's resolver cache.
+    get_resolver(state).resolve_many([task.get("entities", {}) for task in tasks])
+
+    return [
+        Send(route_by_intent(task), branch_state(state, task_id, task))
+        for task_id, task in enumerate(tasks)
+    ]
+
+
+def branch_state(state: HRState, task_id: int, task: Dict[str, Any]) -> Dict:
+    """
+    Build the input of one fan-out branch: the shared turn state with the
+    task's own intent and entities.
+    """
+    entities = task.get("entities", {})
+
+    return {
+        **state,
+        "intent": task["intent"],
+        "action": task.get("action", state.get("action")),
+        "data": {**state.get("data", {}), "entities": entities},
+        # Policy tasks ask their own sub-question
+        "user_input": entities.get("question") or state["user_input"],
+        "task_id": task_id,
+    }
+
+
+def as_branch(agent: Callable[[HRState], Dict]) -> Callable[[HRState], Dict]:
+    """
+    Wrap an agent node so that, when it runs as a fan-out branch, its reply
+    is collected in `task_results` instead of overwriting `messages`.
+    Outside fan-out the agent's result is returned unchanged.
+    """
+
+    def node(state: HRState) -> Dict:
+        result = agent(state)
+
+        if state.get("task_id") is None:
+            return result
+
+        replies = result.get("messages") or []
+        content = replies[-1]["content"] if replies else ""
+
+        return {
+            "task_results": [
+                {
+                    "task_id": state["task_id"],
+                    "intent": state.get("intent"),
+                    "content": content,
+                }
+            ]
+        }
+
+    node.__name__ = getattr(agent, "__name__", "branch")
+    return node
+
+
+def merge_replies(state: HRState) -> Dict:
+    """
+    Join fan-out replies (in task order) into one assistant message.
+    No-op after a single-task turn.
+    """
+    results: List[Dict] = sorted(
+        state.get("task_results") or [],
+        key=lambda r: r["task_id"],
+    )
+
+    if not results:
+        return {}
+
+    content = "\n\n".join(r["content"] for r in results if r["content"])
+
+    return {
+        "task_results": None,   # reset for the next turn
+        "messages": state.get("messages", []) + [
+            {"role": "assistant", "content": content}
+        ],
+    }
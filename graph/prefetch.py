@@ -0,0 +1,234 @@
+import contextvars
+import logging
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config.settings import PREFETCH_ENABLED, PREFETCH_WORKERS, KNOWLEDGE_CANDIDATES
+from tools.intent_rules import classify_by_rules
+from tools.employee_resolver import get_resolver, identifier_key
+from tools.time_tool import current_date
+
+
+logger = logging.getLogger(__name__)
+
+# Turns whose prefetches are kept around (unclaimed ones are dropped)
+_MAX_TURNS = 32
+
+_QUESTION = re.compile(r"\?\s*$|^\s*(what|how|when|where|why|which|can|could|is|are|do|does|am|may|should)\b")
+
+# Intents whose agents resolve employees through the turn's resolver
+_RESOLVER_INTENTS = [
+    "attendance_start",
+    "attendance_end",
+    "attendance_range",
+    "daily_report",
+    "monthly_report",
+    "working_hours_report",
+]
+
+
+class _Job:
+    """
+    One prefetch: its future, the intents that would consume it and what
+    it shares with its consumer while running (see job_context()).
+    """
+
+    def __init__(self, future: Future, intents: List[str], entities: Optional[Dict] = None, context: Any = None):
+        self.future = future
+        self.intents = intents
+        self.entities = entities
+        self.context = context
+
+
+_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+_turns: "OrderedDict[str, Dict[Tuple, _Job]]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"started": 0, "used": 0, "wasted": 0, "failed": 0}
+
+
+def _count(key: str):
+    with _lock:
+        _stats[key] += 1
+
+
+def _submit(
+    turn_id: str,
+    key: Tuple,
+    intents: List[str],
+    fn: Callable,
+    *args,
+    entities: Optional[Dict] = None,
+    context: Any = None,
+    **kwargs,
+) -> Future:
+    # The caller's context: spans of the job nest under the turn's span
+    future = _executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+    with _lock:
+        _turns.setdefault(turn_id, {})[key] = _Job(future, intents, entities, context)
+        _stats["started"] += 1
+        while len(_turns) > _MAX_TURNS:
+            _, jobs = _turns.popitem(last=False)
+            for job in jobs.values():
+                job.future.cancel()
+                _stats["wasted"] += 1
+    return future
+
+
+def start(turn_id: str, user_input: str, previous_intent: Optional[str] = None):
+    """
+    Start the turn's likely non-LLM work while the supervisor classifies:
+
+    - policy-looking questions   knowledge retrieval for the message
+    - an employee id/email/name  resolution into the turn's resolver
+    - summary questions          today's attendance summary
+
+    Guesses come from the keyword rules (tools/intent_rules.py).
+    """
+    if not PREFETCH_ENABLED:
+        return
+
+    guess = classify_by_rules(user_input, previous_intent)
+    intent, entities = guess["intent"], guess["entities"]
+
+    if intent == "hr_policy" or (intent == "unknown" and _QUESTION.search(user_input.lower())):
+        from agents.knowledge_agent import retrieval_queries
+        from tools.vector_tool import QueryVectors, index_ready, similarity_search_batch
+
+        # Never build the index here; the first real query does that
+        if index_ready():
+            # Same queries (and key) as the knowledge agent; the query
+            # vectors are shared with its cache and FAQ lookups
+            queries = retrieval_queries(user_input)
+            vectors = QueryVectors()
+            _submit(
+                turn_id, ("retrieval", tuple(queries)), ["hr_policy"],
+                similarity_search_batch, queries, k=KNOWLEDGE_CANDIDATES, query_vectors=vectors,
+                context=vectors,
+            )
+
+    if intent == "attendance_summary":
+        today = current_date()
+        _submit(turn_id, ("summary", today), ["attendance_summary"], _attendance_summary, today)
+
+    key = identifier_key(entities)
+    if key is not None:
+        resolver = get_resolver({"turn_id": turn_id})
+        # The resolver waits for this lookup instead of repeating it
+        resolver.adopt(key, _submit(
+            turn_id, ("employee", key), _RESOLVER_INTENTS,
+            resolver.lookup, entities, entities=entities,
+        ))
+
+
+def _attendance_summary(date: str) -> Dict:
+    from tools.db_tool import get_attendance_summary_for_date
+
+    return get_attendance_summary_for_date(date)
+
+
+def settle(turn_id: str, tasks: List[Dict]):
+    """
+    Keep the prefetches the classified tasks ({"intent", "entities"}) will
+    use and drop the rest (not-yet-started ones are cancelled).
+    """
+    with _lock:
+        jobs = _turns.get(turn_id, {})
+
+    for key, job in list(jobs.items()):
+        wanted = any(
+            task.get("intent") in job.intents
+            and (job.entities is None or identifier_key(task.get("entities") or {}) == key[1])
+            for task in tasks
+        )
+
+        if not wanted:
+            job.future.cancel()
+            with _lock:
+                jobs.pop(key, None)
+                _stats["wasted"] += 1
+
+        elif job.entities is not None:
+            # Consumed through the turn's resolver, which already holds the
+            # future: counted as used now, re-counted if it fails
+            with _lock:
+                jobs.pop(key, None)
+                _stats["used"] += 1
+            job.future.add_done_callback(_recount_failed)
+
+    if not jobs:
+        with _lock:
+            _turns.pop(turn_id, None)
+
+
+def _recount_failed(future: Future):
+    if not future.cancelled() and future.exception() is not None:
+        with _lock:
+            _stats["used"] -= 1
+            _stats["failed"] += 1
+        logger.debug("Prefetch employee failed: %s", future.exception())
+
+
+def job_context(state: Dict, key: Tuple) -> Any:
+    """What the turn's pending prefetch for `key` shares (without claiming it), or None."""
+    turn_id = state.get("turn_id")
+    if not turn_id:
+        return None
+    with _lock:
+        job = _turns.get(turn_id, {}).get(key)
+    return job.context if job is not None else None
+
+
+def discard(state: Dict, key: Tuple):
+    """Drop the turn's unclaimed prefetch for `key` (the agent answered without it)."""
+    turn_id = state.get("turn_id")
+    if not turn_id:
+        return
+    with _lock:
+        job = _turns.get(turn_id, {}).pop(key, None)
+        if job is not None:
+            _stats["wasted"] += 1
+    if job is not None:
+        job.future.cancel()
+
+
+def prefetched(state: Dict, key: Tuple, compute: Callable, *args, **kwargs) -> Any:
+    """
+    The turn's prefetched result for `key` (waiting for it if still
+    running), or compute(*args, **kwargs) when there is none or it failed.
+    """
+    turn_id = state.get("turn_id")
+    job = None
+    if turn_id:
+        with _lock:
+            job = _turns.get(turn_id, {}).pop(key, None)
+
+    if job is not None and not job.future.cancelled():
+        try:
+            result = job.future.result()
+        except Exception as e:
+            _count("failed")
+            logger.debug("Prefetch %s failed: %s", key[0], e)
+        else:
+            _count("used")
+            return result
+
+    return compute(*args, **kwargs)
+
+
+def stats() -> Dict:
+    with _lock:
+        return dict(_stats)
+
+
+def reset():
+    """Drop every pending prefetch and zero the counters."""
+    with _lock:
+        for jobs in _turns.values():
+            for job in jobs.values():
+                job.future.cancel()
+        _turns.clear()
+        for key in _stats:
+            _stats[key] = 0
@@ -1,9 +1,41 @@
-from typing import Dict, TypedDict, List, Any, Optional
+from typing import Annotated, Dict, TypedDict, List, Any, Optional
+
+from config.settings import MAX_HISTORY_MESSAGES
+
+
+def keep_recent_messages(existing: List[Any], update: List[Any]) -> List[Any]:
+    """
+    Reducer for `messages`: agents return the full history plus their reply,
+    so only the newest MAX_HISTORY_MESSAGES are kept (bounds checkpoints too).
+    """
+    return list(update or [])[-MAX_HISTORY_MESSAGES:]
+
+
+def collect_task_results(existing: List[Dict], update: Optional[List[Dict]]) -> List[Dict]:
+    """
+    Reducer for `task_results`: concurrent fan-out branches append,
+    writing None clears the list.
+    """
+    if update is None:
+        return []
+    return (existing or []) + update
 
 
 class HRState(TypedDict):
     user_input: str
+    turn_id: Optional[str]     # new per message; scopes per-turn caches
     intent: Optional[str]
+    action: Optional[str]
+    stop: Optional[bool]
     employee_id: Optional[int]
     data:Dict[str, Any]   # <-- entities live here
-    messages: List[Any]
\ No newline at end of file
+    messages: Annotated[List[Any], keep_recent_messages]
+
+    # Structured commands (graph.commands): no LLM anywhere in the turn
+    command: Optional[Dict[str, Any]]   # input only; consumed by command_agent
+    channel: Optional[str]              # "command" | "chat"
+
+    # Multi-task turns (fan-out)
+    tasks: List[Dict[str, Any]]     # [{"intent", "action", "entities"}]
+    task_id: Optional[int]          # set only inside a fan-out branch
+    task_results: Annotated[List[Dict[str, Any]], collect_task_results]
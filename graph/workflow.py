@@ -1,7 +1,9 @@
 from langgraph.graph import StateGraph, START, END
 
 from graph.state import HRState
-from graph.routing import route_by_intent
+from graph.fanout import route_tasks, as_branch, merge_replies
+from graph.commands import route_entry, command_agent
+from utils.tracing import trace_node
 
 from agents.supervisor_agent import supervisor_agent
 from agents.employee_agent import employee_agent
@@ -10,44 +12,64 @@ from agents.report_agent import report_agent
 from agents.knowledge_agent import knowledge_agent
 
 
-def build_workflow():
+def build_workflow(checkpointer=None):
+    """
+    Build the HR graph. Pass a checkpointer (see graph.checkpoint) to persist
+    conversation state per session id (config thread_id).
+    """
     graph = StateGraph(HRState)
 
     # -------------------------
     # Add nodes (agents)
     # -------------------------
-    graph.add_node("supervisor_agent", supervisor_agent)
-    graph.add_node("employee_agent", employee_agent)
-    graph.add_node("attendance_agent", attendance_agent)
-    graph.add_node("report_agent", report_agent)
-    graph.add_node("knowledge_agent", knowledge_agent)
+    nodes = {
+        "supervisor_agent": supervisor_agent,
+        "command_agent": command_agent,
+        "employee_agent": as_branch(employee_agent),
+        "attendance_agent": as_branch(attendance_agent),
+        "report_agent": as_branch(report_agent),
+        "knowledge_agent": as_branch(knowledge_agent),
+        "merge_replies": merge_replies,
+    }
+    for name, node in nodes.items():
+        # Each node runs in a "node" span (utils.tracing; no-op when disabled)
+        graph.add_node(name, trace_node(name, node))
 
     # -------------------------
-    # Entry point
-    # -------------------------
-    graph.add_edge(START, "supervisor_agent")
-
-    # -------------------------
-    # Conditional routing
+    # Entry point (structured commands bypass the supervisor)
     # -------------------------
     graph.add_conditional_edges(
-        "supervisor_agent",
-        lambda state: END if state.get("stop") else route_by_intent(state),
+        START,
+        route_entry,
         {
-            "employee_agent": "employee_agent",
-            "attendance_agent": "attendance_agent",
-            "report_agent": "report_agent",
-            "knowledge_agent": "knowledge_agent",
-            END: END,
+            "supervisor_agent": "supervisor_agent",
+            "command_agent": "command_agent",
         },
     )
 
     # -------------------------
-    # End after each agent
+    # Conditional routing (one agent, or a fan-out per task)
+    # -------------------------
+    for source in ["supervisor_agent", "command_agent"]:
+        graph.add_conditional_edges(
+            source,
+            route_tasks,
+            {
+                "employee_agent": "employee_agent",
+                "attendance_agent": "attendance_agent",
+                "report_agent": "report_agent",
+                "knowledge_agent": "knowledge_agent",
+                END: END,
+            },
+        )
+
+    # -------------------------
+    # Merge fan-out replies, then end
     # -------------------------
-    graph.add_edge("employee_agent", END)
-    graph.add_edge("attendance_agent", END)
-    graph.add_edge("report_agent", END)
-    graph.add_edge("knowledge_agent", END)
+    graph.add_edge("employee_agent", "merge_replies")
+    graph.add_edge("attendance_agent", "merge_replies")
+    graph.add_edge("report_agent", "merge_replies")
+    graph.add_edge("knowledge_agent", "merge_replies")
+    graph.add_edge("merge_replies", END)
 
-    return graph.compile()
\ No newline at end of file
+    return graph.compile(checkpointer=checkpointer)
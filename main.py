@@ -1,21 +1,49 @@
+import argparse
+import os
+import time
+
 from graph.workflow import build_workflow
 from graph.state import HRState
+from graph.checkpoint import build_checkpointer, session_config
+from tools.index_reloader import start_index_reloader
+from utils.tracing import enable_tracing, disable_tracing
+from tools.llm_tiers import tier_stats
+from config.settings import INDEX_HOT_RELOAD, TRACE_ENABLED, TRACE_DIR
 
 
 def main():
-    app = build_workflow()
+    parser = argparse.ArgumentParser(description="HR Management System")
+    parser.add_argument(
+        "--session",
+        default="default",
+        help="Conversation session id (state is restored across restarts)",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        default=TRACE_ENABLED,
+        help=f"Record tracing spans; written to {TRACE_DIR} on exit",
+    )
+    args = parser.parse_args()
+
+    if args.trace:
+        enable_tracing()
+
+    checkpointer = build_checkpointer()
+    app = build_workflow(checkpointer=checkpointer)
+    config = session_config(args.session)
+
+    # Warm the knowledge index in the background and pick up policy edits
+    if INDEX_HOT_RELOAD:
+        start_index_reloader()
 
     print("🤖 HR Management System")
     print("Type 'exit' to quit.\n")
 
-    # Initialize state ONCE here (outside loop)
-    state: HRState = {
-        "user_input": "",
-        "intent": None,
-        "employee_id": None,
-        "data": {},
-        "messages": []
-    }
+    # Resume the saved session, or initialize state ONCE for a new one
+    resumed = checkpointer.has_session(args.session)
+    if resumed:
+        print(f"(Resumed session '{args.session}')\n")
 
     while True:
         user_input = input("You: ").strip()
@@ -24,17 +52,21 @@ def main():
             print("Goodbye 👋")
             break
 
-        # Update ONLY the input for the new turn
-        state["user_input"] = user_input
+        if resumed:
+            # intent, data and messages come from the checkpoint
+            state = {"user_input": user_input}
+        else:
+            state: HRState = {
+                "user_input": user_input,
+                "intent": None,
+                "employee_id": None,
+                "data": {},
+                "messages": []
+            }
 
         try:
-            result = app.invoke(state)
-
-            # Update persistent state with result
-            # Crucial: Keep intent and data for continuity
-            state["intent"] = result.get("intent")
-            state["data"] = result.get("data", {})
-            state["messages"] = result.get("messages", [])
+            result = app.invoke(state, config=config)
+            resumed = True
 
             if result.get("messages"):
                 print("Bot:", result["messages"][-1]["content"])
@@ -45,6 +77,23 @@ def main():
             print("Bot: Something went wrong.")
             print("Error:", e)
 
+    tracer = disable_tracing()
+    if tracer is not None:
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        base = os.path.join(TRACE_DIR, f"trace-{time.strftime('%Y%m%d-%H%M%S')}")
+        tracer.write_jsonl(base + ".jsonl")
+        tracer.write_chrome_trace(base + ".json")
+        print(f"Trace written to {base}.jsonl / .json")
+
+        # Per-tier model usage, next to the trace it explains
+        for tier, stats in tier_stats().items():
+            print(
+                f"LLM {tier} ({stats['model']}): {stats['calls']} calls, "
+                f"p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+                f"{stats['input_tokens']} in / {stats['output_tokens']} out tokens, "
+                f"{stats['parse_fallbacks']} parse fallbacks"
+            )
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
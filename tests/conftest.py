@@ -0,0 +1,23 @@
+import os
+import sqlite3
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from config.settings import BASE_DIR
+import tools.db_tool as db_tool
+
+
+@pytest.fixture
+def hr_db(tmp_path, monkeypatch):
+    """Empty HR database (schema.sql) used by db_tool for one test."""
+    path = str(tmp_path / "hr.db")
+
+    with open(os.path.join(BASE_DIR, "database", "schema.sql")) as f:
+        conn = sqlite3.connect(path)
+        conn.executescript(f.read())
+        conn.close()
+
+    monkeypatch.setattr(db_tool, "DATABASE_PATH", path)
+    return path
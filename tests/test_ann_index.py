@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from tools.ann_index import build_ann_index, exact_neighbors, index_spec, recall_at_k
+
+
+def clustered(n, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(20, dim))
+    vectors = centers[rng.integers(0, 20, n)] + 0.3 * rng.normal(size=(n, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def test_small_corpora_fall_back_to_simpler_indexes():
+    assert index_spec(10, 32, "ivf") == "Flat"
+    assert index_spec(5_000, 32, "ivfpq").startswith("IVF")
+    assert index_spec(5_000, 32, "ivfpq").endswith(",Flat")
+    assert index_spec(20_000, 100, "ivfpq").endswith("PQ50x8")
+
+    with pytest.raises(ValueError):
+        index_spec(10, 32, "lsh")
+
+
+@pytest.mark.parametrize("index_type, min_recall", [
+    ("flat", 1.0), ("fp16", 0.99), ("hnsw", 0.9), ("ivf", 0.8),
+])
+def test_trained_indexes_recall_against_flat(index_type, min_recall):
+    vectors = clustered(4_000)
+    queries = clustered(50, seed=1)
+    truth = exact_neighbors(vectors, queries, 5)
+
+    index, spec = build_ann_index(vectors, index_type)
+    found = index.search(queries, 5)[1]
+
+    assert index.ntotal == len(vectors)
+    assert recall_at_k(found, truth) >= min_recall
@@ -0,0 +1,85 @@
+import sqlite3
+from datetime import date
+
+from benchmarks.harness import FakeChatModel, HRResponder, install_fake_llm, latency_stats, use_database
+from benchmarks.synthetic_db import build_synthetic_db
+from benchmarks.offline_suite import compare_reports
+from graph.workflow import build_workflow
+
+
+def test_synthetic_db_has_requested_shape(tmp_path):
+    path = str(tmp_path / "hr.db")
+    stats = build_synthetic_db(path, employees=50, attendance_rows=400, last_day=date(2024, 3, 8))
+
+    conn = sqlite3.connect(path)
+    employees = conn.execute("SELECT COUNT(*), COUNT(DISTINCT email) FROM employees").fetchone()
+    rows, per_day_max = conn.execute(
+        "SELECT COUNT(*), MAX(c) FROM (SELECT COUNT(*) c FROM attendance GROUP BY employee_id, date)"
+    ).fetchone()
+    conn.close()
+
+    assert employees == (50, 50)
+    assert rows == stats["attendance_rows"] == 400
+    assert per_day_max == 1                     # one row per employee and day
+    assert stats["days"] == 8 and stats["last_day"] == "2024-03-08"
+
+
+def test_fake_llm_drives_the_graph(tmp_path):
+    path = str(tmp_path / "hr.db")
+    build_synthetic_db(path, employees=10, attendance_rows=20)
+    responder = HRResponder()
+    model = FakeChatModel(responder=responder)
+
+    restores = [use_database(path), install_fake_llm(model)]
+    try:
+        responder.classify("who is 3", "find_employee", {"id": 3})
+        result = build_workflow().invoke({"user_input": "who is 3", "intent": None, "data": {}, "messages": []})
+    finally:
+        for restore in reversed(restores):
+            restore()
+
+    assert result["intent"] == "find_employee"
+    assert "Found 1 employee" in result["messages"][-1]["content"]
+    assert model.calls == 1
+
+
+def test_compare_reports_flags_moved_p50s():
+    def report(db_ms, intent_ms):
+        return {"scales": [{
+            "scale": "1k",
+            "db_tool": {"get_employee_by_id": latency_stats([db_ms / 1000])},
+            "intents": {"find_employee/chat": latency_stats([intent_ms / 1000])},
+        }]}
+
+    changes = compare_reports(report(1.0, 10.0), report(1.1, 20.0))
+
+    assert [(c["case"], c["change"]) for c in changes] == [("1k/intents/find_employee/chat", "regression")]
+
+
+def test_load_test_replays_conversations_concurrently(tmp_path, monkeypatch):
+    import agents.knowledge_agent as knowledge_agent
+    from benchmarks.load_test import DEFAULT_SCRIPT, run_load_test
+    from tools.db_tool import get_employee_by_email, get_attendance_for_employee_on_date
+    from tools.time_tool import current_date
+
+    db_path = str(tmp_path / "hr.db")
+    build_synthetic_db(db_path, employees=20, attendance_rows=40)
+    # Policy turns: no index, answered as "not specified"
+    monkeypatch.setattr(knowledge_agent, "get_knowledge_version", lambda: "v")
+    monkeypatch.setattr(knowledge_agent, "match_faq", lambda question, **kwargs: None)
+    monkeypatch.setattr(knowledge_agent, "similarity_search_batch", lambda queries, k, **kwargs: [[] for _ in queries])
+
+    report = run_load_test([DEFAULT_SCRIPT] * 4, 2, db_path, str(tmp_path / "cp.db"), 0.0, 0.0)
+
+    assert report["errors"] == {}
+    assert report["throughput"]["turns"] == 4 * len(DEFAULT_SCRIPT)
+    assert report["intents"]["attendance_start"]["count"] == 12
+    assert report["sqlite"]["probes"] >= 0
+
+    restore = use_database(db_path)
+    try:
+        emp = get_employee_by_email("load3@example.com")
+        record = get_attendance_for_employee_on_date(emp["id"], current_date())
+    finally:
+        restore()
+    assert record["end_time"] == "18:00"
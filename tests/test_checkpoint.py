@@ -0,0 +1,68 @@
+from langgraph.graph import StateGraph, START, END
+
+from graph.state import HRState
+from graph.checkpoint import build_checkpointer, session_config
+from config.settings import MAX_HISTORY_MESSAGES
+
+
+def echo_agent(state: HRState):
+    return {
+        "intent": "attendance_start",
+        "data": {"entities": {"name": "het"}},
+        "messages": state.get("messages", []) + [
+            {"role": "assistant", "content": state["user_input"]}
+        ],
+    }
+
+
+def build_echo_graph(checkpointer):
+    graph = StateGraph(HRState)
+    graph.add_node("echo_agent", echo_agent)
+    graph.add_edge(START, "echo_agent")
+    graph.add_edge("echo_agent", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def count_checkpoints(saver, thread_id):
+    with saver.cursor(transaction=False) as cur:
+        cur.execute(
+            "SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)
+        )
+        return cur.fetchone()[0]
+
+
+def test_resume_after_restart(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    config = session_config("s1")
+
+    app = build_echo_graph(build_checkpointer(path))
+    app.invoke({"user_input": "first", "messages": []}, config=config)
+
+    # New saver + graph simulates a process restart
+    saver = build_checkpointer(path)
+    assert saver.has_session("s1")
+    assert not saver.has_session("s2")
+
+    result = build_echo_graph(saver).invoke({"user_input": "second"}, config=config)
+    assert result["intent"] == "attendance_start"
+    assert result["data"]["entities"] == {"name": "het"}
+    assert [m["content"] for m in result["messages"]] == ["first", "second"]
+
+
+def test_checkpoints_and_history_stay_bounded(tmp_path):
+    saver = build_checkpointer(str(tmp_path / "checkpoints.db"))
+    app = build_echo_graph(saver)
+    config = session_config("s1")
+
+    for i in range(MAX_HISTORY_MESSAGES + 5):
+        result = app.invoke({"user_input": str(i)}, config=config)
+
+    assert len(result["messages"]) == MAX_HISTORY_MESSAGES
+    assert result["messages"][-1]["content"] == str(MAX_HISTORY_MESSAGES + 4)
+
+    saver.compact("s1")
+    assert count_checkpoints(saver, "s1") == saver.keep_last
+
+    # Latest state survives compaction
+    state = app.get_state(config).values
+    assert state["messages"][-1]["content"] == str(MAX_HISTORY_MESSAGES + 4)
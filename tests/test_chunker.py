@@ -0,0 +1,51 @@
+from langchain_core.documents import Document
+
+import tools.chunker as chunker
+from tools.chunker import chunk_document, split_sections
+from tools.context_builder import assemble_context
+from tools.file_loader import iter_knowledge_files, parse_knowledge_file
+from utils.helpers import count_tokens
+
+
+def test_chunks_follow_sections_and_keep_heading_paths():
+    policy = next(f for f in iter_knowledge_files() if f.source == "hr_policy.txt")
+    chunks = chunk_document(parse_knowledge_file(policy))
+
+    assert len(chunks) == 7
+    sick = next(c for c in chunks if c.page_content.startswith("3. Sick Leave"))
+    assert sick.metadata["headings"] == ["HR POLICY DOCUMENT", "3. Sick Leave"]
+    assert sick.metadata["section"] == "HR POLICY DOCUMENT > 3. Sick Leave"
+    assert "Casual" not in sick.page_content and "Attendance" not in sick.page_content
+
+
+def test_long_sections_split_by_tokens_and_repeat_the_heading(monkeypatch):
+    monkeypatch.setattr(chunker, "CHUNK_SIZE", 40)
+    monkeypatch.setattr(chunker, "CHUNK_OVERLAP", 0)
+    text = "# Leave\n\n## Carry Forward\n" + "\n\n".join(
+        f"Rule {i}: unused leave days are reviewed by the manager each quarter." for i in range(6)
+    )
+    headings = [{"title": "Leave", "level": 1, "start": 0},
+                {"title": "Carry Forward", "level": 2, "start": text.index("## Carry")}]
+
+    assert [path for path, _ in split_sections(text, headings)] == [["Leave", "Carry Forward"]]
+
+    chunks = chunk_document(Document(page_content=text, metadata={"source": "l.md", "headings": headings}))
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.page_content.startswith("## Carry Forward")
+        assert count_tokens(chunk.page_content) <= 40 + count_tokens("## Carry Forward\n")
+
+
+def test_context_drops_duplicates_and_respects_the_budget():
+    wfh = "Work from home is allowed only with prior approval from the reporting manager."
+    chunks = [
+        wfh,
+        "5. Work From Home Policy\n" + wfh,      # overlapping copy of the first
+        "Office working hours are from 10:00 AM to 7:00 PM, Monday to Friday.",
+        "Company holidays are announced at the beginning of each year.",
+    ]
+
+    assert assemble_context(chunks) == [chunks[0], chunks[2], chunks[3]]
+
+    budget = count_tokens(chunks[0]) + count_tokens(chunks[3])
+    assert assemble_context(chunks, token_budget=budget) == [chunks[0], chunks[3]]
@@ -0,0 +1,122 @@
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+import agents.supervisor_agent as supervisor_module
+import agents.attendance_agent as attendance_module
+import agents.employee_agent as employee_module
+from graph.commands import CommandError, run_command, validate_command
+from graph.workflow import build_workflow
+from graph.checkpoint import build_checkpointer, session_config
+from tools.db_tool import create_employee, get_attendance_for_employee_on_date, get_employee_by_email
+from tools.time_tool import current_date
+
+
+def no_llm(_):
+    raise AssertionError("structured commands must not call the LLM")
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    for module in [supervisor_module, attendance_module, employee_module]:
+        monkeypatch.setattr(module, "llm", RunnableLambda(no_llm))
+
+
+def test_validate_command_normalizes_entities():
+    command = validate_command({
+        "intent": "attendance_range",
+        "entities": {"employee_id": "42", "start_time": "9 am", "end_time": "17:30", "date": "2024-03-01"},
+    })
+
+    assert command.action == "start"
+    assert command.entities == {
+        "employee_id": 42, "start_time": "09:00", "end_time": "17:30", "date": "2024-03-01",
+    }
+
+
+@pytest.mark.parametrize("payload, reason", [
+    ({"intent": "hr_policy", "entities": {}}, "intent"),
+    ({"intent": "attendance_start", "entities": {"start_time": "09:00"}}, "needs one of"),
+    ({"intent": "attendance_end", "entities": {"employee_id": 1}}, "end_time"),
+    ({"intent": "attendance_start", "entities": {"employee_id": 1, "start_time": "soon"}}, "start_time"),
+    ({"intent": "monthly_report", "entities": {"employee_id": 1, "month": 13}}, "month"),
+    ({"intent": "daily_report", "entities": {"employee_id": 1, "salary": 10}}, "unknown entities"),
+    ({"intent": "create_employee", "entities": {"name": "het", "email": "het@test.com"}}, "role"),
+])
+def test_invalid_commands_are_rejected_before_dispatch(payload, reason):
+    with pytest.raises(CommandError, match=reason):
+        validate_command(payload)
+
+
+def test_attendance_command_runs_without_llm(hr_db, offline):
+    emp_id = create_employee("het", "het@test.com", "dev")
+    app = build_workflow()
+
+    result = run_command(app, {
+        "intent": "attendance_start",
+        "entities": {"employee_id": emp_id, "start_time": "09:00"},
+    })
+
+    assert result["agent"] == "attendance_agent"
+    assert result["reply"] == f"Work started for het at 09:00 on {current_date()}."
+    record = get_attendance_for_employee_on_date(emp_id, current_date())
+    assert record["start_time"] == "09:00"
+
+    # Business rules still apply: an existing start needs confirmation
+    again = run_command(app, {
+        "intent": "attendance_start",
+        "entities": {"employee_id": emp_id, "start_time": "10:00"},
+    })
+    assert "already has a start time" in again["reply"]
+
+    confirmed = run_command(app, {
+        "intent": "attendance_start",
+        "action": "confirm",
+        "entities": {"employee_id": emp_id, "start_time": "10:00"},
+    })
+    assert "at 10:00" in confirmed["reply"]
+
+
+def test_create_and_report_commands_run_without_llm(hr_db, offline):
+    app = build_workflow()
+
+    created = run_command(app, {
+        "intent": "create_employee",
+        "entities": {"name": "yash", "email": "yash@test.com", "role": "qa"},
+    })
+    emp = get_employee_by_email("yash@test.com")
+    assert created["reply"] == f"Employee yash created with ID {emp['id']}."
+
+    duplicate = run_command(app, {
+        "intent": "create_employee",
+        "entities": {"name": "yash", "email": "yash@test.com", "role": "qa"},
+    })
+    assert "already exists" in duplicate["reply"]
+
+    report = run_command(app, {"intent": "daily_report", "entities": {"email": "yash@test.com"}})
+    assert report["agent"] == "report_agent"
+    assert "yash" in report["reply"]
+
+
+def test_chat_turn_after_command_goes_to_supervisor(hr_db, tmp_path, monkeypatch):
+    emp_id = create_employee("het", "het@test.com", "dev")
+    calls = []
+
+    def supervisor(_):
+        calls.append(1)
+        raise RuntimeError("supervisor reached")
+
+    monkeypatch.setattr(supervisor_module, "llm", RunnableLambda(supervisor))
+    monkeypatch.setattr(attendance_module, "llm", RunnableLambda(no_llm))
+
+    app = build_workflow(checkpointer=build_checkpointer(str(tmp_path / "sessions.db")))
+    config = session_config("kiosk")
+
+    run_command(app, {
+        "intent": "attendance_start",
+        "entities": {"employee_id": emp_id, "start_time": "09:00"},
+    }, config=config)
+    assert calls == []
+
+    with pytest.raises(RuntimeError, match="supervisor reached"):
+        app.invoke({"user_input": "hello"}, config=config)
+    assert calls == [1]
@@ -0,0 +1,50 @@
+from langchain_core.runnables import RunnableLambda
+
+import agents.employee_agent as employee_module
+from agents.employee_agent import employee_agent, summarize_for_llm, lookup_employees
+from config.settings import EMPLOYEE_PAGE_SIZE, EMPLOYEE_LLM_ROW_LIMIT
+from tools.db_tool import create_employee
+
+
+def no_llm(_):
+    raise AssertionError("employee lookups must not call the LLM")
+
+
+def test_role_lookup_is_paginated_without_llm(hr_db, monkeypatch):
+    monkeypatch.setattr(employee_module, "llm", RunnableLambda(no_llm))
+
+    total = EMPLOYEE_PAGE_SIZE * 2 + 5
+    for i in range(total):
+        create_employee(f"Dev {i}", f"dev{i}@test.com", "developer")
+    create_employee("Hr 1", "hr1@test.com", "hr")
+
+    state = {
+        "intent": "find_employee",
+        "data": {"entities": {"role": "developer"}},
+        "messages": [],
+    }
+    result = employee_agent(state)
+    reply = result["messages"][-1]["content"]
+
+    assert f"Found {total} employees (showing 1-{EMPLOYEE_PAGE_SIZE}, page 1 of 3)" in reply
+    assert "dev0@test.com" in reply
+    assert "hr1@test.com" not in reply
+
+    # "next page" continues from the stored current_page
+    entities = {**result["data"]["entities"], "page": "next"}
+    result = employee_agent({**state, "data": {"entities": entities}})
+    reply = result["messages"][-1]["content"]
+
+    assert "page 2 of 3" in reply
+    assert f"dev{EMPLOYEE_PAGE_SIZE}@test.com" in reply
+    assert "page" not in result["data"]["entities"]
+
+
+def test_llm_view_is_capped(hr_db):
+    for i in range(EMPLOYEE_LLM_ROW_LIMIT * 3):
+        create_employee(f"Dev {i}", f"dev{i}@test.com", "developer")
+
+    view = summarize_for_llm(lookup_employees("find_employee", {"role": "developer"}))
+
+    assert view["total_count"] == EMPLOYEE_LLM_ROW_LIMIT * 3
+    assert len(view["top_rows"]) == EMPLOYEE_LLM_ROW_LIMIT
@@ -0,0 +1,47 @@
+import tools.employee_resolver as resolver_module
+from tools.db_tool import create_employee
+from tools.employee_resolver import EmployeeResolver, get_resolver
+
+
+def test_batch_resolution_uses_one_query(hr_db, monkeypatch):
+    het = create_employee("Het", "het@test.com", "dev")
+    yash = create_employee("Yash", "yash@test.com", "qa")
+    create_employee("Ankit", "ankit1@test.com", "dev")
+    create_employee("ankit", "ankit2@test.com", "hr")
+
+    calls = []
+    original = resolver_module.get_employees_by_identifiers
+
+    def counting(**kwargs):
+        calls.append(kwargs)
+        return original(**kwargs)
+
+    monkeypatch.setattr(resolver_module, "get_employees_by_identifiers", counting)
+
+    resolver = EmployeeResolver()
+    results = resolver.resolve_many([
+        {"name": "het"},
+        {"email": "yash@test.com"},
+        {"name": "ankit"},
+        {"employee_id": str(het)},
+        {"name": "nobody"},
+        {},
+    ])
+
+    assert len(calls) == 1
+    assert [r["status"] for r in results] == [
+        "resolved", "resolved", "ambiguous", "resolved", "not_found", "missing",
+    ]
+    assert results[0]["employee"]["id"] == het
+    assert results[1]["employee"]["id"] == yash
+    assert {c["email"] for c in results[2]["candidates"]} == {"ankit1@test.com", "ankit2@test.com"}
+
+    # Memoized for the rest of the turn
+    assert resolver.resolve({"name": "HET"})["employee"]["id"] == het
+    assert len(calls) == 1
+
+
+def test_resolver_is_shared_within_a_turn():
+    assert get_resolver({"turn_id": "t1"}) is get_resolver({"turn_id": "t1"})
+    assert get_resolver({"turn_id": "t1"}) is not get_resolver({"turn_id": "t2"})
+    assert get_resolver({}) is not get_resolver({})
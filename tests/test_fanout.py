@@ -0,0 +1,51 @@
+import json
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+import agents.supervisor_agent as supervisor_module
+import agents.attendance_agent as attendance_module
+from graph.workflow import build_workflow
+from tools.db_tool import create_employee, get_attendance_for_employee_on_date
+from tools.time_tool import current_date
+
+
+def fake_supervisor(output: dict):
+    return RunnableLambda(lambda _: AIMessage(content=json.dumps(output)))
+
+
+# Polish step just echoes the deterministic text
+echo_llm = RunnableLambda(lambda value: AIMessage(content=value.to_messages()[-1].content))
+
+
+def test_multi_employee_message_fans_out(hr_db, monkeypatch):
+    ids = {name: create_employee(name, f"{name}@test.com", "dev") for name in ["het", "yash", "ankit"]}
+
+    tasks = [
+        {"intent": "attendance_start", "entities": {"name": name, "start_time": "9"}}
+        for name in ["het", "yash", "ankit"]
+    ]
+    monkeypatch.setattr(supervisor_module, "llm", fake_supervisor({
+        "intent": "attendance_start",
+        "action": "start",
+        "entities": {"name": "het", "start_time": "9"},
+        "confidence": 0.9,
+        "tasks": tasks,
+    }))
+    monkeypatch.setattr(attendance_module, "llm", echo_llm)
+
+    result = build_workflow().invoke({
+        "user_input": "het, yash and ankit started at 9",
+        "intent": None,
+        "data": {},
+        "messages": [],
+    })
+
+    assert len(result["messages"]) == 1
+    reply = result["messages"][0]["content"]
+    for name in ["het", "yash", "ankit"]:
+        assert f"Work started for {name} at 09:00" in reply
+        record = get_attendance_for_employee_on_date(ids[name], current_date())
+        assert record["start_time"] == "09:00"
+
+    assert result["task_results"] == []
@@ -0,0 +1,68 @@
+import json
+
+from langchain_core.runnables import RunnableLambda
+
+import agents.knowledge_agent as knowledge_agent
+import tools.faq_index as faq_index
+import tools.vector_tool as vector_tool
+
+from tests.test_vector_index import setup_index, LEAVE, WFH, NEW_WFH
+
+
+def fake_generator(sections):
+    def generate(prompt_value):
+        section = prompt_value.to_messages()[-1].content.split("\n", 2)[1]
+        sections.append(section)
+        title = section.lstrip("# ")
+        return json.dumps({"pairs": [
+            {"question": f"What is the {title} policy?", "answer": f"{title}: see policy."}
+        ]})
+
+    return RunnableLambda(generate)
+
+
+def test_faq_is_precomputed_per_section_and_rebuilt_on_change(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    monkeypatch.setattr(vector_tool, "FAQ_PRECOMPUTE", True)
+    sections = []
+    monkeypatch.setattr(faq_index, "llm", fake_generator(sections))
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+
+    vector_tool.build_vector_store()
+    assert sorted(sections) == ["## Leave", "## WFH"]
+
+    match = vector_tool.match_faq("What is the WFH policy?", threshold=0.99)
+    assert match["answer"] == "WFH: see policy."
+    assert match["source"] == "a.md" and match["section"] == "WFH"
+    assert vector_tool.match_faq("Something else entirely", threshold=0.99) is None
+
+    # Unchanged files: the saved FAQ index is reused
+    sections.clear()
+    vector_tool.build_vector_store()
+    assert sections == []
+
+    # An edited section regenerates only its own pairs
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{NEW_WFH}")
+    vector_tool.build_vector_store()
+    assert sections == ["## WFH"]
+
+
+def test_knowledge_agent_answers_faq_matches_without_generation(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    monkeypatch.setattr(vector_tool, "FAQ_PRECOMPUTE", True)
+    monkeypatch.setattr(faq_index, "llm", fake_generator([]))
+    (knowledge / "a.md").write_text(LEAVE)
+    vector_tool.build_vector_store()
+
+    monkeypatch.setattr(knowledge_agent, "answer_cache", knowledge_agent.AnswerCache())
+    monkeypatch.setattr(vector_tool, "FAQ_MATCH_THRESHOLDS", {vector_tool.EMBEDDING_BACKEND: 0.99})
+
+    def no_llm(_):
+        raise AssertionError("LLM called for an FAQ question")
+
+    monkeypatch.setattr(knowledge_agent, "llm", RunnableLambda(no_llm))
+
+    embeddings.queries.clear()
+    result = knowledge_agent.knowledge_agent({"user_input": "What is the Leave policy?", "messages": []})
+    assert result["messages"][-1]["content"] == "Leave: see policy."
+    assert embeddings.queries == ["What is the Leave policy?"]
@@ -0,0 +1,51 @@
+import tools.file_loader as file_loader
+from tools.file_loader import iter_knowledge_documents, iter_knowledge_files, parse_knowledge_file
+
+
+def test_nested_formats_stream_with_metadata(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_loader, "KNOWLEDGE_DIR", tmp_path)
+    (tmp_path / "policies" / "leave").mkdir(parents=True)
+    (tmp_path / "hr_policy.txt").write_text("HR POLICY\n\n1. Paid Leaves\nTwelve per year.\n")
+    (tmp_path / "policies" / "rules.md").write_text("# Rules\n\n## Working Hours\n10 to 7.\n")
+    (tmp_path / "policies" / "leave" / "sick.html").write_text(
+        "<html><head><title>x</title></head><body>"
+        "<h2>Sick Leave</h2><p>Inform your manager.</p><script>ignored()</script></body></html>"
+    )
+    (tmp_path / "policies" / "image.png").write_bytes(b"\x89PNG")
+    (tmp_path / ".hidden.md").write_text("# Secret")
+
+    docs = list(iter_knowledge_documents(workers=2))
+
+    assert [d.metadata["source"] for d in docs] == [
+        "hr_policy.txt",
+        "policies/rules.md",
+        "policies/leave/sick.html",
+    ]
+    txt, md, html = docs
+
+    assert [h["title"] for h in txt.metadata["headings"]] == ["HR POLICY", "1. Paid Leaves"]
+    assert [(h["title"], h["level"]) for h in md.metadata["headings"]] == [("Rules", 1), ("Working Hours", 2)]
+    assert html.page_content == "## Sick Leave\n\nInform your manager."
+    assert html.metadata["format"] == "html"
+    assert md.metadata["mtime_ns"] == (tmp_path / "policies" / "rules.md").stat().st_mtime_ns
+
+    # Heading offsets point into the text
+    heading = md.metadata["headings"][1]
+    assert md.page_content[heading["start"]:].startswith("## Working Hours")
+
+
+def test_unreadable_files_are_skipped(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_loader, "KNOWLEDGE_DIR", tmp_path)
+    (tmp_path / "a.md").write_text("# A")
+    (tmp_path / "b.txt").write_bytes(b"\xff\xfe\x00bad")
+
+    assert [d.metadata["source"] for d in iter_knowledge_documents()] == ["a.md"]
+    assert len(list(iter_knowledge_files())) == 2
+
+
+def test_default_root_is_knowledge_path():
+    sources = [f.source for f in iter_knowledge_files()]
+    assert "hr_policy.txt" in sources and "company_rules.md" in sources
+
+    doc = parse_knowledge_file(next(f for f in iter_knowledge_files() if f.source == "hr_policy.txt"))
+    assert "7. Policy Updates" in [h["title"] for h in doc.metadata["headings"]]
@@ -0,0 +1,63 @@
+import threading
+
+import tools.vector_tool as vector_tool
+from tools.index_reloader import IndexReloader
+
+from tests.test_vector_index import setup_index, LEAVE, WFH, NEW_WFH
+
+
+def test_rebuild_happens_off_the_served_index_then_swaps(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+
+    events = []
+    reloader = IndexReloader(on_event=events.append)
+
+    # First poll warms the index
+    assert reloader.check_once()["event"] == "swap"
+    first = vector_tool.current_index()
+    assert reloader.check_once() is None
+
+    # Queries keep reading the old snapshot while the next one is built
+    seen_during_build = []
+    original = vector_tool._save_version
+
+    def slow_save(docs, vectors, version):
+        seen_during_build.append(vector_tool.current_index().version)
+        return original(docs, vectors, version)
+
+    monkeypatch.setattr(vector_tool, "_save_version", slow_save)
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{NEW_WFH}")
+
+    worker = threading.Thread(target=reloader.check_once)
+    worker.start()
+    worker.join()
+
+    assert seen_during_build == [first.version]
+    assert events[-1]["event"] == "swap"
+    assert events[-1]["from_version"] == first.version
+    assert events[-1]["to_version"] == vector_tool.get_index_version() != first.version
+    assert events[-1]["rebuild_seconds"] >= 0
+
+    # The old snapshot still answers (its files are kept on disk)
+    assert first.store.similarity_search(WFH, k=1)
+
+    stats = reloader.stats()
+    assert (stats["rebuilds"], stats["swaps"], stats["failures"]) == (2, 2, 0)
+    assert stats["index_version"] == vector_tool.get_index_version()
+
+
+def test_failed_rebuild_keeps_serving(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    (knowledge / "a.md").write_text(LEAVE)
+
+    reloader = IndexReloader()
+    reloader.check_once()
+    version = vector_tool.get_index_version()
+
+    (knowledge / "a.md").write_text("")
+    event = reloader.check_once()
+
+    assert event["event"] == "failed"
+    assert vector_tool.get_index_version() == version
+    assert reloader.stats()["failures"] == 1
@@ -0,0 +1,68 @@
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+import agents.knowledge_agent as knowledge_agent
+import tools.vector_tool as vector_tool
+from agents.knowledge_agent import split_question, _interleave
+
+from tests.test_vector_index import setup_index, LEAVE, WFH
+
+
+def test_compound_questions_are_split_into_parts():
+    assert split_question("leave policy and WFH rules") == ["leave policy", "WFH rules"]
+    assert split_question("How many paid leaves do I get? Can I work from home?") == [
+        "How many paid leaves do I get",
+        "Can I work from home",
+    ]
+    # Parts without two content words stay attached
+    assert split_question("What are the start and end time rules?") == [
+        "What are the start and end time rules?"
+    ]
+    assert split_question("terms and conditions") == ["terms and conditions"]
+
+
+def test_rankings_are_interleaved_without_duplicates():
+    assert _interleave([["a", "b"], ["c", "a", "d"], []]) == ["a", "c", "b", "d"]
+
+
+def test_lexical_fast_path_questions_are_never_embedded(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    monkeypatch.setattr(vector_tool, "LEXICAL_FAST_PATH_SCORE", 0.5)
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+    vector_tool.build_vector_store()
+    embeddings.embedded.clear()
+
+    monkeypatch.setattr(knowledge_agent, "answer_cache", knowledge_agent.AnswerCache())
+    embedded_before_answer = []
+
+    def answer(_):
+        embedded_before_answer.append(len(embeddings.queries) + len(embeddings.embedded))
+        return AIMessage(content="Manager approval is needed.")
+
+    monkeypatch.setattr(knowledge_agent, "llm", RunnableLambda(answer))
+
+    result = knowledge_agent.knowledge_agent({"user_input": "WFH", "messages": []})
+
+    assert result["messages"][-1]["content"] == "Manager approval is needed."
+    assert embedded_before_answer == [0]
+    # Cached without embedding it just for the cache
+    assert embeddings.queries == [] and embeddings.embedded == []
+    knowledge_agent.knowledge_agent({"user_input": "wfh?", "messages": []})
+    assert knowledge_agent.answer_cache.stats()["hits"] == 1
+    assert embedded_before_answer == [0]
+
+
+def test_cached_answers_reuse_the_vector_of_the_search(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    monkeypatch.setattr(vector_tool, "HYBRID_RETRIEVAL", False)
+    monkeypatch.setattr(vector_tool, "default_threshold", lambda: float("-inf"))
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+    vector_tool.build_vector_store()
+
+    monkeypatch.setattr(knowledge_agent, "answer_cache", knowledge_agent.AnswerCache())
+    monkeypatch.setattr(knowledge_agent, "llm", RunnableLambda(lambda _: AIMessage(content="Twelve.")))
+
+    knowledge_agent.knowledge_agent({"user_input": "How many paid leaves?", "messages": []})
+
+    assert embeddings.queries == ["How many paid leaves?"]
+    assert knowledge_agent.answer_cache._entries["how many paid leaves"]["vector"] is not None
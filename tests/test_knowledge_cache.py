@@ -0,0 +1,62 @@
+import time
+
+import tools.answer_cache as answer_cache
+from tools.answer_cache import AnswerCache, normalize_question
+from tools.embeddings import HashingEmbeddings
+
+
+def fake_embed(text):
+    # "leave" questions point one way, everything else another
+    return [1.0, 0.0] if "leave" in text.lower() else [0.0, 1.0]
+
+
+def test_exact_and_neighbour_hits():
+    cache = AnswerCache(similarity=0.95)
+    cache.put("How many paid leaves?", "v1", "12 per year.", vector=fake_embed("leave"))
+
+    assert normalize_question("  how many PAID leaves?? ") == "how many paid leaves"
+    assert cache.get("how many paid leaves", "v1") == "12 per year."
+    assert cache.get("Paid leave count per year", "v1", embed=fake_embed) == "12 per year."
+    assert cache.get("Office hours?", "v1", embed=fake_embed) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["neighbour_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_minimal_pair_questions_miss_the_cache(monkeypatch):
+    # ada-002-like scores: a minimal pair sits at cosine 0.97
+    paid, unpaid = [1.0, 0.0], [0.97, 0.2431]
+    cache = AnswerCache()
+    cache.put("How many paid leaves do I get?", "v1", "12 per year.", vector=paid)
+    assert cache.get("How many unpaid leaves do I get?", "v1", embed=lambda _: unpaid) is None
+
+    monkeypatch.setattr(answer_cache, "EMBEDDING_BACKEND", "local")
+    embed = HashingEmbeddings(dim=1024).embed_query
+    cache = AnswerCache()
+    cache.put("How many paid leaves do I get?", "v1", "12 per year.", vector=embed("How many paid leaves do I get?"))
+
+    assert cache.get("How many unpaid leaves do I get?", "v1", embed=embed) is None
+    assert cache.get("how many paid leaves can I get", "v1", embed=embed) == "12 per year."
+
+
+def test_version_change_invalidates():
+    cache = AnswerCache()
+    cache.put("wfh?", "v1", "With approval.")
+
+    assert cache.get("wfh?", "v2") is None
+    assert cache.stats()["invalidations"] == 1
+    assert cache.get("wfh?", "v1") is None
+
+
+def test_lru_and_ttl_eviction():
+    cache = AnswerCache(max_entries=2, ttl_seconds=0.05)
+    cache.put("a", "v", "A")
+    cache.put("b", "v", "B")
+    cache.get("a", "v")
+    cache.put("c", "v", "C")
+
+    assert cache.get("b", "v") is None
+    assert cache.get("a", "v") == "A"
+
+    time.sleep(0.06)
+    assert cache.get("a", "v") is None
@@ -0,0 +1,84 @@
+from typing import Any, Dict, List
+
+import pytest
+from langchain_core.language_models.chat_models import SimpleChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+from tools.llm import create_chat_model
+from tools.llm_cassette import CassetteChatModel, CassetteMiss
+
+
+class CountingModel(SimpleChatModel):
+    """Answers "<prefix>: <last message>" and counts calls."""
+
+    model_name: str = "fake-gpt"
+    temperature: float = 0.0
+    prefix: str = "live"
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    def _call(self, messages: List, stop=None, run_manager=None, **kwargs) -> str:
+        self.calls += 1
+        return f"{self.prefix}: {messages[-1].content}"
+
+
+prompt = ChatPromptTemplate.from_messages([("system", "Rephrase politely."), ("human", "{input}")])
+
+
+def test_record_then_replay_without_the_model(tmp_path):
+    path = str(tmp_path / "cassette.db")
+
+    recorder = CassetteChatModel(inner=CountingModel(), mode="record", path=path)
+    recorded = (prompt | recorder).invoke({"input": "Work started for het."})
+    assert recorded.content == "live: Work started for het."
+
+    offline = CountingModel(prefix="never")
+    player = CassetteChatModel(inner=offline, mode="replay", path=path)
+    replayed = (prompt | player).invoke({"input": "Work started for het."})
+
+    assert replayed.content == recorded.content
+    assert offline.calls == 0
+    assert player.stats()["hits"] == 1
+
+    with pytest.raises(CassetteMiss):
+        (prompt | player).invoke({"input": "Work ended for het."})
+
+
+def test_key_covers_model_params(tmp_path):
+    path = str(tmp_path / "cassette.db")
+    CassetteChatModel(inner=CountingModel(), mode="record", path=path).invoke("hi")
+
+    warmer = CassetteChatModel(inner=CountingModel(temperature=0.7), mode="replay", path=path)
+    with pytest.raises(CassetteMiss):
+        warmer.invoke("hi")
+
+
+def test_replay_with_live_misses_is_a_response_cache(tmp_path):
+    model = CountingModel()
+    cache = CassetteChatModel(inner=model, mode="replay", on_miss="live", path=str(tmp_path / "c.db"))
+
+    for _ in range(3):
+        assert cache.invoke("polish me").content == "live: polish me"
+
+    assert model.calls == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["recorded"], stats["entries"]) == (2, 1, 1, 1)
+
+
+def test_passthrough_calls_the_model_every_time(tmp_path):
+    model = CountingModel()
+    live = CassetteChatModel(inner=model, mode="passthrough", path=str(tmp_path / "c.db"))
+    live.invoke("a")
+    live.invoke("a")
+    assert model.calls == 2
+
+    # The factory skips the wrapper entirely
+    assert not isinstance(create_chat_model(mode="passthrough"), CassetteChatModel)
+    assert isinstance(create_chat_model(mode="replay"), CassetteChatModel)
@@ -0,0 +1,154 @@
+import time
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+from langchain_openai import ChatOpenAI
+
+import agents.supervisor_agent as supervisor
+import tools.llm_resilience as resilience
+from benchmarks.fake_openai_server import Fault, FakeOpenAIServer
+from tools.intent_rules import classify_by_rules
+from tools.llm_resilience import CircuitBreaker, LLMUnavailable, ResilientChatModel
+
+
+@pytest.fixture
+def server():
+    with FakeOpenAIServer() as s:
+        yield s
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0.0)
+
+
+def resilient(server, name, **kwargs):
+    client = ChatOpenAI(model="fake", base_url=server.url, api_key="sk-test", timeout=5, max_retries=0)
+    return ResilientChatModel(inner=client, name=name, **kwargs)
+
+
+def test_deadline_bounds_the_whole_call(server):
+    server.script(Fault(delay=1.0), Fault(delay=1.0))
+    model = resilient(server, "deadline", timeout=0.2, max_retries=2)
+
+    started = time.monotonic()
+    with pytest.raises(LLMUnavailable) as error:
+        model.invoke("hello")
+
+    assert error.value.reason == "timeout"
+    # No retry starts once the call's deadline has passed
+    assert time.monotonic() - started < 0.5
+    assert (model.stats()["timeouts"], model.stats()["retries"]) == (1, 0)
+
+
+def test_server_errors_are_retried(server):
+    server.script(Fault(status=500), Fault(status=503))
+    model = resilient(server, "retry", max_retries=2)
+
+    assert model.invoke("het started at 9").content == "het started at 9"
+    assert server.requests == 3
+    assert model.stats()["retries"] == 2
+
+
+def test_bad_requests_are_not_retried(server):
+    server.script(Fault(status=400))
+    model = resilient(server, "bad-request", max_retries=2)
+
+    with pytest.raises(Exception) as error:
+        model.invoke("hello")
+
+    assert not isinstance(error.value, LLMUnavailable)
+    assert server.requests == 1
+    assert model.breaker.state == "closed"
+
+
+def test_breaker_fails_fast_then_recovers(server, monkeypatch):
+    monkeypatch.setitem(resilience._breakers, "breaker", CircuitBreaker(failures=2, reset_seconds=0.2))
+    server.script(*[Fault(status=500)] * 2)
+    model = resilient(server, "breaker", max_retries=0)
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailable):
+            model.invoke("hello")
+
+    with pytest.raises(LLMUnavailable) as error:
+        model.invoke("hello")
+    assert error.value.reason == "circuit_open"
+    assert server.requests == 2
+
+    time.sleep(0.25)
+    assert model.breaker.state == "half-open"
+    assert model.invoke("back").content == "back"
+    assert model.breaker.state == "closed"
+
+
+def test_bad_request_during_half_open_keeps_the_breaker_open(server, monkeypatch):
+    monkeypatch.setitem(resilience._breakers, "trial", CircuitBreaker(failures=1, reset_seconds=0.1))
+    server.script(Fault(status=500), Fault(status=400))
+    model = resilient(server, "trial", max_retries=0)
+
+    with pytest.raises(LLMUnavailable):
+        model.invoke("hello")
+    time.sleep(0.15)
+
+    with pytest.raises(Exception) as error:
+        model.invoke("hello")
+    assert not isinstance(error.value, LLMUnavailable)
+    assert model.breaker.state == "half-open"
+    # The trial slot is free again for the next call
+    assert model.invoke("back").content == "back"
+    assert model.breaker.state == "closed"
+
+
+def test_hedged_request_beats_a_slow_first_attempt(server):
+    model = resilient(server, "hedge", hedge_percentile=0.9, hedge_min_samples=3)
+    for _ in range(3):
+        model.invoke("warm up")
+
+    server.script(Fault(delay=1.0))
+    started = time.monotonic()
+    assert model.invoke("hedged").content == "hedged"
+
+    assert time.monotonic() - started < 0.9
+    stats = model.stats()
+    assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+
+
+def down(_):
+    raise LLMUnavailable("circuit_open", "down")
+
+
+def test_supervisor_falls_back_to_rules(hr_db, monkeypatch):
+    monkeypatch.setattr(supervisor, "llm", RunnableLambda(down))
+    monkeypatch.setattr(supervisor, "greeting_llm", RunnableLambda(down))
+
+    result = supervisor.supervisor_agent({"user_input": "het started at 9:30", "messages": [], "data": {}})
+    assert result["intent"] == "attendance_start"
+    assert result["data"]["entities"]["start_time"] == "09:30"
+
+    greeting = supervisor.supervisor_agent({"user_input": "hi", "messages": [], "data": {}})
+    assert greeting["stop"] is True
+    assert greeting["messages"][-1]["content"] == supervisor.GREETING_FALLBACK
+
+
+@pytest.mark.parametrize(
+    "text, intent, entities",
+    [
+        ("yash worked from 9 to 6", "attendance_range", {"name": "yash", "start_time": "9", "end_time": "6"}),
+        ("employee 12 started at 9:30", "attendance_start", {"employee_id": 12, "time": "9:30"}),
+        ("daily report for het yesterday", "daily_report", {"name": "het", "date": "yesterday"}),
+        ("hours worked by het today", "working_hours_report", {"name": "het", "date": "today"}),
+        ("add new employee ankit, ankit@x.com as developer", "create_employee",
+         {"name": "ankit", "email": "ankit@x.com", "role": "developer"}),
+        ("what is the leave policy?", "hr_policy", {}),
+        ("tell me a joke", "unknown", {}),
+    ],
+)
+def test_rule_classification(text, intent, entities):
+    result = classify_by_rules(text)
+    assert (result["intent"], result["entities"]) == (intent, entities)
+
+
+def test_rule_confirmation_keeps_previous_intent():
+    assert classify_by_rules("yes update it", "attendance_start")["action"] == "confirm"
+    assert classify_by_rules("yes update it", "attendance_start")["intent"] == "attendance_start"
@@ -0,0 +1,71 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel
+
+import tools.llm_tiers as llm_tiers
+from benchmarks.harness import FakeChatModel
+from config.settings import LLM_TIERS
+from tools.llm_tiers import MeteredChatModel, get_llm, tier_for, tier_metrics, tier_stats, with_parse_fallback
+
+
+class Reply(BaseModel):
+    text: str
+
+
+parser = PydanticOutputParser(pydantic_object=Reply)
+prompt = ChatPromptTemplate.from_messages([("human", "{input}")])
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    llm_tiers.reset_tier_stats()
+    yield
+    llm_tiers.reset_tier_stats()
+
+
+def test_tasks_share_one_model_per_tier():
+    assert tier_for("supervisor.classify") == "large"
+    assert tier_for("attendance.polish") == "small"
+    assert tier_for("not.configured") == "large"
+
+    polish = get_llm("attendance.polish")
+    assert polish is get_llm("employee.reply")
+    assert polish is not get_llm("knowledge.answer")
+    assert polish.inner._identifying_params["model_name"] == LLM_TIERS["small"]["model"]
+
+
+def test_unparsable_output_is_retried_on_the_large_tier(monkeypatch):
+    large = MeteredChatModel(inner=FakeListChatModel(responses=['{"text": "from large"}']), tier="large")
+    small = MeteredChatModel(inner=FakeListChatModel(responses=["not json"]), tier="small")
+    monkeypatch.setitem(llm_tiers._models, "large", large)
+
+    chain = with_parse_fallback(lambda model: prompt | model | parser, small, "attendance.polish")
+    assert chain.invoke({"input": "hello"}).text == "from large"
+
+    stats = tier_stats()
+    assert stats["small"]["parse_fallbacks"] == 1
+    assert (stats["small"]["calls"], stats["large"]["calls"]) == (1, 1)
+
+
+def test_large_tier_tasks_have_no_fallback():
+    model = FakeListChatModel(responses=["not json"])
+    chain = with_parse_fallback(lambda m: prompt | m | parser, model, "supervisor.classify")
+
+    with pytest.raises(OutputParserException):
+        chain.invoke({"input": "hello"})
+    assert all(stats["parse_fallbacks"] == 0 for stats in tier_stats().values())
+
+
+def test_latency_and_tokens_per_tier():
+    model = MeteredChatModel(inner=FakeChatModel(responder=lambda messages: "four tokens here ok"), tier="small")
+    for _ in range(3):
+        model.invoke("rephrase this politely")
+
+    stats = tier_metrics("small").stats()
+    assert stats["calls"] == 3
+    assert stats["input_tokens"] > 0 and stats["output_tokens"] > 0
+    assert stats["p95_ms"] >= stats["p50_ms"] >= 0
+    assert stats["model"] == LLM_TIERS["small"]["model"]
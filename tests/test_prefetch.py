@@ -0,0 +1,174 @@
+import json
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+import agents.supervisor_agent as supervisor_module
+import agents.attendance_agent as attendance_module
+import tools.employee_resolver as employee_resolver
+import tools.vector_tool as vector_tool
+from graph import prefetch
+from graph.workflow import build_workflow
+from tools.db_tool import create_employee, start_attendance
+from tools.time_tool import current_date
+
+
+@pytest.fixture(autouse=True)
+def fresh_prefetch():
+    prefetch.reset()
+    yield
+    prefetch.reset()
+
+
+def slow_supervisor(output: dict, seconds: float = 0.1):
+    def classify(_):
+        time.sleep(seconds)
+        return AIMessage(content=json.dumps(output))
+    return RunnableLambda(classify)
+
+
+echo_llm = RunnableLambda(lambda value: AIMessage(content=value.to_messages()[-1].content))
+
+
+def run(message: str):
+    return build_workflow().invoke({"user_input": message, "intent": None, "data": {}, "messages": []})
+
+
+def test_summary_is_prefetched_during_classification(hr_db, monkeypatch):
+    het = create_employee("het", "het@test.com", "dev")
+    create_employee("yash", "yash@test.com", "dev")
+    start_attendance(het, current_date(), "09:00")
+
+    monkeypatch.setattr(supervisor_module, "llm", slow_supervisor({
+        "intent": "attendance_summary", "action": "query", "entities": {}, "confidence": 0.9,
+    }))
+
+    result = run("attendance summary please")
+
+    assert "1" in result["messages"][-1]["content"]
+    assert prefetch.stats() == {"started": 1, "used": 1, "wasted": 0, "failed": 0}
+
+
+def test_employee_resolution_is_reused_by_the_agent(hr_db, monkeypatch):
+    create_employee("het", "het@test.com", "dev")
+
+    lookups = []
+    real = employee_resolver.get_employees_by_identifiers
+    monkeypatch.setattr(
+        employee_resolver, "get_employees_by_identifiers",
+        lambda **kwargs: lookups.append(kwargs) or real(**kwargs),
+    )
+    monkeypatch.setattr(supervisor_module, "llm", slow_supervisor({
+        "intent": "attendance_start", "action": "start",
+        "entities": {"name": "Het", "start_time": "9"}, "confidence": 0.9,
+    }))
+    monkeypatch.setattr(attendance_module, "llm", echo_llm)
+
+    result = run("het started at 9")
+
+    assert "Work started for het at 09:00" in result["messages"][-1]["content"]
+    assert len(lookups) == 1
+    assert prefetch.stats()["used"] == 1
+
+
+def test_mismatched_prefetch_is_discarded(hr_db, monkeypatch):
+    monkeypatch.setattr(supervisor_module, "llm", slow_supervisor({
+        "intent": "attendance_start", "action": "start",
+        "entities": {"name": "yash", "start_time": "9"}, "confidence": 0.9,
+    }))
+    monkeypatch.setattr(attendance_module, "llm", echo_llm)
+
+    run("het started at 9")
+
+    assert prefetch.stats()["wasted"] == 1
+    assert prefetch.stats()["used"] == 0
+
+
+def test_policy_retrieval_is_consumed_or_computed(monkeypatch):
+    monkeypatch.setattr(vector_tool, "index_ready", lambda: True)
+    monkeypatch.setattr(vector_tool, "similarity_search_batch", lambda queries, k, **kwargs: [["prefetched chunk"]])
+
+    def compute(*args, **kwargs):
+        return [["computed chunk"]]
+
+    prefetch.start("turn-1", "what is the leave policy?")
+    prefetch.settle("turn-1", [{"intent": "hr_policy", "entities": {}}])
+    state = {"turn_id": "turn-1"}
+    key = ("retrieval", ("what is the leave policy?",))
+
+    assert prefetch.prefetched(state, key, compute) == [["prefetched chunk"]]
+    # Claimed once; a second lookup (or another turn) computes
+    assert prefetch.prefetched(state, key, compute) == [["computed chunk"]]
+    assert prefetch.prefetched({"turn_id": "other"}, key, compute) == [["computed chunk"]]
+
+
+def test_compound_retrieval_uses_the_agents_key_and_unclaimed_jobs_are_wasted(monkeypatch):
+    import agents.knowledge_agent as knowledge_agent
+
+    searched = []
+    monkeypatch.setattr(vector_tool, "index_ready", lambda: True)
+    monkeypatch.setattr(
+        vector_tool, "similarity_search_batch",
+        lambda queries, k, **kwargs: searched.append(queries) or [[] for _ in queries],
+    )
+    question = "what is the leave policy and the WFH rules?"
+    queries = knowledge_agent.retrieval_queries(question)
+    assert len(queries) == 3
+
+    prefetch.start("turn-1", question)
+    prefetch.settle("turn-1", [{"intent": "hr_policy", "entities": {}}])
+    state = {"turn_id": "turn-1"}
+    assert prefetch.job_context(state, ("retrieval", tuple(queries))) is not None
+
+    # Answered from the answer cache: the prefetched retrieval is dropped
+    monkeypatch.setattr(knowledge_agent, "get_knowledge_version", lambda: "v")
+    monkeypatch.setattr(knowledge_agent, "answer_cache", knowledge_agent.AnswerCache())
+    knowledge_agent.answer_cache.put(question, "v", "cached answer")
+    result = knowledge_agent.knowledge_agent({**state, "user_input": question, "messages": []})
+
+    assert result["messages"][-1]["content"] == "cached answer"
+    assert prefetch.stats() == {"started": 1, "used": 0, "wasted": 1, "failed": 0}
+    assert searched in ([], [queries])
+
+
+def test_settle_hands_employee_lookups_to_the_resolver(hr_db, monkeypatch):
+    create_employee("het", "het@test.com", "dev")
+
+    release = threading.Event()
+    lookups = []
+    real = employee_resolver.get_employees_by_identifiers
+
+    def slow_lookup(**kwargs):
+        release.wait(5)
+        lookups.append(kwargs)
+        return real(**kwargs)
+
+    monkeypatch.setattr(employee_resolver, "get_employees_by_identifiers", slow_lookup)
+
+    prefetch.start("turn-1", "het started at 9")
+    started = time.monotonic()
+    prefetch.settle("turn-1", [{"intent": "attendance_start", "entities": {"name": "het"}}])
+    assert time.monotonic() - started < 1
+
+    release.set()
+    resolution = employee_resolver.get_resolver({"turn_id": "turn-1"}).resolve({"name": "Het"})
+    assert resolution["status"] == "resolved"
+    assert len(lookups) == 1
+
+
+def test_prefetch_spans_nest_under_the_callers_span(hr_db):
+    from utils import tracing
+
+    tracer = tracing.enable_tracing()
+    try:
+        with tracing.span("turn") as turn:
+            prefetch.start("turn-1", "attendance summary please")
+            prefetch.prefetched({"turn_id": "turn-1"}, ("summary", current_date()), lambda: None)
+    finally:
+        tracing.disable_tracing()
+
+    children = [r for r in tracer.records() if r["category"] == "db"]
+    assert children and {r["parent_id"] for r in children} == {turn.span_id}
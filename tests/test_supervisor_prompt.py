@@ -0,0 +1,78 @@
+import json
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+import agents.supervisor_agent as supervisor_module
+from agents.supervisor_prompt import CORE, FORMAT, assemble, build_system_prompt
+from benchmarks.harness import FakeChatModel
+from benchmarks.supervisor_regression import CASES, check_blocks, legacy_prompt, regressed, run_regression
+from config.settings import SUPERVISOR_PROMPT_TOKENS
+from utils.helpers import count_tokens
+
+
+def test_every_labelled_case_gets_the_rules_it_needs():
+    assert check_blocks() == []
+
+
+def test_prompts_stay_within_budget_and_below_legacy():
+    legacy = count_tokens(legacy_prompt())
+    for case in CASES:
+        prompt, info = assemble(case["input"], case.get("previous_intent"))
+        assert info["tokens"] <= SUPERVISOR_PROMPT_TOKENS
+        assert info["tokens"] < legacy / 2
+        assert prompt.startswith(CORE) and prompt.endswith(FORMAT)
+
+
+def test_tight_budget_drops_lowest_priority_blocks_first():
+    message = "het, yash and ankit started at 9 yesterday"
+    core_only = assemble(message, budget=0)[1]
+    assert core_only["blocks"] == []
+
+    roomy = assemble(message, budget=None)[1]
+    assert roomy["blocks"] == ["attendance", "multi_task", "dates"]
+
+    tight = assemble(message, budget=roomy["tokens"] - 1)[1]
+    assert tight["blocks"] == ["attendance", "multi_task"]
+    assert tight["dropped"] == ["dates"]
+
+
+def test_supervisor_sends_only_selected_rules(hr_db, monkeypatch):
+    systems = []
+
+    def capture(value):
+        systems.append(value.to_messages()[0].content)
+        return AIMessage(content=json.dumps({
+            "intent": "attendance_start", "action": "start", "entities": {}, "confidence": 0.9,
+        }))
+
+    monkeypatch.setattr(supervisor_module, "llm", RunnableLambda(capture))
+    supervisor_module.supervisor_agent({"user_input": "het started at 9", "messages": [], "data": {}})
+
+    assert systems == [build_system_prompt("het started at 9")]
+    assert "Attendance (STRICT)" in systems[0]
+    assert "Employee listing" not in systems[0]
+
+
+def test_regression_harness_compares_prompts(monkeypatch):
+    expected = {case["input"]: case for case in CASES}
+
+    def answer(messages):
+        case = expected[messages[-1].content]
+        return json.dumps({
+            "intent": case["intent"],
+            "action": case.get("action", "query"),
+            "entities": case.get("entities", {}),
+            "confidence": 0.9,
+            "tasks": [{"intent": case["intent"], "entities": {}}] * case.get("tasks", 0),
+        })
+
+    monkeypatch.setattr(supervisor_module, "llm", FakeChatModel(responder=answer))
+    report = run_regression()
+
+    assert report["legacy"]["exact_accuracy"] == report["budgeted"]["exact_accuracy"] == 1.0
+    assert report["budgeted"]["mean_prompt_tokens"] < report["legacy"]["mean_prompt_tokens"] / 2
+    assert regressed(report) is None
+
+    report["budgeted"]["intent_accuracy"] = 0.9
+    assert "intent_accuracy" in regressed(report)
@@ -0,0 +1,106 @@
+import json
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+import agents.supervisor_agent as supervisor_module
+import agents.attendance_agent as attendance_module
+from graph.workflow import build_workflow
+from tools.db_tool import create_employee
+from utils import tracing
+
+
+@pytest.fixture
+def tracer():
+    tracer = tracing.enable_tracing()
+    yield tracer
+    tracing.disable_tracing()
+
+
+def test_spans_nest_and_export(tracer, tmp_path):
+    @tracing.traced("db", name="query")
+    def query():
+        time.sleep(0.001)
+        return 1
+
+    with tracing.span("turn", category="app", session="s1") as outer:
+        query()
+        outer.set(done=True)
+
+    records = {r["name"]: r for r in tracer.records()}
+    assert records["query"]["parent_id"] == records["turn"]["span_id"]
+    assert records["turn"]["attrs"] == {"session": "s1", "done": True}
+    assert records["query"]["duration_ms"] >= 1
+
+    tracer.write_jsonl(tmp_path / "trace.jsonl")
+    lines = [json.loads(l) for l in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    assert [l["name"] for l in lines] == ["turn", "query"]
+
+    tracer.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert {e["cat"] for e in events} == {"app", "db"}
+
+
+def test_disabled_tracing_records_nothing():
+    assert tracing.get_tracer() is None
+
+    @tracing.traced("db")
+    def query():
+        return 42
+
+    assert query() == 42
+    assert tracing.span("x") is tracing._NOOP
+    assert tracing._llm_handler.get() is None
+
+
+def test_tracer_keeps_the_latest_spans():
+    tracer = tracing.Tracer(max_spans=2)
+    for name in ["a", "b", "c"]:
+        tracer.finish(tracer.start(name, "app", {}))
+
+    assert [r["name"] for r in tracer.records()] == ["b", "c"]
+    assert tracer.dropped == 1
+
+
+def test_chain_llm_spans_carry_token_counts(tracer):
+    from langchain_core.prompts import ChatPromptTemplate
+
+    chain = ChatPromptTemplate.from_messages([("human", "{input}")]) | FakeListChatModel(responses=["fine, thanks"])
+    chain.invoke({"input": "how are you doing today"})
+
+    by_category = {r["category"]: r for r in tracer.records()}
+    llm = by_category["llm"]
+    assert llm["parent_id"] == by_category["chain"]["span_id"]
+    assert llm["attrs"]["input_tokens"] > 0
+    assert llm["attrs"]["output_tokens"] > 0
+    assert llm["attrs"]["estimated"] is True
+
+
+def test_graph_turn_is_traced_end_to_end(hr_db, tracer, monkeypatch):
+    create_employee("het", "het@test.com", "dev")
+    monkeypatch.setattr(supervisor_module, "llm", FakeListChatModel(responses=[json.dumps({
+        "intent": "attendance_start",
+        "action": "start",
+        "entities": {"name": "het", "start_time": "9"},
+        "confidence": 0.9,
+    })]))
+    monkeypatch.setattr(attendance_module, "llm", RunnableLambda(
+        lambda value: AIMessage(content=value.to_messages()[-1].content)
+    ))
+
+    build_workflow().invoke({"user_input": "het started at 9", "intent": None, "data": {}, "messages": []})
+
+    records = tracer.records()
+    names = {(r["category"], r["name"]) for r in records}
+    assert ("node", "supervisor_agent") in names
+    assert ("node", "attendance_agent") in names
+    assert ("db", "db_tool.start_attendance") in names
+    assert ("llm", "llm") in names
+
+    nodes = {r["span_id"]: r["name"] for r in records if r["category"] == "node"}
+    db_parent = next(r["parent_id"] for r in records if r["name"] == "db_tool.start_attendance")
+    assert nodes[db_parent] == "attendance_agent"
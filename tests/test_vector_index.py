@@ -0,0 +1,265 @@
+from typing import List
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.runnables import RunnableLambda
+
+import tools.faq_index as faq_index
+import tools.file_loader as file_loader
+import tools.vector_tool as vector_tool
+from tools.chunk_store import ChunkStore
+from tools.embedding_cache import CachedEmbeddings
+from tools.embeddings import HashingEmbeddings
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    embedded: List[str] = []
+    queries: List[str] = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return super().embed_query(text)
+
+
+def setup_index(tmp_path, monkeypatch):
+    knowledge = tmp_path / "knowledge"
+    knowledge.mkdir()
+    embeddings = CountingEmbeddings(size=16)
+    embeddings.embedded = []
+    embeddings.queries = []
+
+    monkeypatch.setattr(file_loader, "KNOWLEDGE_DIR", knowledge)
+    monkeypatch.setattr(vector_tool, "VECTOR_STORE_PATH", tmp_path / "index")
+    monkeypatch.setattr(vector_tool, "_embeddings", embeddings)
+    monkeypatch.setattr(vector_tool, "_active", None)
+    # No FAQ pairs unless a test provides a generator
+    monkeypatch.setattr(faq_index, "llm", RunnableLambda(lambda _: '{"pairs": []}'))
+    return knowledge, embeddings
+
+
+LEAVE = "## Leave\n" + "Employees get twelve paid leaves per year. " * 5
+WFH = "## WFH\n" + "Work from home needs manager approval. " * 5
+NEW_WFH = "## WFH\n" + "Work from home is allowed on Fridays. " * 5
+
+
+def test_only_changed_chunks_are_embedded(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+    (knowledge / "b.txt").write_text("Sick leave needs a note.")
+
+    store = vector_tool.build_vector_store()
+    first_version = vector_tool.get_index_version()
+    assert len(embeddings.embedded) == store.index.ntotal == 3
+
+    # Nothing changed -> nothing embedded, same version
+    embeddings.embedded.clear()
+    vector_tool.build_vector_store()
+    assert embeddings.embedded == []
+    assert vector_tool.get_index_version() == first_version
+
+    # One section edited, one file removed
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{NEW_WFH}")
+    (knowledge / "b.txt").unlink()
+
+    store = vector_tool.build_vector_store()
+    assert [t.strip() for t in embeddings.embedded] == [NEW_WFH.strip()]
+    assert store.index.ntotal == 2
+    assert vector_tool.get_index_version() != first_version
+
+    manifest = vector_tool._read_manifest()
+    assert list(manifest["files"]) == ["a.md"]
+    assert manifest["settings"]["embedding_model"] == vector_tool._embedding_model()
+
+
+def test_embedding_cache_batches_misses_and_persists(tmp_path):
+    path = str(tmp_path / "cache.db")
+    inner = CountingEmbeddings(size=16)
+    inner.embedded = []
+
+    cache = CachedEmbeddings(inner, model="fake", path=path, batch_size=2)
+    vectors = cache.embed_documents(["a", "b", "a", "c"])
+
+    assert inner.embedded == ["a", "b", "c"]
+    assert vectors[0] == vectors[2]
+    assert cache.stats() == {"hits": 1, "misses": 3, "hit_rate": 0.25}
+
+    # A new process sees the same cache
+    reopened = CachedEmbeddings(inner, model="fake", path=path)
+    assert reopened.embed_documents(["c", "b"]) == [vectors[3], vectors[1]]
+    assert inner.embedded == ["a", "b", "c"]
+    assert reopened.stats()["hit_rate"] == 1.0
+
+    # Different model -> different key
+    CachedEmbeddings(inner, model="other", path=path).embed_documents(["a"])
+    assert inner.embedded == ["a", "b", "c", "a"]
+
+
+def test_local_embeddings_are_deterministic_and_normalized():
+    embeddings = HashingEmbeddings(dim=256)
+
+    leave = embeddings.embed_query("How many paid leaves?")
+    assert leave == HashingEmbeddings(dim=256).embed_query("How many paid leaves?")
+    assert abs(sum(v * v for v in leave) - 1.0) < 1e-5
+
+    docs = embeddings.embed_documents(["Employees get 12 paid leaves.", "Office hours are 10 to 7."])
+    similarity = [sum(a * b for a, b in zip(leave, d)) for d in docs]
+    assert similarity[0] > similarity[1]
+
+
+def test_keyword_questions_use_the_lexical_fast_path(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    # BM25 scores scale with corpus size; the default is tuned for knowledge/
+    monkeypatch.setattr(vector_tool, "LEXICAL_FAST_PATH_SCORE", 0.5)
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+    vector_tool.build_vector_store()
+    assert vector_tool._lexical_file(vector_tool.get_index_version()).exists()
+
+    # "WFH" is expanded to "work from home" and answered without embedding
+    chunks = vector_tool.similarity_search("WFH")
+    assert [c.strip() for c in chunks] == [WFH.strip()]
+    assert embeddings.queries == []
+
+    # Weak keyword overlap falls back to the (hybrid) vector search
+    vector_tool.similarity_search("rules about leaves and approval")
+    assert embeddings.queries == ["rules about leaves and approval"]
+
+
+def test_index_is_memory_mapped_with_versioned_files(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    (knowledge / "a.md").write_text(LEAVE)
+    vector_tool.build_vector_store()
+    first = vector_tool.get_index_version()
+
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+    vector_tool.build_vector_store()
+    second = vector_tool.get_index_version()
+
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{NEW_WFH}")
+    store = vector_tool.build_vector_store()
+    third = vector_tool.get_index_version()
+
+    # Current + previous version are kept, older ones removed
+    names = sorted(p.name for p in (tmp_path / "index").glob("*-*") if not p.name.startswith("faq-"))
+    assert names == sorted(
+        f"{kind}-{v}{ext}"
+        for v in (second, third)
+        for kind, ext in (("index", ".faiss"), ("chunks", ".db"), ("vectors", ".npy"), ("bm25", ".json"))
+    )
+    assert first not in "".join(names)
+
+    # Served from the chunk store, not an in-memory docstore
+    assert isinstance(store.docstore, ChunkStore)
+    assert len(store.index_to_docstore_id) == store.index.ntotal == 2
+    assert [doc.page_content.strip() for doc in store.similarity_search(NEW_WFH, k=1)] == [NEW_WFH.strip()]
+
+    # Reopening embeds nothing
+    embeddings.embedded.clear()
+    vector_tool.build_vector_store()
+    assert embeddings.embedded == []
+
+
+def test_untouched_files_are_not_read(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    (knowledge / "a.md").write_text(LEAVE)
+    (knowledge / "nested").mkdir()
+    (knowledge / "nested" / "b.md").write_text(WFH)
+    vector_tool.build_vector_store()
+
+    parsed = []
+    original = file_loader.parse_knowledge_file
+
+    def counting_parse(file):
+        parsed.append(file.source)
+        return original(file)
+
+    monkeypatch.setattr(file_loader, "parse_knowledge_file", counting_parse)
+    (knowledge / "nested" / "b.md").write_text(NEW_WFH)
+    vector_tool.build_vector_store()
+
+    assert parsed == ["nested/b.md"]
+    assert sorted(vector_tool._read_manifest()["files"]) == ["a.md", "nested/b.md"]
+
+
+def test_changing_the_index_type_reuses_stored_vectors(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+    vector_tool.build_vector_store()
+    flat_version = vector_tool.get_index_version()
+
+    embeddings.embedded.clear()
+    monkeypatch.setattr(vector_tool, "VECTOR_INDEX_TYPE", "hnsw")
+    store = vector_tool.build_vector_store()
+
+    assert embeddings.embedded == []
+    assert vector_tool.get_index_version() != flat_version
+    assert vector_tool._read_manifest()["index_spec"] == "HNSW32"
+    assert [d.page_content.strip() for d in store.similarity_search(WFH, k=1)] == [WFH.strip()]
+
+
+def test_batch_search_embeds_once_and_applies_per_query_thresholds(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    monkeypatch.setattr(vector_tool, "HYBRID_RETRIEVAL", False)
+    (knowledge / "a.md").write_text(f"{LEAVE}\n{WFH}")
+    vector_tool.build_vector_store()
+    embeddings.embedded.clear()
+
+    # Fake embeddings are per-text: query with the exact chunk texts
+    queries = [LEAVE.strip(), WFH.strip(), "anything"]
+    results = vector_tool.similarity_search_batch(queries, k=1, thresholds=[0.99, 0.99, 2.0])
+
+    assert embeddings.embedded == queries           # one embedding call
+    assert [r[0].strip() for r in results[:2]] == [LEAVE.strip(), WFH.strip()]
+    assert results[2] == []
+
+    # Same answers as one query at a time
+    assert vector_tool.similarity_search(WFH.strip(), k=1, threshold=0.99) == results[1]
+
+
+def test_unparseable_files_keep_their_chunks(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    (knowledge / "a.md").write_text(LEAVE)
+    (knowledge / "b.md").write_text(WFH)
+    vector_tool.build_vector_store()
+    chunks = vector_tool._read_manifest()["files"]["b.md"]["chunks"]
+
+    # An edit that cannot be decoded: the last good version stays indexed
+    (knowledge / "b.md").write_bytes(b"\xff\xfe broken")
+    store = vector_tool.build_vector_store()
+
+    assert vector_tool._read_manifest()["files"]["b.md"]["chunks"] == chunks
+    assert store.index.ntotal == 2
+
+    # A deleted file loses its chunks
+    (knowledge / "b.md").unlink()
+    store = vector_tool.build_vector_store()
+
+    assert sorted(vector_tool._read_manifest()["files"]) == ["a.md"]
+    assert store.index.ntotal == 1
+
+
+def test_index_settings_do_not_depend_on_loading_the_encoding(monkeypatch):
+    import utils.helpers as helpers
+
+    settings = vector_tool._index_settings()
+    # Offline start: tiktoken cannot load the encoding, counts are estimated
+    monkeypatch.setattr(helpers, "_encoding", lambda model: None)
+
+    assert vector_tool._index_settings() == settings
+
+
+def test_touched_but_unchanged_files_reuse_the_served_store(tmp_path, monkeypatch):
+    knowledge, embeddings = setup_index(tmp_path, monkeypatch)
+    (knowledge / "a.md").write_text(LEAVE)
+    vector_tool.build_vector_store()
+    served = vector_tool.current_index()
+
+    opened = []
+    monkeypatch.setattr(vector_tool, "ChunkStore", lambda path: opened.append(path) or ChunkStore(path))
+    (knowledge / "a.md").write_text(LEAVE)   # new mtime, same content
+    previous, active = vector_tool.refresh_index()
+
+    assert previous is active is served
+    assert opened == []
@@ -0,0 +1,144 @@
+import math
+from typing import Optional, Tuple
+
+import faiss
+import numpy as np
+
+from config.settings import (
+    VECTOR_INDEX_TYPE,
+    IVF_NLIST,
+    IVF_NPROBE,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_EF_SEARCH,
+    PQ_SUBQUANTIZERS,
+    INDEX_TRAIN_SAMPLE,
+)
+
+
+# flat   exact float32 (baseline)
+# fp16   exact search over float16-compressed vectors (half the memory)
+# hnsw   graph index, no training, fast and high recall
+# ivf    inverted lists over k-means cells (trained), float32 vectors
+# ivfpq  inverted lists + product quantization (trained), ~dim/8x smaller
+INDEX_TYPES = ("flat", "fp16", "hnsw", "ivf", "ivfpq")
+
+# k-means wants ~39 points per centroid; PQ codebooks need 256 per sub-space
+_POINTS_PER_CENTROID = 39
+_PQ_MIN_POINTS = 256 * _POINTS_PER_CENTROID
+
+
+def _nlist(n: int) -> int:
+    if IVF_NLIST:
+        return IVF_NLIST
+    return max(1, min(int(4 * math.sqrt(n)), n // _POINTS_PER_CENTROID))
+
+
+def _pq_subquantizers(dim: int) -> int:
+    # Largest divisor of dim not above the configured count
+    m = min(PQ_SUBQUANTIZERS, dim)
+    while dim % m:
+        m -= 1
+    return m
+
+
+def index_spec(n: int, dim: int, index_type: str = VECTOR_INDEX_TYPE) -> str:
+    """
+    FAISS index_factory string for `n` vectors of `dim`.
+
+    Corpora too small to train the requested type fall back to the next
+    simpler one (ivfpq -> ivf -> flat); training on a handful of points
+    would only cost recall.
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown vector index type: {index_type}")
+
+    if index_type == "ivfpq" and n < _PQ_MIN_POINTS:
+        index_type = "ivf"
+    if index_type == "ivf" and n < 2 * _POINTS_PER_CENTROID:
+        index_type = "flat"
+
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "fp16":
+        return "SQfp16"
+    if index_type == "hnsw":
+        return f"HNSW{HNSW_M}"
+    if index_type == "ivf":
+        return f"IVF{_nlist(n)},Flat"
+    return f"IVF{_nlist(n)},PQ{_pq_subquantizers(dim)}x8"
+
+
+def tune_index(index) -> None:
+    """Apply search-time settings (not part of the stored index)."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(IVF_NPROBE, ivf.nlist)
+
+    hnsw = getattr(index, "hnsw", None)
+    if hnsw is not None:
+        hnsw.efSearch = HNSW_EF_SEARCH
+
+
+def build_ann_index(
+    vectors: np.ndarray,
+    index_type: str = VECTOR_INDEX_TYPE,
+    seed: int = 0,
+) -> Tuple[faiss.Index, str]:
+    """
+    Build (and train, when the type needs it) an L2 index over `vectors`.
+    Returns (index, spec). Training uses a random sample of at most
+    INDEX_TRAIN_SAMPLE vectors.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, dim = vectors.shape
+    spec = index_spec(n, dim, index_type)
+
+    index = faiss.index_factory(dim, spec, faiss.METRIC_L2)
+
+    hnsw = getattr(index, "hnsw", None)
+    if hnsw is not None:
+        hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        # Polysemous codes are never used for search; training them
+        # takes longer than the PQ itself
+        ivf = faiss.downcast_index(ivf)
+        if hasattr(ivf, "do_polysemous_training"):
+            ivf.do_polysemous_training = False
+
+    if not index.is_trained:
+        sample = vectors
+        if n > INDEX_TRAIN_SAMPLE:
+            rows = np.random.default_rng(seed).choice(n, INDEX_TRAIN_SAMPLE, replace=False)
+            sample = vectors[np.sort(rows)]
+        index.train(sample)
+
+    if n:
+        index.add(vectors)
+
+    tune_index(index)
+    return index, spec
+
+
+def index_memory_bytes(index) -> int:
+    """Serialized size: what the index occupies when mapped or loaded."""
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def exact_neighbors(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Ground-truth ids (flat L2 search), for recall measurements."""
+    index = faiss.IndexFlatL2(vectors.shape[1])
+    index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+    return index.search(np.ascontiguousarray(queries, dtype=np.float32), k)[1]
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray, k: Optional[int] = None) -> float:
+    """Share of the true top-k neighbours found in the returned top-k."""
+    k = k or truth.shape[1]
+    hits = sum(
+        len(set(f[:k].tolist()) & set(t[:k].tolist()))
+        for f, t in zip(found, truth)
+    )
+    return hits / (len(truth) * k)
@@ -0,0 +1,141 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from config.settings import (
+    ANSWER_CACHE_SIZE,
+    ANSWER_CACHE_TTL_SECONDS,
+    ANSWER_CACHE_SIMILARITY,
+    EMBEDDING_BACKEND,
+)
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_question(question: str) -> str:
+    """'How many PAID leaves??' -> 'how many paid leaves'"""
+    return " ".join(_WORD_RE.findall(question.lower()))
+
+
+class AnswerCache:
+    """
+    LRU + TTL cache of generated policy answers.
+
+    Entries are keyed by the normalized question. A lookup that misses the
+    exact key can still reuse the answer of the nearest cached question when
+    the cosine similarity of their embeddings is at least `similarity`
+    (default: ANSWER_CACHE_SIMILARITY for the configured backend).
+
+    Every entry belongs to one knowledge version (index version + knowledge
+    file fingerprint); a lookup with a different version clears the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_SIZE,
+        ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS,
+        similarity: Optional[float] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # Scores are not comparable across backends
+        self.similarity = ANSWER_CACHE_SIMILARITY[EMBEDDING_BACKEND] if similarity is None else similarity
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "neighbour_hits": 0, "misses": 0, "invalidations": 0}
+
+    def _check_version(self, version: str):
+        # Caller holds the lock
+        if version != self._version:
+            if self._entries:
+                self._stats["invalidations"] += 1
+            self._entries.clear()
+            self._version = version
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl_seconds
+        for key in [k for k, e in self._entries.items() if e["created"] < cutoff]:
+            del self._entries[key]
+
+    def get(
+        self,
+        question: str,
+        version: str,
+        embed: Optional[Callable[[str], List[float]]] = None,
+    ) -> Optional[str]:
+        key = normalize_question(question)
+
+        with self._lock:
+            self._check_version(version)
+            self._expire()
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry["answer"]
+
+            candidates = [
+                (k, e) for k, e in self._entries.items() if e["vector"] is not None
+            ]
+
+        if embed is not None and candidates:
+            vector = _unit(embed(question))
+            matrix = np.stack([e["vector"] for _, e in candidates])
+            scores = matrix @ vector
+            best = int(np.argmax(scores))
+
+            if scores[best] >= self.similarity:
+                best_key = candidates[best][0]
+                with self._lock:
+                    entry = self._entries.get(best_key)
+                    if entry is not None and self._version == version:
+                        self._entries.move_to_end(best_key)
+                        self._stats["neighbour_hits"] += 1
+                        return entry["answer"]
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(
+        self,
+        question: str,
+        version: str,
+        answer: str,
+        vector: Optional[List[float]] = None,
+    ):
+        key = normalize_question(question)
+
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = {
+                "answer": answer,
+                "vector": _unit(vector) if vector is not None else None,
+                "created": time.monotonic(),
+            }
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+
+def _unit(vector) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
@@ -0,0 +1,145 @@
+import json
+import sqlite3
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from langchain_community.docstore.base import Docstore
+from langchain_core.documents import Document
+
+
+SCHEMA = """
+CREATE TABLE chunks (
+    position INTEGER PRIMARY KEY,
+    chunk_id TEXT NOT NULL UNIQUE,
+    text     TEXT NOT NULL,
+    metadata TEXT NOT NULL
+)
+"""
+
+
+def write_chunk_store(path: Path, rows: Iterable[Tuple[int, str, Document]]):
+    """
+    Write (FAISS position, chunk id, document) rows to a fresh SQLite file.
+    The file is built under a temporary name and renamed into place, so
+    processes that still read the previous file are not disturbed.
+    """
+    path = Path(path)
+    tmp = Path(str(path) + ".tmp")
+    tmp.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute(SCHEMA)
+        conn.executemany(
+            "INSERT INTO chunks (position, chunk_id, text, metadata) VALUES (?, ?, ?, ?)",
+            (
+                (position, chunk_id, doc.page_content, json.dumps(doc.metadata))
+                for position, chunk_id, doc in rows
+            ),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    tmp.replace(path)
+
+
+class ChunkStore(Docstore):
+    """
+    Read-only docstore over a chunks SQLite file.
+
+    Chunk texts are read on demand (primary-key lookups), so opening the
+    store costs nothing and the OS page cache is shared between processes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def search(self, search: str):
+        rows = self._query(
+            "SELECT chunk_id, text, metadata FROM chunks WHERE chunk_id = ?",
+            (search,),
+        )
+        if not rows:
+            return f"ID {search} not found."
+
+        chunk_id, text, metadata = rows[0]
+        return Document(id=chunk_id, page_content=text, metadata=json.loads(metadata))
+
+    def documents_at(self, positions: List[int]) -> Dict[int, Document]:
+        """Documents at several FAISS positions, with one query."""
+        if not positions:
+            return {}
+
+        marks = ",".join("?" * len(positions))
+        rows = self._query(
+            f"SELECT position, chunk_id, text, metadata FROM chunks WHERE position IN ({marks})",
+            tuple(positions),
+        )
+        return {
+            position: Document(id=chunk_id, page_content=text, metadata=json.loads(metadata))
+            for position, chunk_id, text, metadata in rows
+        }
+
+    def chunk_id_at(self, position: int) -> Optional[str]:
+        rows = self._query("SELECT chunk_id FROM chunks WHERE position = ?", (position,))
+        return rows[0][0] if rows else None
+
+    def count(self) -> int:
+        return self._query("SELECT COUNT(*) FROM chunks")[0][0]
+
+    def positions(self) -> List[int]:
+        return [row[0] for row in self._query("SELECT position FROM chunks ORDER BY position")]
+
+    def documents(self) -> Iterator[Tuple[int, Document]]:
+        """All (position, document) rows, in index order."""
+        rows = self._query(
+            "SELECT position, chunk_id, text, metadata FROM chunks ORDER BY position"
+        )
+        for position, chunk_id, text, metadata in rows:
+            yield position, Document(
+                id=chunk_id, page_content=text, metadata=json.loads(metadata)
+            )
+
+    def texts(self) -> Dict[str, str]:
+        return dict(self._query("SELECT chunk_id, text FROM chunks"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ChunkPositions(Mapping):
+    """
+    FAISS position -> chunk id, backed by the chunk store
+    (stands in for LangChain's in-memory index_to_docstore_id dict).
+    """
+
+    def __init__(self, store: ChunkStore):
+        self._store = store
+
+    def __getitem__(self, position: int) -> str:
+        chunk_id = self._store.chunk_id_at(int(position))
+        if chunk_id is None:
+            raise KeyError(position)
+        return chunk_id
+
+    def get(self, position, default=None):
+        chunk_id = self._store.chunk_id_at(int(position))
+        return default if chunk_id is None else chunk_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._store.positions())
+
+    def __len__(self) -> int:
+        return self._store.count()
@@ -0,0 +1,96 @@
+import hashlib
+from typing import Dict, List, Tuple
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from utils.helpers import count_tokens
+from config.settings import CHUNK_SIZE, CHUNK_OVERLAP
+
+
+# Inside one section: paragraphs, then lines, then words
+SEPARATORS = ["\n\n", "\n", " ", ""]
+
+# Bump when chunk boundaries change for the same settings
+CHUNKER_VERSION = "sections-v1"
+
+
+def split_sections(text: str, headings: List[Dict]) -> List[Tuple[List[str], str]]:
+    """
+    Cut a document at its headings (see file_loader: title, level, start).
+
+    Returns [(heading_path, section_text)] in document order; heading_path
+    is the chain of enclosing headings, e.g. ["HR POLICY", "3. Sick Leave"].
+    Text before the first heading is a section with an empty path.
+    """
+    sections = []
+    stack: List[Tuple[int, str]] = []
+    starts = sorted(headings, key=lambda h: h["start"])
+
+    if not starts or starts[0]["start"] > 0:
+        end = starts[0]["start"] if starts else len(text)
+        sections.append(([], text[:end]))
+
+    for i, heading in enumerate(starts):
+        end = starts[i + 1]["start"] if i + 1 < len(starts) else len(text)
+
+        while stack and stack[-1][0] >= heading["level"]:
+            stack.pop()
+        stack.append((heading["level"], heading["title"]))
+
+        sections.append(([title for _, title in stack], text[heading["start"]:end]))
+
+    # Headings without text of their own (e.g. a document title) are
+    # kept only as part of their children's paths
+    return [
+        (path, body.strip())
+        for path, body in sections
+        if body.strip() and (not path or "\n" in body.strip())
+    ]
+
+
+def chunk_document(doc: Document) -> List[Document]:
+    """
+    Section-aware chunking.
+
+    Every chunk stays inside one section and carries the section's heading
+    path in its metadata. Sections over CHUNK_SIZE tokens are split by
+    paragraphs/lines (token-measured, CHUNK_OVERLAP tokens of overlap) and
+    continuation pieces repeat the section heading so they stand alone.
+    """
+    source = doc.metadata["source"]
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        separators=SEPARATORS,
+        length_function=count_tokens,
+        is_separator_regex=False,
+    )
+
+    chunks = []
+    seen = set()
+    for path, body in split_sections(doc.page_content, doc.metadata.get("headings", [])):
+        pieces = [body] if count_tokens(body) <= CHUNK_SIZE else splitter.split_text(body)
+
+        for i, piece in enumerate(pieces):
+            if i > 0 and path:
+                heading_line = body.split("\n", 1)[0]
+                piece = f"{heading_line}\n{piece}"
+
+            chunk_id = hashlib.sha256(f"{source}\n{piece}".encode("utf-8")).hexdigest()
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
+
+            chunks.append(Document(
+                id=chunk_id,
+                page_content=piece,
+                metadata={
+                    "source": source,
+                    "chunk_id": chunk_id,
+                    "headings": path,
+                    "section": " > ".join(path),
+                },
+            ))
+
+    return chunks
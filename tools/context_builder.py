@@ -0,0 +1,70 @@
+from typing import FrozenSet, List
+
+from tools.lexical_index import tokenize
+from utils.helpers import count_tokens
+from config.settings import (
+    KNOWLEDGE_CONTEXT_TOKENS,
+    CONTEXT_MMR_LAMBDA,
+    CONTEXT_DUPLICATE_OVERLAP,
+)
+
+
+def _shingles(text: str, size: int = 3) -> FrozenSet[str]:
+    terms = tokenize(text)
+    if len(terms) < size:
+        return frozenset(terms)
+    return frozenset(" ".join(terms[i:i + size]) for i in range(len(terms) - size + 1))
+
+
+def _overlap(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Share of the smaller chunk found in the other (catches contained chunks)."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def assemble_context(
+    chunks: List[str],
+    token_budget: int = KNOWLEDGE_CONTEXT_TOKENS,
+    mmr_lambda: float = CONTEXT_MMR_LAMBDA,
+    duplicate_overlap: float = CONTEXT_DUPLICATE_OVERLAP,
+) -> List[str]:
+    """
+    Pick the chunks that go into the prompt.
+
+    `chunks` come best first from retrieval. Selection is MMR-style: each
+    step takes the chunk with the best mix of relevance (rank) and novelty
+    (low overlap with chunks already taken). Chunks that mostly repeat a
+    selected one are dropped, and chunks that no longer fit the token
+    budget are skipped. The result keeps relevance order.
+    """
+    if not chunks:
+        return []
+
+    relevance = [1.0 - i / len(chunks) for i in range(len(chunks))]
+    shingles = [_shingles(c) for c in chunks]
+    candidates = list(range(len(chunks)))
+    selected: List[int] = []
+    used = 0
+
+    while candidates:
+        def redundancy(i: int) -> float:
+            return max((_overlap(shingles[i], shingles[j]) for j in selected), default=0.0)
+
+        best = max(
+            candidates,
+            key=lambda i: mmr_lambda * relevance[i] - (1 - mmr_lambda) * redundancy(i),
+        )
+        candidates.remove(best)
+
+        if redundancy(best) >= duplicate_overlap:
+            continue
+
+        tokens = count_tokens(chunks[best])
+        if used + tokens > token_budget:
+            continue
+
+        selected.append(best)
+        used += tokens
+
+    return [chunks[i] for i in sorted(selected)]
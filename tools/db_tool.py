@@ -1,6 +1,7 @@
 import sqlite3
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from config.settings import DATABASE_PATH
+from utils.tracing import traced
 
 
 def get_connection():
@@ -11,6 +12,7 @@ def get_connection():
 # EMPLOYEE OPERATIONS
 # =========================
 
+@traced("db")
 def create_employee(name: str, email: str, role: str) -> int:
     conn = get_connection()
     cursor = conn.cursor()
@@ -29,6 +31,7 @@ def create_employee(name: str, email: str, role: str) -> int:
     return employee_id
 
 
+@traced("db")
 def get_employee_by_id(employee_id: int) -> Optional[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -51,6 +54,7 @@ def get_employee_by_id(employee_id: int) -> Optional[Dict]:
     }
 
 
+@traced("db")
 def get_employee_by_email(email: str) -> Optional[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -73,6 +77,7 @@ def get_employee_by_email(email: str) -> Optional[Dict]:
     }
 
 
+@traced("db")
 def get_employees_by_name(name: str) -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -95,6 +100,7 @@ def get_employees_by_name(name: str) -> List[Dict]:
     ]
 
 
+@traced("db")
 def get_employees_by_role(role: str) -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -112,6 +118,7 @@ def get_employees_by_role(role: str) -> List[Dict]:
     ]
 
 
+@traced("db")
 def get_all_employees() -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -126,10 +133,108 @@ def get_all_employees() -> List[Dict]:
     ]
 
 
+@traced("db")
+def search_employees(
+    filters: Dict,
+    limit: int,
+    offset: int = 0,
+    newest_first: bool = False,
+) -> Tuple[List[Dict], int]:
+    """
+    One page of employees matching the filters (id, email, name, role),
+    plus the total number of matches.
+    """
+    clauses = []
+    params: List = []
+
+    if filters.get("id"):
+        clauses.append("id = ?")
+        params.append(int(filters["id"]))
+    if filters.get("email"):
+        clauses.append("email = ?")
+        params.append(filters["email"])
+    if filters.get("name"):
+        clauses.append("LOWER(name) = LOWER(?)")
+        params.append(filters["name"])
+    if filters.get("role"):
+        clauses.append("role = ?")
+        params.append(filters["role"])
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    order = "DESC" if newest_first else "ASC"
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(f"SELECT COUNT(*) FROM employees {where}", params)
+    total = cursor.fetchone()[0]
+
+    cursor.execute(
+        f"""
+        SELECT id, name, email, role
+        FROM employees
+        {where}
+        ORDER BY id {order}
+        LIMIT ? OFFSET ?
+        """,
+        (*params, limit, offset),
+    )
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [
+        {"id": r[0], "name": r[1], "email": r[2], "role": r[3]}
+        for r in rows
+    ], total
+
+
+@traced("db")
+def get_employees_by_identifiers(
+    ids: List[int],
+    emails: List[str],
+    names: List[str],
+) -> List[Dict]:
+    """
+    Fetch every employee matching any of the given ids, emails or
+    (case-insensitive) names in a single query.
+    """
+    clauses = []
+    params: List = []
+
+    if ids:
+        clauses.append(f"id IN ({', '.join('?' * len(ids))})")
+        params.extend(ids)
+    if emails:
+        clauses.append(f"email IN ({', '.join('?' * len(emails))})")
+        params.extend(emails)
+    if names:
+        clauses.append(f"LOWER(name) IN ({', '.join('?' * len(names))})")
+        params.extend(n.lower() for n in names)
+
+    if not clauses:
+        return []
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        f"SELECT id, name, email, role FROM employees WHERE {' OR '.join(clauses)}",
+        params,
+    )
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [
+        {"id": r[0], "name": r[1], "email": r[2], "role": r[3]}
+        for r in rows
+    ]
+
+
 # =========================
 # ATTENDANCE WRITE
 # =========================
 
+@traced("db")
 def start_attendance(employee_id: int, date: str, start_time: str):
     conn = get_connection()
     cursor = conn.cursor()
@@ -146,6 +251,7 @@ def start_attendance(employee_id: int, date: str, start_time: str):
     conn.close()
 
 
+@traced("db")
 def end_attendance(employee_id: int, date: str, end_time: str):
     conn = get_connection()
     cursor = conn.cursor()
@@ -167,6 +273,7 @@ def end_attendance(employee_id: int, date: str, end_time: str):
 # ATTENDANCE READ (EMPLOYEE)
 # =========================
 
+@traced("db")
 def get_attendance_for_employee_on_date(employee_id: int, date: str) -> Optional[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -193,6 +300,7 @@ def get_attendance_for_employee_on_date(employee_id: int, date: str) -> Optional
     }
 
 
+@traced("db")
 def get_attendance_for_employee(employee_id: int) -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -220,6 +328,7 @@ def get_attendance_for_employee(employee_id: int) -> List[Dict]:
 # ATTENDANCE READ (ORG LEVEL)
 # =========================
 
+@traced("db")
 def get_attendance_for_all_on_date(date: str) -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -250,6 +359,7 @@ def get_attendance_for_all_on_date(date: str) -> List[Dict]:
     ]
 
 
+@traced("db")
 def get_all_attendance() -> List[Dict]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -283,6 +393,7 @@ def get_all_attendance() -> List[Dict]:
 # REPORT / SUMMARY FUNCTIONS (FIXED)
 # =========================
 
+@traced("db")
 def get_attendance_summary_for_date(date: str) -> Dict:
     """
     Accurate daily summary:
@@ -318,6 +429,7 @@ def get_attendance_summary_for_date(date: str) -> Dict:
     }
 
 
+@traced("db")
 def get_employee_daily_report(employee_id: int, date: str) -> Optional[Dict]:
     """
     Individual employee daily report
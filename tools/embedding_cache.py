@@ -0,0 +1,146 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config.settings import EMBEDDING_CACHE_PATH, EMBEDDING_BATCH_SIZE
+
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper with a persistent, content-addressed cache.
+
+    Vectors are stored as float32 blobs in SQLite keyed by
+    (model, sha256(text)). Cache misses are de-duplicated and embedded in
+    bulk requests of at most `batch_size` texts. Hit/miss counts are kept
+    for both document and query embeddings (see `stats()`).
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        path: str = EMBEDDING_CACHE_PATH,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+    ):
+        self.embeddings = embeddings
+        self.model = model
+        self.batch_size = batch_size
+
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache on first use (caller holds the lock)."""
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                ) WITHOUT ROWID;
+                """
+            )
+        return self._conn
+
+    # -----------------------------
+    # Embeddings interface
+    # -----------------------------
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(
+            [text],
+            lambda texts: [self.embeddings.embed_query(t) for t in texts],
+        )[0]
+
+    # -----------------------------
+    # Cache
+    # -----------------------------
+    def _embed(self, texts: List[str], embed_fn) -> List[List[float]]:
+        hashes = [_text_hash(t) for t in texts]
+        cached = self._lookup(set(hashes))
+
+        missing: Dict[str, str] = {}
+        for h, text in zip(hashes, texts):
+            if h not in cached:
+                missing.setdefault(h, text)
+
+        # Repeats within one call are embedded once and count as hits
+        with self._lock:
+            self._hits += len(texts) - len(missing)
+            self._misses += len(missing)
+
+        if missing:
+            pending = list(missing.items())
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                vectors = embed_fn([text for _, text in batch])
+                fresh = {
+                    h: np.asarray(v, dtype=np.float32)
+                    for (h, _), v in zip(batch, vectors)
+                }
+                self._store(fresh)
+                cached.update(fresh)
+
+        return [cached[h].tolist() for h in hashes]
+
+    def _lookup(self, hashes) -> Dict[str, np.ndarray]:
+        found = {}
+        hashes = list(hashes)
+
+        with self._lock:
+            for start in range(0, len(hashes), _LOOKUP_CHUNK):
+                chunk = hashes[start:start + _LOOKUP_CHUNK]
+                rows = self._connection().execute(
+                    f"""
+                    SELECT text_hash, vector FROM embeddings
+                    WHERE model = ? AND text_hash IN ({', '.join('?' * len(chunk))})
+                    """,
+                    (self.model, *chunk),
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def _store(self, vectors: Dict[str, np.ndarray]):
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(self.model, h, v.tobytes()) for h, v in vectors.items()],
+            )
+            conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+            }
@@ -0,0 +1,130 @@
+import re
+import zlib
+from math import log
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from tools.lexical_index import STOPWORDS
+from config.settings import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    LOCAL_EMBEDDING_DIM,
+    RELEVANCE_THRESHOLDS,
+)
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Local, dependency-free embeddings: hashed word and character n-gram
+    features with sublinear TF weighting, L2-normalized (NumPy).
+
+    No model download and no network; a query embeds in microseconds.
+    Vectors are deterministic across processes (CRC32 feature hashing).
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        dim: int = LOCAL_EMBEDDING_DIM,
+        ngram_range=(3, 5),
+        word_weight: float = 2.0,
+    ):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+
+    @property
+    def model(self) -> str:
+        low, high = self.ngram_range
+        return f"local-hashing-v{self.VERSION}-{self.dim}-{low}{high}"
+
+    def _features(self, text: str) -> Dict[str, float]:
+        counts: Dict[str, float] = {}
+        low, high = self.ngram_range
+
+        for word in _WORD_RE.findall(text.lower()):
+            if word in STOPWORDS:
+                continue
+
+            key = "w:" + word
+            counts[key] = counts.get(key, 0.0) + self.word_weight
+
+            padded = f"#{word}#"
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    key = padded[i:i + n]
+                    counts[key] = counts.get(key, 0.0) + 1.0
+
+        return counts
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        for feature, count in self._features(text).items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            # Signed hashing keeps collisions from only adding up
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vector[h % self.dim] += sign * (1.0 + log(count))
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(t).tolist() for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text).tolist()
+
+
+_instances: Dict[str, Embeddings] = {}
+
+
+def create_embeddings(backend: str = EMBEDDING_BACKEND) -> Embeddings:
+    """
+    Build the embeddings backend selected in settings (EMBEDDING_BACKEND).
+
+    - "openai": OpenAIEmbeddings behind the persistent embedding cache
+    - "local":  HashingEmbeddings (already faster than a cache lookup)
+    """
+    if backend == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        from tools.embedding_cache import CachedEmbeddings
+
+        return CachedEmbeddings(
+            OpenAIEmbeddings(model=EMBEDDING_MODEL),
+            model=embedding_model_name(backend),
+        )
+
+    if backend == "local":
+        return HashingEmbeddings()
+
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def get_embeddings(backend: str = EMBEDDING_BACKEND) -> Embeddings:
+    """Shared (lazily created) embeddings instance for a backend."""
+    if backend not in _instances:
+        _instances[backend] = create_embeddings(backend)
+    return _instances[backend]
+
+
+def embedding_model_name(backend: str = EMBEDDING_BACKEND) -> str:
+    """Identifier stored with indexes and cache entries."""
+    if backend == "openai":
+        return EMBEDDING_MODEL
+    if backend == "local":
+        return HashingEmbeddings().model
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def default_threshold(backend: Optional[str] = None) -> float:
+    """Relevance threshold tuned per backend (scores are not comparable)."""
+    return RELEVANCE_THRESHOLDS[backend or EMBEDDING_BACKEND]
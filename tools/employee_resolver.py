@@ -0,0 +1,184 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from tools.db_tool import get_employees_by_identifiers
+
+
+# Resolution statuses
+RESOLVED = "resolved"
+AMBIGUOUS = "ambiguous"
+NOT_FOUND = "not_found"
+MISSING = "missing"
+
+# Turns whose resolvers are kept around (fan-out branches share one)
+_MAX_TURNS = 32
+
+
+def identifier_key(entities: Dict) -> Optional[Tuple[str, object]]:
+    """
+    Pick the identifier used for resolution, in priority order:
+    employee_id / id  ->  email  ->  name.
+    """
+    emp_id = entities.get("employee_id") or entities.get("id")
+    if emp_id:
+        try:
+            return ("id", int(emp_id))
+        except (TypeError, ValueError):
+            return None
+
+    if entities.get("email"):
+        return ("email", entities["email"])
+
+    if entities.get("name"):
+        return ("name", str(entities["name"]).lower())
+
+    return None
+
+
+class EmployeeResolver:
+    """
+    Resolves employee identifiers (ids, emails, names) to employee rows.
+
+    A batch of identifiers is resolved with ONE query; results are memoized
+    for the lifetime of the resolver (one conversation turn). Lookups
+    already running elsewhere (adopt()) are waited for, not repeated.
+
+    Each resolution is a dict:
+        {
+            "status": "resolved" | "ambiguous" | "not_found" | "missing",
+            "by": "id" | "email" | "name" | None,
+            "value": <identifier value>,
+            "employee": <employee dict> | None,
+            "candidates": [<employee dict>, ...],
+        }
+    """
+
+    def __init__(self):
+        self._cache: Dict[Tuple[str, object], List[Dict]] = {}
+        self._inflight: Dict[Tuple[str, object], Future] = {}
+        self._lock = threading.Lock()
+
+    def adopt(self, key: Tuple[str, object], future: Future):
+        """Resolving `key` waits for `future` (a running lookup of it) first."""
+        with self._lock:
+            self._inflight[key] = future
+        future.add_done_callback(lambda _: self._forget(key, future))
+
+    def _forget(self, key: Tuple[str, object], future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def resolve(self, entities: Dict) -> Dict:
+        return self.resolve_many([entities])[0]
+
+    def resolve_many(self, entities_list: List[Dict]) -> List[Dict]:
+        keys = [identifier_key(entities or {}) for entities in entities_list]
+
+        with self._lock:
+            running = [
+                self._inflight[k] for k in set(keys)
+                if k in self._inflight and k not in self._cache
+            ]
+        for future in running:
+            try:
+                future.result()
+            except Exception:
+                pass  # queried below
+
+        return self._lookup(keys)
+
+    def lookup(self, entities: Dict) -> Dict:
+        """resolve() without waiting for adopted lookups (what they run)."""
+        return self._lookup([identifier_key(entities or {})])[0]
+
+    def _lookup(self, keys: List[Optional[Tuple[str, object]]]) -> List[Dict]:
+        with self._lock:
+            pending = {k for k in keys if k is not None and k not in self._cache}
+
+        if pending:
+            rows = get_employees_by_identifiers(
+                ids=sorted(v for kind, v in pending if kind == "id"),
+                emails=sorted(v for kind, v in pending if kind == "email"),
+                names=sorted(v for kind, v in pending if kind == "name"),
+            )
+
+            matches = {key: [] for key in pending}
+            for row in rows:
+                for key in (
+                    ("id", row["id"]),
+                    ("email", row["email"]),
+                    ("name", row["name"].lower()),
+                ):
+                    if key in matches:
+                        matches[key].append(row)
+
+            with self._lock:
+                self._cache.update(matches)
+
+        return [self._resolution(key) for key in keys]
+
+    def _resolution(self, key: Optional[Tuple[str, object]]) -> Dict:
+        if key is None:
+            return {
+                "status": MISSING,
+                "by": None,
+                "value": None,
+                "employee": None,
+                "candidates": [],
+            }
+
+        candidates = self._cache.get(key, [])
+
+        if len(candidates) == 1:
+            status = RESOLVED
+        elif len(candidates) > 1:
+            status = AMBIGUOUS
+        else:
+            status = NOT_FOUND
+
+        return {
+            "status": status,
+            "by": key[0],
+            "value": key[1],
+            "employee": candidates[0] if status == RESOLVED else None,
+            "candidates": list(candidates),
+        }
+
+    def invalidate(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_resolvers: "OrderedDict[str, EmployeeResolver]" = OrderedDict()
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(state: Dict) -> EmployeeResolver:
+    """
+    Resolver memoized for the current turn (state["turn_id"]).
+    Without a turn id a fresh, unshared resolver is returned.
+    """
+    turn_id = state.get("turn_id")
+    if not turn_id:
+        return EmployeeResolver()
+
+    with _resolvers_lock:
+        resolver = _resolvers.get(turn_id)
+        if resolver is None:
+            resolver = EmployeeResolver()
+            _resolvers[turn_id] = resolver
+            while len(_resolvers) > _MAX_TURNS:
+                _resolvers.popitem(last=False)
+        else:
+            _resolvers.move_to_end(turn_id)
+
+    return resolver
+
+
+def format_candidates(candidates: List[Dict]) -> str:
+    return ", ".join(
+        f"ID {c['id']} ({c['email']}, {c['role']})" for c in candidates
+    )
@@ -0,0 +1,245 @@
+import json
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+from pydantic import BaseModel
+from langchain_core.documents import Document
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+from tools.llm_tiers import task_model, with_parse_fallback
+from config.settings import (
+    FAQ_QUESTIONS_PER_SECTION,
+    FAQ_MAX_CONCURRENCY,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt changes (cached pairs are regenerated)
+FAQ_PROMPT_VERSION = 1
+
+
+# -----------------------------
+# Generation (one LLM call per new section chunk)
+# -----------------------------
+class FAQPair(BaseModel):
+    question: str
+    answer: str
+
+
+class FAQPairs(BaseModel):
+    pairs: List[FAQPair]
+
+
+parser = PydanticOutputParser(pydantic_object=FAQPairs)
+
+prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """
+            You write the FAQ of a company's HR policies.
+
+            For the policy section below, write up to {count} questions an
+            employee would actually ask about it, each with a complete answer.
+
+            RULES:
+            - Answer ONLY from the section text. Do NOT add anything else.
+            - Answers are short, clear and professional (1-3 sentences).
+            - Questions are in the words an employee would use.
+            - If the section has no policy content (e.g. only a title),
+              return an empty list.
+
+            {format_instructions}
+            """
+        ),
+        ("human", "Policy section:\n{section}")
+    ]
+).partial(format_instructions=parser.get_format_instructions())
+
+# Created on first use: index builds without FAQs never need an API key
+llm = None
+
+
+def _get_llm():
+    global llm
+
+    if llm is None:
+        from tools.llm_tiers import get_llm
+
+        llm = get_llm("faq.generate")
+    return llm
+
+
+def _cache_key(chunk_id: str) -> str:
+    return f"{task_model('faq.generate')}:{FAQ_PROMPT_VERSION}:{FAQ_QUESTIONS_PER_SECTION}:{chunk_id}"
+
+
+class FAQPairCache:
+    """Generated pairs per chunk (content-addressed), kept across builds."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS faq_pairs (key TEXT PRIMARY KEY, pairs TEXT NOT NULL)"
+        )
+        return conn
+
+    def get_many(self, chunk_ids: List[str]) -> Dict[str, List[Dict]]:
+        keys = {_cache_key(cid): cid for cid in chunk_ids}
+        if not keys:
+            return {}
+
+        conn = self._connect()
+        try:
+            marks = ",".join("?" * len(keys))
+            rows = conn.execute(
+                f"SELECT key, pairs FROM faq_pairs WHERE key IN ({marks})", tuple(keys)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        return {keys[key]: json.loads(pairs) for key, pairs in rows}
+
+    def put_many(self, pairs: Dict[str, List[Dict]]):
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO faq_pairs (key, pairs) VALUES (?, ?)",
+                [(_cache_key(cid), json.dumps(p)) for cid, p in pairs.items()],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def generate_faq_pairs(chunks: List[Document], cache: FAQPairCache) -> Tuple[Dict[str, List[Dict]], bool]:
+    """
+    Q&A pairs for every chunk: cached ones are reused, the rest are
+    generated with one (concurrent) LLM batch.
+
+    Returns (pairs by chunk id, complete). Chunks whose generation failed
+    are left out and retried on the next build.
+    """
+    pairs = cache.get_many([c.id for c in chunks])
+    missing = [c for c in chunks if c.id not in pairs]
+
+    if not missing:
+        return pairs, True
+
+    chain = with_parse_fallback(lambda model: prompt | model | parser, _get_llm(), "faq.generate")
+    results = chain.batch(
+        [
+            {"section": c.page_content, "count": FAQ_QUESTIONS_PER_SECTION}
+            for c in missing
+        ],
+        config={"max_concurrency": FAQ_MAX_CONCURRENCY},
+        return_exceptions=True,
+    )
+
+    generated = {}
+    for chunk, result in zip(missing, results):
+        if isinstance(result, Exception):
+            logger.warning("FAQ generation failed for chunk %s: %s", chunk.id[:12], result)
+            continue
+        generated[chunk.id] = [
+            p.model_dump() for p in result.pairs[:FAQ_QUESTIONS_PER_SECTION]
+        ]
+
+    if generated:
+        cache.put_many(generated)
+    pairs.update(generated)
+
+    return pairs, len(generated) == len(missing)
+
+
+# -----------------------------
+# FAQ index (question embeddings -> canonical answers)
+# -----------------------------
+def _normalize(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class FAQIndex:
+    """
+    Canonical questions embedded in an inner-product (cosine) FAISS index;
+    a query matches when its nearest question is at least the threshold.
+    """
+
+    def __init__(self, index, entries: List[Dict], complete: bool = True):
+        self.index = index
+        self.entries = entries
+        self.complete = complete
+
+    @classmethod
+    def build(cls, entries: List[Dict], embeddings, complete: bool = True) -> "FAQIndex":
+        if not entries:
+            return cls(None, [], complete)
+
+        vectors = _normalize(embeddings.embed_documents([e["question"] for e in entries]))
+        index = faiss.IndexFlatIP(vectors.shape[1])
+        index.add(vectors)
+        return cls(index, entries, complete)
+
+    def match(self, query_vector, threshold: float) -> Optional[Dict]:
+        """Best entry (with its "score") if it clears `threshold`, else None."""
+        if self.index is None or self.index.ntotal == 0:
+            return None
+
+        scores, positions = self.index.search(_normalize(query_vector), 1)
+        score, position = float(scores[0][0]), int(positions[0][0])
+
+        if position == -1 or score < threshold:
+            return None
+        return {**self.entries[position], "score": score}
+
+    def save(self, index_path: Path, entries_path: Path):
+        if self.index is not None:
+            tmp = Path(str(index_path) + ".tmp")
+            faiss.write_index(self.index, str(tmp))
+            tmp.replace(index_path)
+
+        tmp = Path(str(entries_path) + ".tmp")
+        tmp.write_text(json.dumps({"complete": self.complete, "entries": self.entries}))
+        tmp.replace(entries_path)
+
+    @classmethod
+    def load(cls, index_path: Path, entries_path: Path) -> "FAQIndex":
+        data = json.loads(Path(entries_path).read_text())
+        index = faiss.read_index(str(index_path)) if data["entries"] else None
+        return cls(index, data["entries"], data["complete"])
+
+
+def faq_entries(chunks: List[Document], pairs: Dict[str, List[Dict]]) -> List[Dict]:
+    """Flatten pairs into index entries (deduplicated by question)."""
+    entries = []
+    seen = set()
+
+    for chunk in chunks:
+        for pair in pairs.get(chunk.id, []):
+            key = pair["question"].strip().lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            entries.append({
+                "question": pair["question"],
+                "answer": pair["answer"],
+                "chunk_id": chunk.id,
+                "source": chunk.metadata.get("source"),
+                "section": chunk.metadata.get("section"),
+            })
+
+    return entries
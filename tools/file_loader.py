@@ -1,18 +1,258 @@
+import hashlib
+import logging
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
 
+from langchain_core.documents import Document
 
-KNOWLEDGE_DIR = Path("knowledge")
+from config.settings import KNOWLEDGE_PATH, KNOWLEDGE_LOADER_WORKERS
+
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_DIR = Path(KNOWLEDGE_PATH)
+
+# Extension -> format name
+FORMATS = {
+    ".txt": "text",
+    ".md": "markdown",
+    ".markdown": "markdown",
+    ".rst": "rst",
+    ".html": "html",
+    ".htm": "html",
+    ".pdf": "pdf",
+}
+
+
+class KnowledgeFile(NamedTuple):
+    path: Path
+    source: str       # path relative to the knowledge root (posix)
+    format: str
+    size: int
+    mtime_ns: int
+
+
+# -----------------------------
+# Discovery
+# -----------------------------
+def iter_knowledge_files(root: Optional[Path] = None) -> Iterator[KnowledgeFile]:
+    """
+    Walk the knowledge directory (nested folders included) in a stable,
+    sorted order. Only stat() is called; nothing is read.
+    """
+    root = Path(root or KNOWLEDGE_DIR)
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+
+        for name in sorted(filenames):
+            fmt = FORMATS.get(Path(name).suffix.lower())
+            if fmt is None or name.startswith("."):
+                continue
+
+            path = Path(dirpath) / name
+            stat = path.stat()
+            yield KnowledgeFile(
+                path=path,
+                source=path.relative_to(root).as_posix(),
+                format=fmt,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            )
+
+
+def knowledge_fingerprint() -> str:
+    """
+    Cheap change detector for the knowledge files (names, sizes, mtimes).
+    """
+    parts = [f"{f.source}:{f.size}:{f.mtime_ns}" for f in iter_knowledge_files()]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+# -----------------------------
+# Parsing (file -> text + headings)
+# -----------------------------
+_MD_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+# "3. Sick Leave" / "2.1 Carry forward" style headings of plain-text policies
+_NUMBERED_HEADING = re.compile(r"^(\d+(?:\.\d+)*)\.?\s+([A-Z][^\n.:;]{0,80})$", re.MULTILINE)
+_RST_UNDERLINE = re.compile(r"^([^\n]+)\n([=\-~^\"'`#*+]{3,})\s*$", re.MULTILINE)
+
+
+def _markdown_headings(text: str) -> List[Dict]:
+    return [
+        {"title": m.group(2), "level": len(m.group(1)), "start": m.start()}
+        for m in _MD_HEADING.finditer(text)
+    ]
+
+
+def _text_headings(text: str) -> List[Dict]:
+    headings = [
+        {"title": m.group(0).strip(), "level": m.group(1).count(".") + 1, "start": m.start()}
+        for m in _NUMBERED_HEADING.finditer(text)
+    ]
+
+    # An all-caps first line is the document title
+    first = text.lstrip().split("\n", 1)[0].strip()
+    if first and first.isupper() and len(first) <= 80:
+        headings.insert(0, {"title": first, "level": 0, "start": text.index(first)})
+
+    return headings
+
+
+def _rst_headings(text: str) -> List[Dict]:
+    levels: List[str] = []
+    headings = []
+
+    for m in _RST_UNDERLINE.finditer(text):
+        title, underline = m.group(1).strip(), m.group(2)
+        if not title or len(underline) < len(title):
+            continue
+        # RST levels follow the order in which underline styles appear
+        if underline[0] not in levels:
+            levels.append(underline[0])
+        headings.append({"title": title, "level": levels.index(underline[0]) + 1, "start": m.start()})
+
+    return headings
+
+
+class _HTMLText(HTMLParser):
+    """HTML -> text; h1-h6 become markdown headings so they survive chunking."""
+
+    SKIP = {"script", "style", "head", "nav", "footer"}
+    BLOCKS = {"p", "div", "li", "tr", "br", "section", "article", "table", "ul", "ol"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self._skip += 1
+        elif tag in {"h1", "h2", "h3", "h4", "h5", "h6"}:
+            self.parts.append("\n\n" + "#" * int(tag[1]) + " ")
+        elif tag in self.BLOCKS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self._skip = max(0, self._skip - 1)
+        elif tag in {"h1", "h2", "h3", "h4", "h5", "h6"}:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        text = re.sub(r"[ \t]+", " ", "".join(self.parts))
+        text = re.sub(r" *\n *", "\n", text)
+        return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _read_html(path: Path) -> str:
+    parser = _HTMLText()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        # Fed in blocks: large pages are never held twice
+        for block in iter(lambda: f.read(1 << 16), ""):
+            parser.feed(block)
+    parser.close()
+    return parser.text()
+
+
+def _read_pdf(path: Path) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError as e:
+        raise ValueError("PDF support needs the 'pypdf' package") from e
+
+    return "\n\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+
+
+def parse_knowledge_file(file: KnowledgeFile) -> Document:
+    """
+    Read and parse one knowledge file.
+
+    metadata: source, path, format, size, mtime_ns and headings
+    ([{"title", "level", "start"}], start = character offset in the text).
+    """
+    if file.format == "html":
+        text = _read_html(file.path)
+    elif file.format == "pdf":
+        text = _read_pdf(file.path)
+    else:
+        text = file.path.read_text(encoding="utf-8")
+
+    if file.format in ("markdown", "html"):
+        headings = _markdown_headings(text)
+    elif file.format == "rst":
+        headings = _rst_headings(text)
+    else:
+        headings = _text_headings(text)
+
+    return Document(
+        page_content=text,
+        metadata={
+            "source": file.source,
+            "path": str(file.path),
+            "format": file.format,
+            "size": file.size,
+            "mtime_ns": file.mtime_ns,
+            "headings": headings,
+        },
+    )
+
+
+# -----------------------------
+# Streaming loader
+# -----------------------------
+def iter_knowledge_documents(
+    files: Optional[Iterable[KnowledgeFile]] = None,
+    workers: int = KNOWLEDGE_LOADER_WORKERS,
+) -> Iterator[Document]:
+    """
+    Stream parsed knowledge documents in discovery order.
+
+    Files are parsed by a thread pool with a bounded look-ahead window, so
+    only a few documents are in memory at any time however large the
+    corpus. Files that cannot be parsed are logged and skipped.
+    """
+    files = iter_knowledge_files() if files is None else iter(files)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = deque()
+
+        for file in files:
+            pending.append((file, pool.submit(parse_knowledge_file, file)))
+            if len(pending) >= workers * 2:
+                yield from _collect(pending.popleft())
+
+        while pending:
+            yield from _collect(pending.popleft())
+
+
+def _collect(item) -> Iterator[Document]:
+    file, future = item
+    try:
+        yield future.result()
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        logger.warning("Skipping knowledge file %s: %s", file.source, e)
 
 
 def load_knowledge_files() -> List[str]:
     """
     Load all HR policy and company rule documents.
     """
-    documents = []
+    return [doc.page_content for doc in iter_knowledge_documents()]
 
-    for file_path in KNOWLEDGE_DIR.glob("*"):
-        if file_path.suffix in [".txt", ".md"]:
-            documents.append(file_path.read_text(encoding="utf-8"))
 
-    return documents
\ No newline at end of file
+def load_knowledge_sources() -> Dict[str, str]:
+    """
+    Load all knowledge documents keyed by source path (sorted).
+    """
+    return {doc.metadata["source"]: doc.page_content for doc in iter_knowledge_documents()}
@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import tools.vector_tool as vector_tool
+from tools.file_loader import knowledge_fingerprint
+from config.settings import INDEX_RELOAD_INTERVAL_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+# Recent reload events kept for stats()
+_MAX_EVENTS = 50
+
+
+class IndexReloader:
+    """
+    Keeps the served knowledge index in line with the knowledge files.
+
+    A daemon thread polls knowledge_fingerprint() (names, sizes, mtimes).
+    On a change the next index version is built in that thread while
+    queries keep reading the current one, then swapped in atomically
+    (vector_tool.refresh_index). The first poll warms the index, so no
+    query pays the initial build either.
+
+    Every rebuild produces an event:
+        {
+            "event": "swap" | "unchanged" | "failed",
+            "from_version": <version> | None,
+            "to_version": <version> | None,
+            "rebuild_seconds": float,
+            "at": <unix time>,
+            "error": <message>,          # failed only
+        }
+    Events are logged, passed to `on_event` and summarized by stats().
+    """
+
+    def __init__(
+        self,
+        interval: float = INDEX_RELOAD_INTERVAL_SECONDS,
+        on_event: Optional[Callable[[Dict], None]] = None,
+    ):
+        self.interval = interval
+        self.on_event = on_event
+        self.events: deque = deque(maxlen=_MAX_EVENTS)
+        self._fingerprint: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counts = {"checks": 0, "rebuilds": 0, "swaps": 0, "failures": 0}
+
+    def check_once(self) -> Optional[Dict]:
+        """Poll once; rebuild and swap if the knowledge files changed."""
+        self._counts["checks"] += 1
+
+        fingerprint = knowledge_fingerprint()
+        if fingerprint == self._fingerprint:
+            return None
+
+        current = vector_tool._active
+        started = time.perf_counter()
+        event = {
+            "from_version": current.version if current else None,
+            "to_version": None,
+            "at": time.time(),
+        }
+
+        try:
+            previous, active = vector_tool.refresh_index()
+        except Exception as e:
+            # Keep serving the old index; the next poll retries
+            event.update(event="failed", error=str(e))
+            self._counts["failures"] += 1
+            logger.exception("Knowledge index rebuild failed")
+        else:
+            self._fingerprint = fingerprint
+            swapped = previous is not active
+            event.update(
+                event="swap" if swapped else "unchanged",
+                from_version=previous.version if previous else None,
+                to_version=active.version,
+            )
+            self._counts["rebuilds"] += 1
+            self._counts["swaps"] += int(swapped)
+
+        event["rebuild_seconds"] = round(time.perf_counter() - started, 4)
+        self._report(event)
+        return event
+
+    def _report(self, event: Dict):
+        self.events.append(event)
+
+        if event["event"] == "swap":
+            logger.info(
+                "Knowledge index swapped %s -> %s (rebuild %.3fs)",
+                event["from_version"], event["to_version"], event["rebuild_seconds"],
+            )
+
+        if self.on_event is not None:
+            self.on_event(event)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check_once()
+            self._stop.wait(self.interval)
+
+    def start(self) -> "IndexReloader":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="index-reloader", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict:
+        rebuilds: List[float] = [
+            e["rebuild_seconds"] for e in self.events if e["event"] != "failed"
+        ]
+        current = vector_tool._active
+
+        return {
+            **self._counts,
+            "index_version": current.version if current else None,
+            "last_rebuild_seconds": rebuilds[-1] if rebuilds else None,
+            "max_rebuild_seconds": max(rebuilds) if rebuilds else None,
+            "last_event": self.events[-1] if self.events else None,
+        }
+
+
+_reloader: Optional[IndexReloader] = None
+
+
+def start_index_reloader(**kwargs) -> IndexReloader:
+    """Start the process-wide reloader (idempotent)."""
+    global _reloader
+
+    if _reloader is None:
+        _reloader = IndexReloader(**kwargs)
+    return _reloader.start()
+
+
+def stop_index_reloader():
+    if _reloader is not None:
+        _reloader.stop()
+
+
+def get_reload_stats() -> Dict:
+    return _reloader.stats() if _reloader is not None else {}
@@ -0,0 +1,106 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Used when the supervisor LLM is unavailable: keyword rules, first match
+# wins. Deliberately conservative; anything unclear becomes "unknown".
+_RULES: List[Tuple[str, str, re.Pattern]] = [
+    ("greeting", "query", re.compile(r"^\s*(hi+|hello+|hey+|good (morning|afternoon|evening))\b[\s!.]*$")),
+    ("create_employee", "start", re.compile(r"\b(add|create|register|onboard)\b.*\bemployee\b|\bnew employee\b")),
+    ("monthly_report", "query", re.compile(r"\bmonthly\b|\bthis month\b|\bmonth report\b")),
+    ("attendance_summary", "query", re.compile(r"\bsummary\b|\bhow many (employees|people)\b")),
+    ("working_hours_report", "query", re.compile(r"\b(working )?hours\b.*\b(of|for|worked)\b|\bhours worked\b")),
+    ("daily_report", "query", re.compile(r"\b(daily )?report\b")),
+    ("attendance_range", "start", re.compile(r"\bfrom\b.*\bto\b|\b\d{1,2}(:\d{2})?\s*(am|pm)?\s*(-|to|till|until)\s*\d{1,2}")),
+    ("attendance_end", "start", re.compile(r"\b(ended|end(ed)? work|finished|left|logged out|check(ed)? out|stopped)\b")),
+    ("attendance_start", "start", re.compile(r"\b(started|start(ed)? work|came in|arrived|logged in|check(ed)? in|began)\b")),
+    ("employee_find_all", "query", re.compile(r"\b(all|list)\b.*\bemployees\b")),
+    ("find_employee", "query", re.compile(r"\b(find|search|who is|details of|look ?up)\b")),
+    ("hr_policy", "query", re.compile(r"\b(policy|policies|leave|leaves|holiday|holidays|wfh|work from home|rule|rules|dress|notice period|probation|salary|payroll)\b")),
+]
+
+_CONFIRM = re.compile(r"^\s*(yes|yeah|yep|sure|ok(ay)?|confirm|go ahead|do it|update it)\b")
+_CANCEL = re.compile(r"^\s*(no|nope|cancel|stop|don't|do not)\b")
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_ID = re.compile(r"\b(?:id|employee|emp)\s*#?\s*(\d+)\b")
+_TIME = re.compile(r"\b(\d{1,2}(?::\d{2})?\s*(?:am|pm)?)(?=\s|$|[,.!?])")
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*"
+_DATE = re.compile(rf"\b(today|yesterday|\d{{4}}-\d{{2}}-\d{{2}}|\d{{1,2}}\s+{_MONTH}|{_MONTH}\s+\d{{1,2}})\b")
+_NAME_BEFORE_VERB = re.compile(
+    r"^\s*([a-z][a-z' -]{1,40}?)\s+(?:has\s+|have\s+)?(?:start(?:ed)?|end(?:ed)?|finish(?:ed)?|left|came in|arrived|work(?:ed)?|check(?:ed)? (?:in|out))\b"
+)
+_NAME_AFTER = re.compile(r"\b(?:of|for|by|named|called|employee)\s+(?!(?:named|called)\b)([a-z][a-z'-]+(?:\s+(?!(?:on|at|in|from|to|for|and|as|with)\b)[a-z][a-z'-]+)?)\b")
+_ROLE = re.compile(r"\b(?:role|as(?: an?)?)\s+([a-z][a-z ]{1,30}?)(?:$|[,.])")
+
+_NOT_NAMES = {
+    "i", "we", "he", "she", "they", "employee", "employees", "everyone", "today",
+    "yesterday", "this month", "the month", "all", "work", "the", "me",
+}
+
+
+def _entities(text: str, intent: str) -> Dict[str, Any]:
+    entities: Dict[str, Any] = {}
+
+    email = _EMAIL.search(text)
+    if email:
+        entities["email"] = email.group(0)
+        text = text.replace(email.group(0), " ")
+
+    emp_id = _ID.search(text)
+    if emp_id:
+        entities["employee_id"] = int(emp_id.group(1))
+
+    date = _DATE.search(text)
+    if date and not (intent == "monthly_report" and date.group(1) == "today"):
+        entities["date"] = date.group(1)
+    text = _DATE.sub(" ", text)
+
+    name = _NAME_AFTER.search(text)
+    if intent.startswith("attendance_"):
+        name = _NAME_BEFORE_VERB.search(text) or name
+    if name and name.group(1).strip() not in _NOT_NAMES and not name.group(1).strip().isdigit():
+        entities["name"] = name.group(1).strip()
+
+    if intent in ["attendance_start", "attendance_end", "attendance_range"]:
+        times = [t.strip() for t in _TIME.findall(text) if t.strip()]
+        times = [t for t in times if not (emp_id and t == emp_id.group(1))]
+        if intent == "attendance_range" and len(times) >= 2:
+            entities["start_time"], entities["end_time"] = times[0], times[1]
+        elif times:
+            entities["time"] = times[0]
+
+    if intent == "create_employee":
+        role = _ROLE.search(text)
+        if role:
+            entities["role"] = role.group(1).strip()
+
+    if intent == "hr_policy":
+        entities = {}
+
+    return entities
+
+
+def classify_by_rules(text: str, previous_intent: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Supervisor-shaped classification ({intent, action, entities,
+    confidence, tasks}) from keyword rules, for when the LLM is down.
+    """
+    lowered = text.lower().strip()
+
+    if previous_intent and _CONFIRM.search(lowered):
+        return {"intent": previous_intent, "action": "confirm", "entities": {}, "confidence": 0.5, "tasks": []}
+    if previous_intent and _CANCEL.search(lowered):
+        return {"intent": "unknown", "action": "cancel", "entities": {}, "confidence": 0.5, "tasks": []}
+
+    for intent, action, pattern in _RULES:
+        if pattern.search(lowered):
+            return {
+                "intent": intent,
+                "action": action,
+                "entities": _entities(lowered, intent),
+                "confidence": 0.5,
+                "tasks": [],
+            }
+
+    return {"intent": "unknown", "action": "query", "entities": {}, "confidence": 0.0, "tasks": []}
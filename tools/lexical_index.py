@@ -0,0 +1,138 @@
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from config.settings import BM25_K1, BM25_B
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does",
+    "for", "from", "get", "how", "i", "in", "is", "it", "many", "of", "on",
+    "or", "our", "the", "their", "there", "to", "we", "what", "when",
+    "which", "who", "with", "you", "your",
+}
+
+# Short forms employees actually type
+ABBREVIATIONS = {
+    "wfh": "work from home",
+    "pto": "paid leave",
+    "ooo": "out of office",
+}
+
+
+def _stem(word: str) -> str:
+    # Plural folding is enough for policy text ("leaves" -> "leave")
+    if len(word) > 3 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        for part in ABBREVIATIONS.get(word, word).split():
+            if part not in STOPWORDS:
+                tokens.append(_stem(part))
+    return tokens
+
+
+class BM25Index:
+    """
+    Compact inverted index over knowledge chunks with Okapi BM25 scoring.
+
+    postings: term -> [[doc_index, term_frequency], ...]
+    Only the postings of the query terms are visited, so a search costs
+    microseconds for a corpus of this size.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids: List[str] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[List[int]]] = {}
+        self.avg_length = 0.0
+
+    @classmethod
+    def build(cls, docs: Dict[str, str], **kwargs) -> "BM25Index":
+        index = cls(**kwargs)
+
+        for doc_index, (doc_id, text) in enumerate(sorted(docs.items())):
+            terms = tokenize(text)
+            index.doc_ids.append(doc_id)
+            index.doc_lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                index.postings.setdefault(term, []).append([doc_index, tf])
+
+        if index.doc_lengths:
+            index.avg_length = sum(index.doc_lengths) / len(index.doc_lengths)
+        return index
+
+    def _idf(self, term: str) -> float:
+        n = len(self.postings.get(term, []))
+        total = len(self.doc_ids)
+        return math.log(1 + (total - n + 0.5) / (n + 0.5))
+
+    def search(self, query: str, k: int = 4) -> List[Tuple[str, float, float]]:
+        """
+        Returns [(doc_id, bm25_score, coverage)], best first.
+        coverage = share of distinct query terms found in the document.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self.doc_ids:
+            return []
+
+        scores: Dict[int, float] = {}
+        matched: Dict[int, int] = {}
+
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+
+            idf = self._idf(term)
+            for doc_index, tf in postings:
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.doc_lengths[doc_index] / self.avg_length
+                )
+                scores[doc_index] = scores.get(doc_index, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+                matched[doc_index] = matched.get(doc_index, 0) + 1
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            (self.doc_ids[i], score, matched[i] / len(terms))
+            for i, score in ranked
+        ]
+
+    # -----------------------------
+    # Persistence (stored next to the FAISS index)
+    # -----------------------------
+    def save(self, path: Path):
+        data = {
+            "k1": self.k1,
+            "b": self.b,
+            "doc_ids": self.doc_ids,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+        tmp = Path(str(path) + ".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        data = json.loads(Path(path).read_text())
+        index = cls(k1=data["k1"], b=data["b"])
+        index.doc_ids = data["doc_ids"]
+        index.doc_lengths = data["doc_lengths"]
+        index.postings = data["postings"]
+        if index.doc_lengths:
+            index.avg_length = sum(index.doc_lengths) / len(index.doc_lengths)
+        return index
@@ -0,0 +1,49 @@
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from config.settings import (
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    LLM_CASSETTE_MODE,
+    LLM_CASSETTE_ON_MISS,
+    LLM_CASSETTE_PATH,
+    LLM_RESILIENCE,
+    LLM_TIMEOUT_SECONDS,
+)
+
+
+def create_chat_model(
+    model: str = LLM_MODEL,
+    temperature: float = LLM_TEMPERATURE,
+    mode: str = LLM_CASSETTE_MODE,
+    resilient: bool = LLM_RESILIENCE,
+) -> BaseChatModel:
+    """
+    Chat model used by the agents: ChatOpenAI, bounded by the resilience
+    layer (tools/llm_resilience.py) and, in "record" / "replay" mode,
+    behind the response cassette (tools/llm_cassette.py). Cassette
+    replays never touch the resilience layer.
+    """
+    from langchain_openai import ChatOpenAI
+
+    if resilient:
+        from tools.llm_resilience import ResilientChatModel
+
+        # Retries and deadlines are ours; the client only bounds one request
+        llm = ResilientChatModel(
+            inner=ChatOpenAI(model=model, temperature=temperature, timeout=LLM_TIMEOUT_SECONDS, max_retries=0),
+            name=model,
+        )
+    else:
+        llm = ChatOpenAI(model=model, temperature=temperature)
+
+    if mode == "passthrough":
+        return llm
+
+    from tools.llm_cassette import CassetteChatModel
+
+    return CassetteChatModel(
+        inner=llm,
+        mode=mode,
+        on_miss=LLM_CASSETTE_ON_MISS,
+        path=LLM_CASSETTE_PATH,
+    )
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict, PrivateAttr
+
+from config.settings import LLM_CASSETTE_PATH
+
+
+MODES = ("passthrough", "record", "replay")
+MISS_POLICIES = ("error", "live")
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded response for a request."""
+
+
+def request_key(model: Dict[str, Any], messages: List[BaseMessage], params: Dict[str, Any]) -> str:
+    """sha256 over the model parameters, the messages and the call parameters."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": [message_to_dict(m) for m in messages],
+            "params": params,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Chat model wrapper that records responses and replays them.
+
+    - record       call the wrapped model and store the response
+    - replay       serve stored responses without calling the model; a
+                   miss raises CassetteMiss, or with on_miss="live" calls
+                   the model and records the answer (a persistent
+                   response cache for identical prompts)
+    - passthrough  plain live calls
+
+    Responses are stored in SQLite keyed by request_key(): the wrapped
+    model's identifying parameters (model name, temperature, ...), the
+    messages and the call parameters (stop words, bound kwargs).
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    mode: str = "replay"
+    on_miss: str = "error"
+    path: str = LLM_CASSETTE_PATH
+
+    _conn: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _stats: Dict[str, int] = PrivateAttr(default_factory=lambda: {"hits": 0, "misses": 0, "recorded": 0})
+
+    def model_post_init(self, __context):
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {self.mode}")
+        if self.on_miss not in MISS_POLICIES:
+            raise ValueError(f"Unknown cassette miss policy: {self.on_miss}")
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cassette-{self.inner._llm_type}"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {**self.inner._identifying_params, "cassette_mode": self.mode}
+
+    # -----------------------------
+    # Storage
+    # -----------------------------
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cassette on first use (caller holds the lock)."""
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(
+                """
+                PRAGMA journal_mode=WAL;
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    recorded_at REAL NOT NULL
+                ) WITHOUT ROWID;
+                """
+            )
+        return self._conn
+
+    def _load(self, key: str) -> Optional[ChatResult]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        data = json.loads(row[0])
+        messages = messages_from_dict(data["generations"])
+        return ChatResult(
+            generations=[ChatGeneration(message=m) for m in messages],
+            llm_output={**(data.get("llm_output") or {}), "cassette": "replay"},
+        )
+
+    def _save(self, key: str, result: ChatResult):
+        data = {
+            "generations": [message_to_dict(g.message) for g in result.generations],
+            "llm_output": result.llm_output,
+        }
+        model = self.inner._identifying_params.get("model_name") or self.inner._llm_type
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, recorded_at) VALUES (?, ?, ?, ?)",
+                (key, model, json.dumps(data, default=str), time.time()),
+            )
+            conn.commit()
+            self._stats["recorded"] += 1
+
+    # -----------------------------
+    # Chat model interface
+    # -----------------------------
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.mode == "passthrough":
+            return self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        key = request_key(self.inner._identifying_params, messages, {"stop": stop, **kwargs})
+
+        if self.mode == "replay":
+            result = self._load(key)
+            with self._lock:
+                self._stats["hits" if result is not None else "misses"] += 1
+            if result is not None:
+                return result
+            if self.on_miss == "error":
+                raise CassetteMiss(f"No recorded response for request {key[:12]}")
+
+        result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        self._save(key, result)
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = (
+                self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            )
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,281 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from pydantic import ConfigDict, PrivateAttr
+
+from config.settings import (
+    LLM_TIMEOUT_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_RETRY_BASE_DELAY,
+    LLM_RETRY_MAX_DELAY,
+    LLM_CIRCUIT_FAILURES,
+    LLM_CIRCUIT_RESET_SECONDS,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+)
+
+
+class LLMUnavailable(RuntimeError):
+    """
+    The model could not answer: deadline passed, retries exhausted or the
+    circuit is open. Agents catch it and answer deterministically.
+    """
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason   # "circuit_open" | "timeout" | "error"
+
+
+# Attempts run on these threads so a hung request cannot block the turn
+# past its deadline (the thread itself ends with the client's timeout)
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection errors, rate limits and server errors."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    try:
+        import openai
+
+        if isinstance(error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)):
+            return True
+    except ImportError:
+        pass
+
+    status = getattr(error, "status_code", None)
+    return status == 429 or (isinstance(status, int) and status >= 500)
+
+
+def backoff_delay(attempt: int, base: float = LLM_RETRY_BASE_DELAY, cap: float = LLM_RETRY_MAX_DELAY) -> float:
+    """Exponential backoff with full jitter (attempt 1 = first retry)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker.
+
+    closed     calls go through; `failures` failed calls in a row open it
+    open       calls fail fast until `reset_seconds` have passed
+    half-open  one trial call: success closes, failure opens again
+    """
+
+    def __init__(self, failures: int = LLM_CIRCUIT_FAILURES, reset_seconds: float = LLM_CIRCUIT_RESET_SECONDS):
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self._consecutive = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def release(self):
+        """End a half-open trial without a verdict (the call itself was bad)."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._consecutive += 1
+            if self._trial_running or self._consecutive >= self.failures:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+# One breaker per model: every agent using it shares the outage
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker()
+        return _breakers[name]
+
+
+class ResilientChatModel(BaseChatModel):
+    """
+    Chat model wrapper bounding every call:
+
+    - deadline     the whole call (every attempt and backoff) gets at
+                   most `timeout` seconds
+    - retries      up to `max_retries` more attempts on retryable errors,
+                   after exponential backoff with full jitter, while the
+                   deadline leaves room for them
+    - breaker      a per-model circuit breaker fails fast while the model
+                   keeps failing
+    - hedging      with `hedge_percentile` set, a duplicate request is sent
+                   when the first has taken longer than that percentile of
+                   recent latencies; the first answer wins
+
+    Failures surface as LLMUnavailable; non-retryable errors (bad request,
+    authentication) are raised unchanged.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    name: str = "llm"
+    timeout: float = LLM_TIMEOUT_SECONDS
+    max_retries: int = LLM_MAX_RETRIES
+    hedge_percentile: Optional[float] = LLM_HEDGE_PERCENTILE
+    hedge_min_samples: int = LLM_HEDGE_MIN_SAMPLES
+
+    _latencies: deque = PrivateAttr(default_factory=lambda: deque(maxlen=200))
+    _stats: Dict[str, int] = PrivateAttr(
+        default_factory=lambda: {"calls": 0, "retries": 0, "timeouts": 0, "hedged": 0, "hedge_wins": 0, "fast_failures": 0}
+    )
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return self.inner._llm_type
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return self.inner._identifying_params
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return get_breaker(self.name)
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def hedge_delay(self) -> Optional[float]:
+        """Latency percentile after which a duplicate request is sent."""
+        if self.hedge_percentile is None:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(self.hedge_percentile * len(ordered)))]
+
+    def _attempt(self, messages: List[BaseMessage], stop, kwargs, deadline: float) -> ChatResult:
+        started = time.monotonic()
+
+        def call():
+            return self.inner._generate(messages, stop=stop, **kwargs)
+
+        primary = _executor.submit(call)
+        pending = {primary}
+        hedge_after = self.hedge_delay()
+        hedge_due = started + hedge_after if hedge_after is not None else None
+        last_error: Optional[BaseException] = None
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            until = deadline if hedge_due is None else min(deadline, hedge_due)
+            done, pending = wait(pending, timeout=until - now, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    with self._lock:
+                        self._latencies.append(time.monotonic() - started)
+                    if future is not primary:
+                        self._count("hedge_wins")
+                    return future.result()
+                last_error = future.exception()
+
+            if pending and hedge_due is not None and time.monotonic() >= hedge_due:
+                hedge_due = None
+                self._count("hedged")
+                pending.add(_executor.submit(call))
+
+        if not pending and last_error is not None:
+            raise last_error
+
+        self._count("timeouts")
+        raise TimeoutError(f"{self.name}: no response within the {self.timeout:.1f}s deadline")
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self._count("calls")
+        breaker = self.breaker
+
+        if not breaker.allow():
+            self._count("fast_failures")
+            raise LLMUnavailable("circuit_open", f"{self.name}: circuit open, not calling the model")
+
+        # One deadline for the whole call: retries share what is left of it
+        deadline = time.monotonic() + self.timeout
+        error: Optional[BaseException] = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = backoff_delay(attempt)
+                if time.monotonic() + delay >= deadline:
+                    break
+                self._count("retries")
+                time.sleep(delay)
+
+            try:
+                result = self._attempt(messages, stop, kwargs, deadline)
+            except Exception as e:
+                if not is_retryable(e):
+                    # The request itself is wrong; says nothing about the model
+                    breaker.release()
+                    raise
+                error = e
+                continue
+
+            breaker.record_success()
+            return result
+
+        breaker.record_failure()
+        reason = "timeout" if isinstance(error, TimeoutError) else "error"
+        raise LLMUnavailable(reason, f"{self.name}: {type(error).__name__}: {error}") from error
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["circuit"] = self.breaker.state
+        stats["hedge_delay"] = self.hedge_delay()
+        return stats
@@ -0,0 +1,199 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import ConfigDict
+
+from config.settings import (
+    LLM_TIERS,
+    LLM_TASK_TIERS,
+    LLM_DEFAULT_TIER,
+    LLM_PARSE_FALLBACK_TIER,
+)
+from utils.helpers import count_tokens
+
+
+logger = logging.getLogger(__name__)
+
+
+def tier_for(task: str) -> str:
+    """Tier configured for an agent task (LLM_TASK_TIERS)."""
+    tier = LLM_TASK_TIERS.get(task, LLM_DEFAULT_TIER)
+    if tier not in LLM_TIERS:
+        raise ValueError(f"Task {task} uses unknown LLM tier: {tier}")
+    return tier
+
+
+def task_model(task: str) -> str:
+    """Model name a task runs on."""
+    return LLM_TIERS[tier_for(task)]["model"]
+
+
+# -----------------------------
+# Per-tier metrics
+# -----------------------------
+class TierMetrics:
+    """Calls, errors, parse fallbacks, latency and tokens of one tier."""
+
+    def __init__(self, tier: str):
+        self.tier = tier
+        self.calls = 0
+        self.errors = 0
+        self.parse_fallbacks = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._latencies = deque(maxlen=1000)
+        self._lock = threading.Lock()
+
+    def record_call(self, seconds: float, input_tokens: int, output_tokens: int):
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self._latencies.append(seconds)
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_parse_fallback(self):
+        with self._lock:
+            self.parse_fallbacks += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            ordered = sorted(self._latencies)
+            stats = {
+                "model": LLM_TIERS.get(self.tier, {}).get("model"),
+                "calls": self.calls,
+                "errors": self.errors,
+                "parse_fallbacks": self.parse_fallbacks,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+            }
+
+        def ms(q: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2) if ordered else 0.0
+
+        stats.update({"p50_ms": ms(0.50), "p95_ms": ms(0.95), "max_ms": ms(1.0)})
+        return stats
+
+
+_metrics: Dict[str, TierMetrics] = {}
+_models: Dict[str, BaseChatModel] = {}
+_lock = threading.Lock()
+
+
+def tier_metrics(tier: str) -> TierMetrics:
+    with _lock:
+        if tier not in _metrics:
+            _metrics[tier] = TierMetrics(tier)
+        return _metrics[tier]
+
+
+def tier_stats() -> Dict[str, Dict]:
+    """Metrics of every tier used so far, by tier name."""
+    with _lock:
+        tiers = list(_metrics)
+    return {tier: tier_metrics(tier).stats() for tier in tiers}
+
+
+def reset_tier_stats():
+    with _lock:
+        _metrics.clear()
+
+
+class MeteredChatModel(BaseChatModel):
+    """
+    Chat model wrapper recording latency and token usage per tier.
+    Provider usage is used when reported, tiktoken counts otherwise.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseChatModel
+    tier: str
+
+    @property
+    def _llm_type(self) -> str:
+        return self.inner._llm_type
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return self.inner._identifying_params
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        metrics = tier_metrics(self.tier)
+        started = time.perf_counter()
+
+        try:
+            result = self.inner._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        except Exception:
+            metrics.record_error()
+            raise
+
+        usage = getattr(result.generations[0].message, "usage_metadata", None) if result.generations else None
+        if usage:
+            input_tokens, output_tokens = usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+        else:
+            input_tokens = sum(count_tokens(str(m.content)) for m in messages)
+            output_tokens = sum(count_tokens(str(g.message.content)) for g in result.generations)
+
+        metrics.record_call(time.perf_counter() - started, input_tokens, output_tokens)
+        return result
+
+
+# -----------------------------
+# Models per task
+# -----------------------------
+def get_tier_llm(tier: str) -> BaseChatModel:
+    """One shared model per tier (shared breaker, cassette and metrics)."""
+    from tools.llm import create_chat_model
+
+    with _lock:
+        if tier not in _models:
+            config = LLM_TIERS[tier]
+            _models[tier] = MeteredChatModel(
+                inner=create_chat_model(config["model"], config["temperature"]),
+                tier=tier,
+            )
+        return _models[tier]
+
+
+def get_llm(task: str) -> BaseChatModel:
+    """Chat model for an agent task, e.g. get_llm("attendance.polish")."""
+    return get_tier_llm(tier_for(task))
+
+
+def with_parse_fallback(build: Callable[[Any], Runnable], llm: Any, task: str) -> Runnable:
+    """
+    `build(llm)` (a prompt | llm | parser chain), retried with the
+    LLM_PARSE_FALLBACK_TIER model when its output does not parse. Tasks
+    already on that tier get the plain chain.
+    """
+    tier = tier_for(task)
+    if tier == LLM_PARSE_FALLBACK_TIER:
+        return build(llm)
+
+    def note_fallback(value):
+        tier_metrics(tier).record_parse_fallback()
+        logger.info("Output of %s did not parse on tier %s; retrying on %s", task, tier, LLM_PARSE_FALLBACK_TIER)
+        return value
+
+    return build(llm).with_fallbacks(
+        [RunnableLambda(note_fallback) | build(get_tier_llm(LLM_PARSE_FALLBACK_TIER))],
+        exceptions_to_handle=(OutputParserException,),
+    )
@@ -1,98 +1,692 @@
-from typing import List
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
 from pathlib import Path
-import shutil
+import hashlib
+import json
+import math
+import logging
+import re
+import threading
 
+import faiss
+import numpy as np
 from langchain_community.vectorstores import FAISS
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.documents import Document
 
-from tools.file_loader import load_knowledge_files
+from tools.embeddings import get_embeddings, embedding_model_name, default_threshold
+from tools.file_loader import iter_knowledge_files, iter_knowledge_documents, knowledge_fingerprint
+from tools.lexical_index import BM25Index
+from tools.chunker import chunk_document, CHUNKER_VERSION, SEPARATORS
+from utils.helpers import configured_encoding_name
+from utils.tracing import traced
+from tools.chunk_store import ChunkStore, ChunkPositions, write_chunk_store
+from tools.ann_index import build_ann_index, tune_index
+from tools.faq_index import FAQIndex, FAQPairCache, generate_faq_pairs, faq_entries
+from config.settings import (
+    VECTOR_STORE_PATH as _VECTOR_STORE_PATH,
+    CHUNK_SIZE,
+    CHUNK_OVERLAP,
+    HYBRID_RETRIEVAL,
+    LEXICAL_MIN_SCORE,
+    LEXICAL_FAST_PATH_SCORE,
+    VECTOR_INDEX_TYPE,
+    EMBEDDING_BACKEND,
+    FAQ_PRECOMPUTE,
+    FAQ_MATCH_THRESHOLDS,
+)
 
 
-VECTOR_STORE_PATH = Path("vector_store/faiss_index")
+logger = logging.getLogger(__name__)
 
-_embeddings = OpenAIEmbeddings()
-_vector_store = None
+VECTOR_STORE_PATH = Path(_VECTOR_STORE_PATH)
+MANIFEST_FILE = "manifest.json"
+FAQ_PAIRS_FILE = "faq_pairs.db"
 
+# index-<version>.faiss, chunks-<version>.db, vectors-<version>.npy,
+# bm25-<version>.json, faq-<version>.faiss/.json
+VERSIONED_FILE = re.compile(r"^(?:index|chunks|vectors|bm25|faq)-([0-9a-f]+)\.(?:faiss|db|npy|json)$")
+LEGACY_FILES = ("index.faiss", "index.pkl", "bm25.json")
 
-def build_vector_store():
-    # Force rebuild: Remove existing index if it exists
-    if VECTOR_STORE_PATH.exists():
-        shutil.rmtree(VECTOR_STORE_PATH)
+# Reciprocal rank fusion constant
+RRF_K = 60
 
-    docs = load_knowledge_files()
+# Bump when the on-disk layout changes (forces a full rebuild)
+INDEX_FORMAT_VERSION = 3
+
+# Zero-copy, read-only mapping of the index file (shared page cache)
+MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+# Backend selected in settings, created on first use (not at import)
+_embeddings = None
+
+# Served index (swapped as a whole) and the lock serializing builds
+_active = None
+_build_lock = threading.RLock()
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _get_embeddings():
+    global _embeddings
+
+    if _embeddings is None:
+        _embeddings = get_embeddings()
+    return _embeddings
+
+
+def _embedding_model() -> str:
+    return getattr(_get_embeddings(), "model", None) or embedding_model_name()
 
-    if not docs:
-        raise ValueError("No knowledge documents found.")
 
-    # Rule 3: Robust Chunking (200-300 tokens)
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=300,
-        chunk_overlap=30,
-        separators=["\n## ", "\n\n", "\n", " ", ""],
-        is_separator_regex=False
+def _index_settings() -> Dict:
+    """Everything that invalidates stored vectors when changed."""
+    return {
+        "format_version": INDEX_FORMAT_VERSION,
+        "embedding_model": _embedding_model(),
+        "chunker": CHUNKER_VERSION,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "separators": SEPARATORS,
+        # The configured encoding, not the loaded one: an offline start
+        # (estimated counts) must not re-embed everything
+        "token_encoding": configured_encoding_name(),
+    }
+
+
+def _read_manifest() -> Optional[Dict]:
+    try:
+        return json.loads((VECTOR_STORE_PATH / MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(manifest: Dict):
+    tmp = VECTOR_STORE_PATH / (MANIFEST_FILE + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    tmp.replace(VECTOR_STORE_PATH / MANIFEST_FILE)
+
+
+def _store_files(version: str) -> Tuple[Path, Path]:
+    return (
+        VECTOR_STORE_PATH / f"index-{version}.faiss",
+        VECTOR_STORE_PATH / f"chunks-{version}.db",
     )
 
-    chunks = []
-    for text in docs:
-        chunks.extend(splitter.create_documents([text]))
 
-    VECTOR_STORE_PATH.mkdir(parents=True, exist_ok=True)
+def _vectors_file(version: str) -> Path:
+    return VECTOR_STORE_PATH / f"vectors-{version}.npy"
 
-    vector_store = FAISS.from_documents(chunks, _embeddings)
-    vector_store.save_local(VECTOR_STORE_PATH)
-    
-    return vector_store
 
+def _lexical_file(version: str) -> Path:
+    return VECTOR_STORE_PATH / f"bm25-{version}.json"
 
-def load_vector_store():
-    global _vector_store
-
-    if _vector_store is None:
-        if VECTOR_STORE_PATH.exists():
-            try:
-                _vector_store = FAISS.load_local(
-                    VECTOR_STORE_PATH,
-                    _embeddings,
-                    allow_dangerous_deserialization=True,
-                )
-            except Exception:
-                # If loading fails (e.g. dimensions mismatch), rebuild
-                _vector_store = build_vector_store()
+
+def _faq_files(version: str) -> Tuple[Path, Path]:
+    return (
+        VECTOR_STORE_PATH / f"faq-{version}.faiss",
+        VECTOR_STORE_PATH / f"faq-{version}.json",
+    )
+
+
+def _open_store(version: str):
+    """
+    Open a persisted index version for serving.
+
+    The FAISS index is memory-mapped read-only and chunk texts stay in the
+    SQLite chunk store, so opening is near-constant time and worker
+    processes share the same pages.
+    """
+    index_path, chunks_path = _store_files(version)
+    if not index_path.exists() or not chunks_path.exists():
+        return None
+
+    try:
+        index = faiss.read_index(str(index_path), MMAP_FLAGS)
+        tune_index(index)
+        chunks = ChunkStore(chunks_path)
+    except Exception:
+        return None
+
+    return FAISS(_get_embeddings(), index, chunks, ChunkPositions(chunks))
+
+
+def _read_rows(version: str) -> Optional[Tuple[List[Document], np.ndarray]]:
+    """
+    Chunks and their float32 vectors of a persisted version (the vectors
+    are memory-mapped); None if the version is incomplete.
+    """
+    _, chunks_path = _store_files(version)
+    try:
+        vectors = np.load(_vectors_file(version), mmap_mode="r")
+        chunks = ChunkStore(chunks_path)
+        docs = [doc for _, doc in chunks.documents()]
+        chunks.close()
+    except Exception:
+        return None
+
+    if len(docs) != len(vectors):
+        return None
+    return docs, vectors
+
+
+def _save_version(docs: List[Document], vectors: np.ndarray, version: str) -> str:
+    """
+    Write one version: the (trained) ANN index, the float32 vectors it was
+    built from (so later builds and index-type changes never re-embed) and
+    the chunk store. Returns the index factory spec.
+    """
+    index, spec = build_ann_index(vectors, VECTOR_INDEX_TYPE)
+    index_path, chunks_path = _store_files(version)
+
+    # Written under temporary names and renamed: readers that still map
+    # the previous files keep a consistent view.
+    tmp = Path(str(index_path) + ".tmp")
+    faiss.write_index(index, str(tmp))
+    tmp.replace(index_path)
+
+    tmp = Path(str(_vectors_file(version)) + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, np.ascontiguousarray(vectors, dtype=np.float32))
+    tmp.replace(_vectors_file(version))
+
+    write_chunk_store(chunks_path, ((i, doc.id, doc) for i, doc in enumerate(docs)))
+    return spec
+
+
+def _remove_stale_files(keep: Set[str]):
+    """Drop index versions other than `keep` (and the old pickle layout)."""
+    for path in VECTOR_STORE_PATH.glob("*"):
+        match = VERSIONED_FILE.match(path.name)
+        if match is None and path.name not in LEGACY_FILES:
+            continue
+
+        if match is None or match.group(1) not in keep:
+            path.unlink(missing_ok=True)
+
+
+def _plan(old_files: Dict):
+    """
+    Compare knowledge files against the manifest entries of the last build.
+    Returns (files, chunks_to_add, chunk_ids_to_delete).
+
+    Files whose size and mtime match the manifest are not read at all;
+    the others are parsed in parallel and streamed through the chunker.
+    """
+    files = {}
+    touched = []
+    for file in iter_knowledge_files():
+        previous = old_files.get(file.source)
+        if previous and (previous.get("size"), previous.get("mtime_ns")) == (file.size, file.mtime_ns):
+            files[file.source] = previous
         else:
-            _vector_store = build_vector_store()
-
-    return _vector_store
-
-
-def similarity_search(query: str, k: int = 4, threshold: float = 0.75) -> List[str]:
-    """
-    Search for relevant policy chunks with a strict similarity score threshold.
-    Returns ONLY chunks that meet the threshold (0 <= score <= 1 for cosine similarity).
-    Note: FAISS Euclidean distance might need conversion or using specific distance metric.
-    Commonly OpenAI embeddings + FAISS uses Euclidean (L2).
-    However, langchain FAISS wrapper usually normalizes vectors for cosine similarity equivalent.
-    
-    LangChain FAISS `similarity_search_with_score` returns L2 distance by default.
-    Lower is better. 
-    BUT: If using OpenAI embeddings (normalized), L2 distance = 2 * (1 - cosine_similarity).
-    So:
-    Cosine Sim = 0.7  =>  1 - 0.7 = 0.3  =>  2 * 0.3 = 0.6 (L2 Distance)
-    We want Similarity >= 0.7, so L2 Distance <= 0.6.
-    
-    Let's use `similarity_search_with_relevance_scores` which handles normalization usually.
-    LangChain FAISS implementation normalized relevance score to (0, 1].
-    """
-    store = load_vector_store()
-    
-    # relevance_score_fn is default for OpenAI/Cosine in newer langchain versions
-    results = store.similarity_search_with_relevance_scores(query, k=k)
-    
+            touched.append(file)
+
+    new_chunks = []
+    for doc in iter_knowledge_documents(touched):
+        source = doc.metadata["source"]
+        entry = {
+            "hash": _sha256(doc.page_content),
+            "size": doc.metadata["size"],
+            "mtime_ns": doc.metadata["mtime_ns"],
+        }
+        previous = old_files.get(source)
+
+        if previous and previous["hash"] == entry["hash"]:
+            # Touched but identical: keep the chunks, refresh the stat
+            files[source] = {**entry, "chunks": previous["chunks"]}
+            continue
+
+        chunks = chunk_document(doc)
+        files[source] = {**entry, "chunks": [c.id for c in chunks]}
+        new_chunks.extend(chunks)
+
+    # A file that failed to parse keeps its last indexed chunks (and stale
+    # stat, so it is parsed again next time); only files that are gone
+    # lose theirs
+    for file in touched:
+        if file.source not in files and file.source in old_files:
+            files[file.source] = old_files[file.source]
+
+    old_ids = {cid for f in old_files.values() for cid in f["chunks"]}
+    new_ids = {cid for f in files.values() for cid in f["chunks"]}
+
+    if not new_ids:
+        raise ValueError("No knowledge documents found.")
+
+    to_add = [c for c in new_chunks if c.id not in old_ids]
+    to_delete = sorted(old_ids - new_ids)
+    return dict(sorted(files.items())), to_add, to_delete
+
+
+class IndexSnapshot(NamedTuple):
+    """One immutable index version: what a query reads from start to end."""
+    store: FAISS
+    lexical: BM25Index
+    version: str
+    faq: Optional[FAQIndex] = None
+
+
+@traced("vector")
+def build_index(force: bool = False) -> IndexSnapshot:
+    """
+    Bring the index in line with the knowledge files.
+
+    Per-file and per-chunk content hashes are kept in manifest.json, so
+    only added or changed chunks are embedded and removed chunks are
+    deleted. A full rebuild happens when forced, when the index cannot be
+    loaded, or when the embedding model / chunking settings changed.
+
+    Each build is written as a new version (index-<version>.faiss +
+    vectors-<version>.npy + chunks-<version>.db + bm25-<version>.json);
+    the returned snapshot serves the memory-mapped copy. The served index
+    is not touched. The FAISS index type (VECTOR_INDEX_TYPE) is built and
+    trained from the stored vectors, so changing it never re-embeds.
+    """
+    with _build_lock:
+        manifest = None if force else _read_manifest()
+        if manifest and manifest.get("settings") != _index_settings():
+            manifest = None
+
+        old_files = manifest["files"] if manifest else {}
+        files, to_add, to_delete = _plan(old_files)
+        changed = bool(
+            manifest is None
+            or to_add
+            or to_delete
+            or manifest.get("index_type") != VECTOR_INDEX_TYPE
+        )
+
+        if not changed:
+            version = manifest["index_version"]
+            if files != old_files:
+                # Same content, new stats (e.g. a file was touched)
+                _write_manifest({**manifest, "files": files})
+
+            # Already served (and its FAQ complete): nothing to open
+            active = _active
+            if active is not None and active.version == version and (
+                not FAQ_PRECOMPUTE or (active.faq is not None and active.faq.complete)
+            ):
+                return active
+
+            store = _open_store(version)
+            if store is not None:
+                return IndexSnapshot(
+                    store,
+                    _load_lexical_index(store, version),
+                    version,
+                    _load_faq_index(store, version),
+                )
+
+        base = _read_rows(manifest["index_version"]) if manifest else None
+        if base is None and manifest is not None:
+            # Missing or unreadable files -> full rebuild
+            files, to_add, to_delete = _plan({})
+
+        docs, vectors = base or ([], None)
+        if to_delete:
+            deleted = set(to_delete)
+            keep = [i for i, doc in enumerate(docs) if doc.id not in deleted]
+            docs = [docs[i] for i in keep]
+            vectors = vectors[keep]
+
+        if to_add:
+            added = np.asarray(
+                _get_embeddings().embed_documents([c.page_content for c in to_add]),
+                dtype=np.float32,
+            )
+            docs = docs + to_add
+            vectors = added if vectors is None or not len(vectors) else np.vstack([vectors, added])
+
+        new_ids = sorted(cid for f in files.values() for cid in f["chunks"])
+        version = _sha256(
+            "\n".join([_embedding_model(), VECTOR_INDEX_TYPE] + new_ids)
+        )[:16]
+
+        VECTOR_STORE_PATH.mkdir(parents=True, exist_ok=True)
+        spec = _save_version(docs, vectors, version)
+
+        store = _open_store(version)
+        if store is None:
+            raise RuntimeError(f"Could not open index version {version}")
+        lexical = _load_lexical_index(store, version, rebuild=True)
+        faq = _load_faq_index(store, version, rebuild=True)
+
+        # Manifest last: other processes only ever see complete versions
+        _write_manifest({
+            "settings": _index_settings(),
+            "index_version": version,
+            "index_type": VECTOR_INDEX_TYPE,
+            "index_spec": spec,
+            "files": files,
+        })
+
+        # The previous version stays on disk for readers still using it
+        _remove_stale_files({version, manifest["index_version"] if manifest else version})
+
+        return IndexSnapshot(store, lexical, version, faq)
+
+
+def _load_lexical_index(store, version: str, rebuild: bool = False) -> BM25Index:
+    """The BM25 index is derived from the chunk store and saved beside it."""
+    path = _lexical_file(version)
+
+    if not rebuild:
+        try:
+            return BM25Index.load(path)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    lexical = BM25Index.build(store.docstore.texts())
+    lexical.save(path)
+    return lexical
+
+
+def _load_faq_index(store, version: str, rebuild: bool = False) -> Optional[FAQIndex]:
+    """
+    The FAQ index is rebuilt with every index version. Q&A pairs are cached
+    per chunk, so only new or edited sections reach the LLM; an incomplete
+    FAQ (failed generations) is completed on the next load.
+    """
+    if not FAQ_PRECOMPUTE:
+        return None
+
+    index_path, entries_path = _faq_files(version)
+
+    if not rebuild:
+        try:
+            faq = FAQIndex.load(index_path, entries_path)
+            if faq.complete:
+                return faq
+        except (OSError, ValueError, KeyError, RuntimeError):
+            pass
+
+    try:
+        chunks = [doc for _, doc in store.docstore.documents()]
+        pairs, complete = generate_faq_pairs(chunks, FAQPairCache(VECTOR_STORE_PATH / FAQ_PAIRS_FILE))
+        faq = FAQIndex.build(faq_entries(chunks, pairs), _get_embeddings(), complete)
+        faq.save(index_path, entries_path)
+    except Exception as e:
+        # Live generation still answers everything
+        logger.warning("FAQ index not built: %s", e)
+        return None
+
+    return faq
+
+
+def _close_snapshot(snapshot: IndexSnapshot):
+    """Release a snapshot no query can reach (its chunk store connection)."""
+    snapshot.store.docstore.close()
+
+
+def swap_index(snapshot: IndexSnapshot) -> Optional[IndexSnapshot]:
+    """
+    Make `snapshot` the served index; returns the previous one.
+    A single reference assignment, so queries see either version, never a mix.
+    """
+    global _active
+
+    previous, _active = _active, snapshot
+    return previous
+
+
+def refresh_index(force: bool = False) -> Tuple[Optional[IndexSnapshot], IndexSnapshot]:
+    """
+    Build the next index version and swap it in when its content changed.
+    Returns (previous, active).
+    """
+    with _build_lock:
+        snapshot = build_index(force=force)
+        current = _active
+
+        if current is not None and current.version == snapshot.version and not force:
+            if snapshot is not current:
+                # Opened only to complete the FAQ: keep serving the open store
+                _close_snapshot(snapshot)
+                if snapshot.faq is not None:
+                    current = current._replace(faq=snapshot.faq)
+                    swap_index(current)
+            return current, current
+
+        return swap_index(snapshot), snapshot
+
+
+def current_index() -> IndexSnapshot:
+    """The served index snapshot (built inline only on first use)."""
+    snapshot = _active
+    if snapshot is None:
+        with _build_lock:
+            snapshot = _active or refresh_index()[1]
+    return snapshot
+
+
+def index_ready() -> bool:
+    """Whether an index is being served (queries will not build one inline)."""
+    return _active is not None
+
+
+def build_vector_store(force: bool = False):
+    """Build (incrementally) and serve the index; returns the vector store."""
+    return refresh_index(force=force)[1].store
+
+
+def load_vector_store():
+    # Incremental on first use: loads the saved index and only embeds what changed
+    return current_index().store
+
+
+def get_embedding_cache_stats() -> Dict:
+    """Hit/miss counts of the embedding cache (empty for uncached backends)."""
+    embeddings = _get_embeddings()
+    return embeddings.stats() if hasattr(embeddings, "stats") else {}
+
+
+def get_index_version() -> Optional[str]:
+    """Content version of the served index (changes whenever chunks change)."""
+    return current_index().version
+
+
+def get_knowledge_version() -> str:
+    """
+    Changes whenever the index or any knowledge file changes
+    (used to invalidate cached answers).
+    """
+    return f"{get_index_version()}:{knowledge_fingerprint()}"
+
+
+@traced("vector")
+def embed_query(text: str) -> List[float]:
+    return _get_embeddings().embed_query(text)
+
+
+class QueryVectors:
+    """
+    Query embeddings of one question, computed on first use and at most
+    once per text. Shared by the answer cache, the FAQ match and the
+    vector search, so a question answered before (or without) the vector
+    search is never embedded twice, or at all.
+    """
+
+    def __init__(self):
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> np.ndarray:
+        return self.many([text])[0]
+
+    def many(self, texts: List[str]) -> np.ndarray:
+        with self._lock:
+            missing = [t for t in dict.fromkeys(texts) if t not in self._vectors]
+            if missing:
+                self._vectors.update(zip(missing, _embed_queries(missing)))
+            return np.stack([self._vectors[t] for t in texts])
+
+    def peek(self, text: str) -> Optional[np.ndarray]:
+        """The vector if it was already computed, else None (never embeds)."""
+        with self._lock:
+            return self._vectors.get(text)
+
+
+@traced("vector")
+def match_faq(
+    question: str,
+    threshold: Optional[float] = None,
+    query_vectors: Optional[QueryVectors] = None,
+) -> Optional[Dict]:
+    """
+    Canonical FAQ entry (question, answer, source, section, score) whose
+    question matches `question` with high confidence, or None.
+    `query_vectors` shares the question's vector with the other lookups.
+    """
+    faq = current_index().faq
+    if faq is None or not faq.entries:
+        # Nothing to match against: not worth an embedding
+        return None
+
+    if threshold is None:
+        threshold = FAQ_MATCH_THRESHOLDS[EMBEDDING_BACKEND]
+    vector = query_vectors.get(question) if query_vectors is not None else embed_query(question)
+    return faq.match(vector, threshold)
+
+
+def _relevance(distance: float) -> float:
+    """
+    LangChain's FAISS relevance for (squared) L2 distances on unit vectors.
+    Computed here so scores below 0 (possible with local embeddings) are
+    kept instead of triggering range warnings.
+    """
+    return 1.0 - float(distance) / math.sqrt(2)
+
+
+@traced("vector")
+def similarity_search(query: str, k: int = 4, threshold: Optional[float] = None) -> List[str]:
+    """
+    Relevant policy chunks for one query (similarity_search_batch() with a
+    single query).
+
+    With HYBRID_RETRIEVAL a confident BM25 match is answered without
+    embedding; otherwise the query vector is searched in FAISS, scored by
+    _relevance() and fused with the BM25 ranking. Chunks qualify on vector
+    relevance >= `threshold` (None = the backend's default) or a strong
+    keyword match. At most `k` chunks, best first.
+    """
+    return similarity_search_batch([query], k=k, thresholds=[threshold])[0]
+
+
+@traced("vector")
+def similarity_search_batch(
+    queries: List[str],
+    k: int = 4,
+    thresholds: Union[None, float, List[Optional[float]]] = None,
+    query_vectors: Optional[QueryVectors] = None,
+) -> List[List[str]]:
+    """
+    similarity_search for several queries at once (same rules per query).
+
+    Queries answered by the lexical fast path are not embedded; all others
+    are embedded with ONE embeddings call and searched with ONE vectorized
+    FAISS call. `thresholds` is one value for all queries or one per query
+    (None = backend default). `query_vectors` reuses (and keeps) vectors
+    computed for the same question elsewhere. Returns one chunk list per
+    query, in order.
+    """
+    # One snapshot per call: a concurrent swap cannot mix index versions
+    snapshot = current_index()
+    store = snapshot.store
+
+    if thresholds is None or isinstance(thresholds, (int, float)):
+        thresholds = [thresholds] * len(queries)
+    if len(thresholds) != len(queries):
+        raise ValueError("Expected one threshold per query.")
+    thresholds = [default_threshold() if t is None else t for t in thresholds]
+
+    answers: List[Optional[List[str]]] = [None] * len(queries)
+    lexical: List[List] = [[] for _ in queries]
+    pending = []
+
+    for i, query in enumerate(queries):
+        if HYBRID_RETRIEVAL:
+            lexical[i] = snapshot.lexical.search(query, k=k)
+
+            # Fast path: confident keyword match -> no embedding call at all
+            if lexical[i] and lexical[i][0][2] == 1.0 and lexical[i][0][1] >= LEXICAL_FAST_PATH_SCORE:
+                top_score = lexical[i][0][1]
+                answers[i] = [
+                    _chunk_text(store, chunk_id)
+                    for chunk_id, score, coverage in lexical[i]
+                    if coverage == 1.0 and score >= top_score / 2
+                ]
+                continue
+
+        pending.append(i)
+
+    if pending:
+        vectors = (query_vectors or QueryVectors()).many([queries[i] for i in pending])
+        for i, results in zip(pending, _search_vectors(store, vectors, k)):
+            answers[i] = _fuse(store, results, lexical[i], thresholds[i], k)
+
+    return answers
+
+
+@traced("vector")
+def _embed_queries(queries: List[str]) -> np.ndarray:
+    embeddings = _get_embeddings()
+    if len(queries) == 1:
+        vectors = [embeddings.embed_query(queries[0])]
+    else:
+        # One request for the whole batch
+        vectors = embeddings.embed_documents(queries)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+@traced("vector")
+def _search_vectors(store, vectors: np.ndarray, k: int) -> List[List[Tuple[Document, float]]]:
+    """One FAISS search for all query vectors -> [(doc, relevance)] per query."""
+    distances, positions = store.index.search(vectors, k)
+
+    wanted = sorted({int(p) for p in positions.ravel() if p != -1})
+    docs = store.docstore.documents_at(wanted)
+
+    return [
+        [
+            (docs[int(position)], _relevance(distance))
+            for distance, position in zip(row_distances, row_positions)
+            if position != -1 and int(position) in docs
+        ]
+        for row_distances, row_positions in zip(distances, positions)
+    ]
+
+
+@traced("vector")
+def _fuse(store, results: List[Tuple[Document, float]], lexical: List, threshold: float, k: int) -> List[str]:
     # Filter by threshold
-    # Rule 4: Apply similarity threshold (0.75 based on testing)
-    valid_chunks = []
-    for doc, score in results:
+    # Rule 4: Apply similarity threshold (0.75 for OpenAI based on testing,
+    # see RELEVANCE_THRESHOLDS for other backends)
+    if not lexical:
+        return [doc.page_content for doc, score in results if score >= threshold]
+
+    # Hybrid: a chunk qualifies on vector relevance OR a strong BM25 match;
+    # qualifying chunks are ordered by reciprocal rank fusion of both lists.
+    fused: Dict[str, float] = {}
+    texts: Dict[str, str] = {}
+    qualified = set()
+
+    for rank, (doc, score) in enumerate(results, start=1):
+        chunk_id = doc.metadata.get("chunk_id", doc.page_content)
+        fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank)
+        texts[chunk_id] = doc.page_content
         if score >= threshold:
-            valid_chunks.append(doc.page_content)
-            
-    return valid_chunks
\ No newline at end of file
+            qualified.add(chunk_id)
+
+    for rank, (chunk_id, score, coverage) in enumerate(lexical, start=1):
+        fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank)
+        if score >= LEXICAL_MIN_SCORE and coverage >= 0.5:
+            qualified.add(chunk_id)
+
+    ranked = sorted(qualified, key=lambda cid: fused[cid], reverse=True)[:k]
+    return [texts.get(cid) or _chunk_text(store, cid) for cid in ranked]
+
+
+def _chunk_text(store, chunk_id: str) -> str:
+    return store.docstore.search(chunk_id).page_content
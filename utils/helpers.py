@@ -0,0 +1,54 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from config.settings import LLM_MODEL
+
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token in English text, used when no tiktoken encoding
+# can be loaded (e.g. offline and nothing cached)
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("tiktoken encoding unavailable (%s); estimating token counts", e)
+        return None
+
+
+def configured_encoding_name(model: str = LLM_MODEL) -> str:
+    """
+    Name of the encoding count_tokens() is configured to use for `model`,
+    whether or not it can be loaded right now (no download needed).
+    """
+    try:
+        import tiktoken.model
+    except ImportError:
+        return "approx"
+
+    try:
+        return tiktoken.model.encoding_name_for_model(model)
+    except KeyError:
+        return "cl100k_base"
+
+
+def count_tokens(text: Optional[str], model: str = LLM_MODEL) -> int:
+    """Number of prompt tokens `text` costs for `model`."""
+    if not text:
+        return 0
+
+    encoding = _encoding(model)
+    if encoding is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+
+    return len(encoding.encode(text, disallowed_special=()))
@@ -0,0 +1,368 @@
+"""
+Lightweight tracing: spans with timings for graph nodes, LLM chains,
+db_tool queries and vector_tool retrieval.
+
+    tracer = enable_tracing()
+    app.invoke(...)
+    tracer.write_jsonl("trace.jsonl")
+    tracer.write_chrome_trace("trace.json")    # chrome://tracing / Perfetto
+
+Disabled (the default), a traced function costs one global lookup and
+`span()` returns a shared no-op context manager.
+"""
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from utils.helpers import count_tokens
+
+
+_tracer: Optional["Tracer"] = None
+
+# Innermost open span of the current thread / task (parent of new spans)
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "hr_trace_span", default=None
+)
+
+
+class Span:
+    __slots__ = ("span_id", "parent_id", "name", "category", "start", "end", "thread", "attrs")
+
+    def __init__(self, span_id: int, parent_id: Optional[int], name: str, category: str, attrs: Dict):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.category = category
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.thread = threading.get_ident()
+        self.attrs = attrs
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """Collects finished spans (at most `max_spans`; older ones are dropped)."""
+
+    def __init__(self, max_spans: int = 100_000):
+        self.max_spans = max_spans
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.dropped = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # perf_counter -> wall clock, for exported timestamps
+        self._epoch = time.time() - time.perf_counter()
+
+    def start(self, name: str, category: str, attrs: Dict, parent: Optional[Span] = None) -> Span:
+        parent = parent if parent is not None else _current.get()
+        return Span(
+            next(self._ids),
+            parent.span_id if parent is not None else None,
+            name,
+            category,
+            attrs,
+        )
+
+    def finish(self, span: Span):
+        span.end = time.perf_counter()
+        with self._lock:
+            if len(self.spans) == self.max_spans:
+                self.dropped += 1
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+            self.dropped = 0
+
+    # -----------------------------
+    # Export
+    # -----------------------------
+    def records(self) -> List[Dict]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+
+        return [
+            {
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "name": s.name,
+                "category": s.category,
+                "start": round(self._epoch + s.start, 6),
+                "duration_ms": round(s.duration_ms, 3),
+                "thread": s.thread,
+                "attrs": s.attrs,
+            }
+            for s in spans
+        ]
+
+    def write_jsonl(self, path: str):
+        """One span per line, in start order."""
+        with open(path, "w") as f:
+            for record in self.records():
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def chrome_trace(self) -> Dict:
+        """Trace Event Format ("complete" events), timestamps in microseconds."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": r["name"],
+                    "cat": r["category"],
+                    "ph": "X",
+                    "ts": round(r["start"] * 1e6),
+                    "dur": round(r["duration_ms"] * 1000),
+                    "pid": pid,
+                    "tid": r["thread"],
+                    "args": {**r["attrs"], "span_id": r["span_id"], "parent_id": r["parent_id"]},
+                }
+                for r in self.records()
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f, default=str)
+
+    def summary(self) -> Dict[str, Dict]:
+        """count / total_ms / max_ms per (category, name)."""
+        out: Dict[str, Dict] = {}
+        for r in self.records():
+            row = out.setdefault(f"{r['category']}:{r['name']}", {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            row["count"] += 1
+            row["total_ms"] = round(row["total_ms"] + r["duration_ms"], 3)
+            row["max_ms"] = max(row["max_ms"], r["duration_ms"])
+        return out
+
+
+def enable_tracing(tracer: Optional[Tracer] = None) -> Tracer:
+    """
+    Start tracing. LLM spans come from a LangChain callback handler set in
+    the current context, so they cover runs started from it (LangChain and
+    LangGraph copy the context into their worker threads).
+    """
+    global _tracer, _handler_token
+    _tracer = tracer or Tracer()
+    if _handler_token is None:
+        _handler_token = _llm_handler.set(_LLM_HANDLER)
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """Stop tracing; returns the tracer with what it collected."""
+    global _tracer, _handler_token
+    tracer, _tracer = _tracer, None
+    if _handler_token is not None:
+        try:
+            _llm_handler.reset(_handler_token)
+        except ValueError:
+            # Disabled from another context than the one that enabled it
+            _llm_handler.set(None)
+        _handler_token = None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    return _tracer
+
+
+# -----------------------------
+# Spans
+# -----------------------------
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: Tracer, span: Span):
+        self.tracer = tracer
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self.token)
+        if exc_type is not None:
+            self.span.attrs["error"] = exc_type.__name__
+        self.tracer.finish(self.span)
+        return False
+
+
+def span(name: str, category: str = "app", **attrs):
+    """Context manager timing a block (no-op while tracing is disabled)."""
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    return _SpanContext(tracer, tracer.start(name, category, attrs))
+
+
+def traced(category: str, name: Optional[str] = None) -> Callable:
+    """Decorator: run the function inside a span named `module.function`."""
+
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with _SpanContext(tracer, tracer.start(span_name, category, {})):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def trace_node(name: str, node: Callable) -> Callable:
+    """Wrap a graph node in a "node" span (used by build_workflow)."""
+
+    @functools.wraps(node)
+    def wrapper(state, *args, **kwargs):
+        tracer = _tracer
+        if tracer is None:
+            return node(state, *args, **kwargs)
+        attrs = {"intent": state.get("intent")} if isinstance(state, dict) else {}
+        with _SpanContext(tracer, tracer.start(name, "node", attrs)):
+            return node(state, *args, **kwargs)
+
+    return wrapper
+
+
+# -----------------------------
+# LLM chains (LangChain callbacks)
+# -----------------------------
+def _usage(response) -> Optional[Dict[str, int]]:
+    """Token usage reported by the provider, if any."""
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    if token_usage.get("total_tokens"):
+        return {
+            "input_tokens": token_usage.get("prompt_tokens", 0),
+            "output_tokens": token_usage.get("completion_tokens", 0),
+        }
+
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                return {
+                    "input_tokens": metadata.get("input_tokens", 0),
+                    "output_tokens": metadata.get("output_tokens", 0),
+                }
+    return None
+
+
+class _LLMSpanHandler(BaseCallbackHandler):
+    """
+    Opens a "chain" span per prompt | llm sequence and an "llm" span per
+    model call, with token counts (provider usage, else tiktoken estimate).
+    """
+
+    def __init__(self):
+        self._open: Dict[UUID, Span] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], name: str, category: str, attrs: Dict):
+        tracer = _tracer
+        if tracer is None:
+            return
+        with self._lock:
+            parent = self._open.get(parent_run_id) if parent_run_id else None
+            self._open[run_id] = tracer.start(name, category, attrs, parent=parent)
+
+    def _end(self, run_id: UUID, **attrs):
+        with self._lock:
+            span = self._open.pop(run_id, None)
+        tracer = _tracer
+        if span is None or tracer is None:
+            return
+        span.attrs.update(attrs)
+        tracer.finish(span)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        # Only whole chains (prompt | llm [| parser]), not every step or graph node
+        if (serialized or {}).get("id", [""])[-1] == "RunnableSequence" or kwargs.get("name") == "RunnableSequence":
+            self._start(run_id, parent_run_id, "chain.invoke", "chain", {})
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model_name") or params.get("model") or (serialized or {}).get("name", "llm")
+        prompt_text = "\n".join(str(m.content) for batch in messages for m in batch)
+        self._start(run_id, parent_run_id, "llm", "llm", {"model": model, "_prompt": prompt_text})
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, "llm", "llm", {"_prompt": "\n".join(prompts)})
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            span = self._open.get(run_id)
+        if span is None:
+            return
+
+        prompt_text = span.attrs.pop("_prompt", "")
+        usage = _usage(response)
+        if usage is None:
+            output = "".join(g.text for gens in response.generations for g in gens)
+            usage = {
+                "input_tokens": count_tokens(prompt_text),
+                "output_tokens": count_tokens(output),
+                "estimated": True,
+            }
+        self._end(run_id, **usage)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            span = self._open.get(run_id)
+        if span is not None:
+            span.attrs.pop("_prompt", None)
+        self._end(run_id, error=type(error).__name__)
+
+
+_LLM_HANDLER = _LLMSpanHandler()
+
+# Read by LangChain when configuring callbacks: set only while tracing is
+# enabled, so untraced runs get no extra callback
+_llm_handler: contextvars.ContextVar[Optional[BaseCallbackHandler]] = contextvars.ContextVar(
+    "hr_trace_llm_handler", default=None
+)
+_handler_token: Optional[contextvars.Token] = None
+
+register_configure_hook(_llm_handler, inheritable=True)